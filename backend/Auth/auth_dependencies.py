@@ -4,6 +4,7 @@ from enum import Enum
 from typing import List, Dict, Tuple
 from Auth.auth_service import auth_service
 from services.dependencies import get_mongodb
+from services.user_cache import user_cache
 from datetime import datetime, timedelta
 
 # Esquema de autenticación HTTP Bearer
@@ -49,15 +50,21 @@ async def get_current_user(
         
         print(f"🔍 Buscando usuario con ID: {user_id}")
         
-        # Buscar usuario en la base de datos usando el método mejorado
-        usuario = mongo_service.find_by_id_with_validation("usuarios", user_id)
+        # Consultar primero la caché de usuarios autenticados
+        usuario = user_cache.get(user_id)
         
-        if not usuario:
-            print(f"❌ Usuario no encontrado con ID: {user_id}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Usuario no encontrado en la base de datos"
-            )
+        if usuario is None:
+            # Buscar usuario en la base de datos usando el método mejorado
+            usuario = await mongo_service.find_by_id_with_validation("usuarios", user_id)
+            
+            if not usuario:
+                print(f"❌ Usuario no encontrado con ID: {user_id}")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Usuario no encontrado en la base de datos"
+                )
+            
+            user_cache.set(user_id, usuario)
         
         print(f"✅ Usuario encontrado: {usuario.get('nombre', 'N/A')} ({usuario.get('correo', 'N/A')})")
         return usuario
@@ -1,18 +1,42 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.responses import JSONResponse
 from Auth.auth_service import auth_service
-from Auth.auth_schemas import LoginRequest, LoginResponse, LogoutResponse
-from Auth.auth_dependencies import require_auth
-from services.mongodb_service import MongoDBService
+from Auth.auth_schemas import LoginRequest, LoginResponse, LogoutResponse, RefreshRequest, LogoutRequest
+from Auth.auth_dependencies import require_auth, security
+from fastapi.security import HTTPAuthorizationCredentials
+from services.async_mongodb_service import AsyncMongoDBService
 from services.dependencies import get_mongodb
+from services.refresh_token_service import refresh_token_service
+from services.user_cache import user_cache
+from typing import Optional
 
 # Crear router de autenticación
 auth_router = APIRouter(prefix="/auth", tags=["Autenticación"])
 
+# Duración de los tokens de acceso (se renuevan con /auth/refresh)
+ACCESS_TOKEN_MINUTES = 15
+
+def _create_user_token(usuario: dict) -> str:
+    """
+    Crea el token de acceso de un usuario
+    
+    Args:
+        usuario: Documento del usuario
+        
+    Returns:
+        str: Token JWT con 15 minutos de duración
+    """
+    token_data = {
+        "user_id": str(usuario["_id"]),
+        "correo": usuario["correo"],
+        "tipo": usuario["tipo"]
+    }
+    return auth_service.create_access_token_with_duration(token_data, ACCESS_TOKEN_MINUTES)
+
 @auth_router.post("/login", response_model=LoginResponse)
 async def login(
     login_data: LoginRequest,
-    mongo_service: MongoDBService = Depends(get_mongodb)
+    mongo_service: AsyncMongoDBService = Depends(get_mongodb)
 ):
     """
     Endpoint para autenticar usuario y generar token JWT con 15 minutos de duración
@@ -41,17 +65,54 @@ async def login(
                 detail="Credenciales inválidas"
             )
         
-        # Crear token JWT con el ID del usuario y 15 minutos de duración
-        token_data = {
-            "user_id": str(usuario["_id"]),
-            "correo": usuario["correo"],
-            "tipo": usuario["tipo"]
-        }
+        # Crear token JWT con el ID del usuario y 15 minutos de duración,
+        # y un refresh token para renovarlo sin volver a verificar la contraseña
+        access_token = _create_user_token(usuario)
+        refresh_token = await refresh_token_service.issue(mongo_service, str(usuario["_id"]))
+        
+        return LoginResponse(token=access_token, refresh_token=refresh_token)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor: {str(e)}"
+        )
+
+@auth_router.post("/refresh", response_model=LoginResponse)
+async def refresh(
+    refresh_data: RefreshRequest,
+    mongo_service: AsyncMongoDBService = Depends(get_mongodb)
+):
+    """
+    Endpoint para renovar el token de acceso con un refresh token (sin verificar contraseña)
+    El refresh token se rota: el presentado deja de ser válido y se entrega uno nuevo.
+    
+    Args:
+        refresh_data: Refresh token actual
+        mongo_service: Servicio de MongoDB
+        
+    Returns:
+        LoginResponse: Nuevo token de acceso y nuevo refresh token
         
-        # Generar token con 15 minutos de duración
-        access_token = auth_service.create_access_token_with_duration(token_data, 15)
+    Raises:
+        HTTPException: Si el refresh token es inválido, expiró o ya fue usado
+    """
+    try:
+        user_id, refresh_token = await refresh_token_service.rotate(mongo_service, refresh_data.refresh_token)
+        
+        usuario = user_cache.get(user_id)
+        if usuario is None:
+            usuario = await mongo_service.find_by_id_with_validation("usuarios", user_id)
+            if not usuario:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Usuario no encontrado en la base de datos"
+                )
+            user_cache.set(user_id, usuario)
         
-        return LoginResponse(token=access_token)
+        return LoginResponse(token=_create_user_token(usuario), refresh_token=refresh_token)
         
     except HTTPException:
         raise
@@ -62,15 +123,47 @@ async def login(
         )
 
 @auth_router.post("/logout", response_model=LogoutResponse)
-async def logout():
+async def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    mongo_service: AsyncMongoDBService = Depends(get_mongodb)
+):
     """
-    Endpoint para logout (el token se invalida en el cliente)
+    Endpoint para logout: revoca el token en el servidor hasta su expiración
+    y la sesión del refresh token enviado; sin refresh token se revocan todas
+    las sesiones de refresh del usuario
+    
+    Args:
+        logout_data: Refresh token de la sesión (opcional)
+        credentials: Token a revocar
+        mongo_service: Servicio de MongoDB
     
     Returns:
         LogoutResponse: Mensaje de confirmación
     """
+    try:
+        if logout_data and logout_data.refresh_token:
+            await refresh_token_service.revoke(mongo_service, logout_data.refresh_token)
+        else:
+            # Clientes que no envían el refresh token: no dejar ninguna sesión renovable
+            payload = auth_service.verify_token(credentials.credentials)
+            if payload.get("user_id"):
+                await refresh_token_service.revoke_user(mongo_service, payload["user_id"])
+        revoked = await auth_service.revoke_token(mongo_service, credentials.credentials)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor: {str(e)}"
+        )
+    
+    if not revoked:
+        return LogoutResponse(
+            message="Logout exitoso. El token ha sido invalidado en el cliente."
+        )
     return LogoutResponse(
-        message="Logout exitoso. El token ha sido invalidado en el cliente."
+        message="Logout exitoso. El token ha sido revocado."
     )
 
 @auth_router.get("/verify")
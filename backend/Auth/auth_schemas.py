@@ -13,6 +13,19 @@ class LoginResponse(BaseModel):
     Esquema para la respuesta de login
     """
     token: str
+    refresh_token: str
+
+class RefreshRequest(BaseModel):
+    """
+    Esquema para renovar el token de acceso
+    """
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    """
+    Esquema opcional para el logout (revoca también la sesión de refresco)
+    """
+    refresh_token: Optional[str] = None
 
 class LogoutResponse(BaseModel):
     """
@@ -4,7 +4,17 @@ from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from services.config_service import config_service
 from services.password_service import password_service
+from services.index_registry import index_registry
+from services.token_cache import token_cache
+from services.revocation_list import revocation_list
+from services.login_attempt_tracker import create_login_attempt_tracker
+from services.jwt_keys import load_signing_key, load_verification_key, load_retired_keys
+from pathlib import Path
 import os
+import uuid
+
+# Índice para la búsqueda de usuarios por correo en cada login
+index_registry.register("usuarios", [("correo", 1)])
 
 class AuthService:
     """
@@ -13,19 +23,23 @@ class AuthService:
     
     def __init__(self):
         self.jwt_config = config_service.get_jwt_config()
-        self.failed_attempts = {}
         self.lockout_duration = 300  # 5 minutos
         self.max_attempts = 5
+        # Intentos fallidos por correo (acotado y con expiración; opcionalmente compartido)
+        self.failed_attempts = create_login_attempt_tracker(self.max_attempts, self.lockout_duration)
         
-        # Cargar llaves RSA
-        self._load_rsa_keys()
+        # Cargar llaves de firma (RS256, ES256 o EdDSA según la llave generada)
+        self._load_keys()
     
-    def _load_rsa_keys(self):
+    def _load_keys(self):
         """
-        Carga las llaves RSA desde los archivos
+        Carga las llaves JWT desde los archivos
+        El algoritmo se deduce del tipo de llave y cada llave se identifica por su kid.
+        Las llaves públicas en keys/retired/ se siguen aceptando para verificar tokens
+        emitidos antes de una rotación.
         """
         try:
-            print("🔑 Cargando llaves RSA...")
+            print("🔑 Cargando llaves JWT...")
             
             # Cargar llave privada
             private_key_path = os.path.join("keys", "private.pem")
@@ -40,17 +54,27 @@ class AuthService:
             with open(public_key_path, "r") as f:
                 self.public_key = f.read()
             print("✅ Llave pública cargada")
+            
+            # Parsear las llaves una sola vez (evita reprocesar el PEM en cada token)
+            self.algorithm, self.key_id, self._signing_key = load_signing_key(self.private_key)
+            public_algorithm, public_kid, public_key = load_verification_key(self.public_key)
+            if public_kid != self.key_id:
+                raise ValueError("La llave pública no corresponde a la llave privada")
+            
+            self._verification_keys = load_retired_keys(Path("keys") / "retired")
+            self._verification_keys[self.key_id] = (public_algorithm, public_key)
+            print(f"✅ Firmando con {self.algorithm} (kid {self.key_id}), {len(self._verification_keys)} llave(s) de verificación")
                 
         except FileNotFoundError as e:
-            print(f"❌ Error: No se pudieron cargar las llaves RSA: {str(e)}")
-            raise Exception(f"No se pudieron cargar las llaves RSA: {str(e)}")
+            print(f"❌ Error: No se pudieron cargar las llaves JWT: {str(e)}")
+            raise Exception(f"No se pudieron cargar las llaves JWT: {str(e)}")
         except Exception as e:
-            print(f"❌ Error al cargar las llaves RSA: {str(e)}")
-            raise Exception(f"Error al cargar las llaves RSA: {str(e)}")
+            print(f"❌ Error al cargar las llaves JWT: {str(e)}")
+            raise Exception(f"Error al cargar las llaves JWT: {str(e)}")
     
     def create_access_token(self, data: Dict[str, Any]) -> str:
         """
-        Crea un token JWT de acceso usando llave privada RSA
+        Crea un token JWT de acceso usando la llave privada activa
         
         Args:
             data: Datos a incluir en el payload del token
@@ -63,20 +87,21 @@ class AuthService:
         # Agregar tiempo de expiración usando zona horaria de Bogotá (UTC-5)
         bogota_tz = timezone(timedelta(hours=-5))
         expire = datetime.now(bogota_tz) + timedelta(minutes=self.jwt_config["expiration_minutes"])
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
         
-        # Generar token usando llave privada RSA
+        # Generar token usando la llave privada activa
         encoded_jwt = jwt.encode(
             to_encode, 
-            self.private_key, 
-            algorithm="RS256"
+            self._signing_key, 
+            algorithm=self.algorithm,
+            headers={"kid": self.key_id}
         )
         
         return encoded_jwt
     
     def create_access_token_with_duration(self, data: Dict[str, Any], duration_minutes: int) -> str:
         """
-        Crea un token JWT de acceso con duración personalizada usando llave privada RSA
+        Crea un token JWT de acceso con duración personalizada usando la llave privada activa
         
         Args:
             data: Datos a incluir en el payload del token
@@ -91,20 +116,48 @@ class AuthService:
         bogota_tz = timezone(timedelta(hours=-5))
         expire = datetime.now(bogota_tz) + timedelta(minutes=duration_minutes)
         print(f"🕐 Token generado con expiración: {expire} (Zona horaria: Bogotá UTC-5)")
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
         
-        # Generar token usando llave privada RSA
+        # Generar token usando la llave privada activa
         encoded_jwt = jwt.encode(
             to_encode, 
-            self.private_key, 
-            algorithm="RS256"
+            self._signing_key, 
+            algorithm=self.algorithm,
+            headers={"kid": self.key_id}
         )
         
         return encoded_jwt
     
+    def _get_verification_key(self, token: str):
+        """
+        Selecciona la llave de verificación según el kid de la cabecera del token
+        Los tokens sin kid (emitidos antes de la rotación) se verifican con la llave
+        del mismo algoritmo.
+        
+        Args:
+            token: Token JWT
+            
+        Returns:
+            Tuple[str, Key]: (algoritmo, llave)
+            
+        Raises:
+            JWTError: Si la cabecera es inválida o no hay llave para el token
+        """
+        header = jwt.get_unverified_header(token)
+        kid = header.get("kid")
+        if kid is not None:
+            if kid not in self._verification_keys:
+                raise JWTError("kid desconocido")
+            return self._verification_keys[kid]
+        
+        for algorithm, key in self._verification_keys.values():
+            if algorithm == header.get("alg"):
+                return algorithm, key
+        raise JWTError("Algoritmo no soportado")
+    
     def verify_token(self, token: str) -> Dict[str, Any]:
         """
-        Verifica y decodifica un token JWT usando llave pública RSA
+        Verifica y decodifica un token JWT con la llave pública indicada por su kid
         
         Args:
             token: Token JWT a verificar
@@ -115,11 +168,18 @@ class AuthService:
         Raises:
             HTTPException: Si el token es inválido o ha expirado
         """
+        # Un token ya verificado y vigente no necesita otra verificación de firma
+        payload = token_cache.get(token)
+        if payload is not None:
+            self._check_not_revoked(payload)
+            return payload
+        
         try:
+            algorithm, verification_key = self._get_verification_key(token)
             payload = jwt.decode(
                 token, 
-                self.public_key, 
-                algorithms=["RS256"]
+                verification_key, 
+                algorithms=[algorithm]
             )
             
             # Verificar que el token no haya expirado
@@ -129,6 +189,8 @@ class AuthService:
                     detail="Token sin tiempo de expiración"
                 )
             
+            token_cache.set(token, payload)
+            self._check_not_revoked(payload)
             return payload
             
         except JWTError:
@@ -137,6 +199,42 @@ class AuthService:
                 detail="Token inválido"
             )
     
+    def _check_not_revoked(self, payload: Dict[str, Any]):
+        """
+        Rechaza los tokens revocados (consulta en memoria, sin acceder a MongoDB)
+        
+        Raises:
+            HTTPException: Si el token fue revocado
+        """
+        if revocation_list.is_revoked(payload.get("jti")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revocado"
+            )
+    
+    async def revoke_token(self, mongo_service, token: str) -> bool:
+        """
+        Revoca un token hasta su expiración
+        
+        Args:
+            mongo_service: Servicio de MongoDB
+            token: Token JWT a revocar
+            
+        Returns:
+            bool: True si se revocó; False si el token no tiene jti (emitido antes de la revocación)
+            
+        Raises:
+            HTTPException: Si el token es inválido o ya fue revocado
+        """
+        payload = self.verify_token(token)
+        token_cache.invalidate(token)
+        if payload.get("jti") is None:
+            return False
+        
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        await revocation_list.revoke(mongo_service, payload["jti"], expires_at)
+        return True
+    
     async def authenticate_user(self, mongo_service, correo: str, contraseña: str) -> Optional[Dict[str, Any]]:
         """
         Autentica un usuario verificando correo y contraseña
@@ -150,7 +248,7 @@ class AuthService:
             Optional[Dict[str, Any]]: Usuario autenticado o None si falla
         """
         # Verificar bloqueo
-        if self._is_account_locked(correo):
+        if await self.failed_attempts.is_locked(correo):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Cuenta bloqueada temporalmente. Intente más tarde."
@@ -158,21 +256,23 @@ class AuthService:
             
         try:
             # Buscar usuario por correo
-            usuario = mongo_service.find_one("usuarios", {"correo": correo})
+            usuario = await mongo_service.find_one("usuarios", {"correo": correo})
             
             if not usuario:
                 return None
             
             # Verificar contraseña usando el servicio de encriptación
-            if not password_service.verify_password(contraseña, usuario["contraseña"]):
-                self._track_failed_attempt(correo)
+            if not await password_service.verify_password_async(contraseña, usuario["contraseña"]):
+                await self.failed_attempts.record_failure(correo)
                 return None
             
             # Reiniciar contador de intentos fallidos
-            self.failed_attempts[correo] = {"count": 0, "last_attempt": None}
+            await self.failed_attempts.reset(correo)
             
             return usuario
             
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error en autenticación: {str(e)}")
             return None
@@ -242,47 +342,5 @@ class AuthService:
             )
         return payload
 
-    def _track_failed_attempt(self, correo: str):
-        """
-        Rastrea los intentos fallidos de inicio de sesión
-        
-        Args:
-            correo: Correo electrónico del usuario
-        """
-        bogota_tz = timezone(timedelta(hours=-5))
-        current_time = datetime.now(bogota_tz)
-        
-        if correo in self.failed_attempts:
-            self.failed_attempts[correo]["count"] += 1
-            self.failed_attempts[correo]["last_attempt"] = current_time
-        else:
-            self.failed_attempts[correo] = {"count": 1, "last_attempt": current_time}
-    
-    def _is_account_locked(self, correo: str) -> bool:
-        """
-        Verifica si la cuenta está bloqueada debido a intentos fallidos
-        
-        Args:
-            correo: Correo electrónico del usuario
-            
-        Returns:
-            bool: True si la cuenta está bloqueada, False en caso contrario
-        """
-        if correo not in self.failed_attempts:
-            return False
-        
-        attempts = self.failed_attempts[correo]
-        if attempts["count"] >= self.max_attempts:
-            # Verificar si ha pasado el tiempo de bloqueo usando zona horaria de Bogotá
-            bogota_tz = timezone(timedelta(hours=-5))
-            current_time = datetime.now(bogota_tz)
-            if (current_time - attempts["last_attempt"]).total_seconds() < self.lockout_duration:
-                return True
-            else:
-                # Reiniciar contador después del período de bloqueo
-                self.failed_attempts[correo] = {"count": 0, "last_attempt": None}
-        
-        return False
-
 # Instancia global del servicio de autenticación
 auth_service = AuthService()
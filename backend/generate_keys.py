@@ -1,37 +1,75 @@
 #!/usr/bin/env python3
 """
-Script para generar llaves RSA para JWT
-Genera llaves en formato PKCS#8 compatibles con RS256
+Script para generar llaves para JWT
+Genera llaves en formato PKCS#8 compatibles con RS256, ES256 o EdDSA (Ed25519)
+
+Uso:
+    python generate_keys.py                          # RS256 (RSA 2048)
+    python generate_keys.py --algorithm EdDSA        # Ed25519
+    python generate_keys.py --algorithm ES256 --rotate
 """
 
+import argparse
 from pathlib import Path
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 from cryptography.hazmat.backends import default_backend
+from services.jwt_keys import SUPPORTED_ALGORITHMS, key_id
+
+def generate_private_key(algorithm: str):
+    """
+    Genera una llave privada para el algoritmo indicado
+    """
+    if algorithm == "RS256":
+        return rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=2048,
+            backend=default_backend()
+        )
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    return ed25519.Ed25519PrivateKey.generate()
+
+def retire_current_key(keys_dir: Path):
+    """
+    Mueve la llave pública actual a keys/retired/ para que los tokens ya emitidos
+    sigan siendo válidos hasta que expiren
+    """
+    public_key_path = keys_dir / "public.pem"
+    if not public_key_path.exists():
+        print("ℹ️  No hay llave actual que retirar")
+        return
 
-def generate_rsa_keys():
+    public_key = serialization.load_pem_public_key(public_key_path.read_bytes())
+    retired_dir = keys_dir / "retired"
+    retired_dir.mkdir(exist_ok=True)
+    retired_path = retired_dir / f"{key_id(public_key)}.pem"
+    public_key_path.replace(retired_path)
+    print(f"📦 Llave anterior retirada: {retired_path}")
+    print("   Elimínala cuando hayan expirado los tokens firmados con ella")
+
+def generate_keys(algorithm: str = "RS256", rotate: bool = False):
     """
-    Genera un par de llaves RSA para JWT
+    Genera un par de llaves para JWT
     """
-    print("🔑 Generando llaves RSA...")
-    
+    print(f"🔑 Generando llaves {algorithm}...")
+
     # Obtener el directorio base (backend)
     base_dir = Path(__file__).parent
     keys_dir = base_dir / "keys"
-    
+
     # Crear directorio keys si no existe
     keys_dir.mkdir(exist_ok=True)
-    
+
+    if rotate:
+        retire_current_key(keys_dir)
+
     # Generar llave privada
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048,
-        backend=default_backend()
-    )
-    
+    private_key = generate_private_key(algorithm)
+
     # Obtener llave pública
     public_key = private_key.public_key()
-    
+
     # Guardar llave privada
     private_key_path = keys_dir / "private.pem"
     with open(private_key_path, "wb") as f:
@@ -40,7 +78,7 @@ def generate_rsa_keys():
             format=serialization.PrivateFormat.PKCS8,
             encryption_algorithm=serialization.NoEncryption()
         ))
-    
+
     # Guardar llave pública
     public_key_path = keys_dir / "public.pem"
     with open(public_key_path, "wb") as f:
@@ -48,11 +86,19 @@ def generate_rsa_keys():
             encoding=serialization.Encoding.PEM,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         ))
-    
-    print("\n✅ Llaves RSA generadas exitosamente:")
+
+    print(f"\n✅ Llaves {algorithm} generadas exitosamente (kid {key_id(public_key)}):")
     print(f"   - {private_key_path}")
     print(f"   - {public_key_path}")
-    print("\nLas llaves están en formato PKCS#8 y son compatibles con RS256")
+    print(f"\nLas llaves están en formato PKCS#8 y son compatibles con {algorithm}")
 
 if __name__ == "__main__":
-    generate_rsa_keys()
+    parser = argparse.ArgumentParser(description="Genera las llaves de firma JWT")
+    parser.add_argument("--algorithm", choices=SUPPORTED_ALGORITHMS, default="RS256")
+    parser.add_argument(
+        "--rotate",
+        action="store_true",
+        help="Conserva la llave pública actual en keys/retired/ para seguir aceptando sus tokens"
+    )
+    args = parser.parse_args()
+    generate_keys(args.algorithm, args.rotate)
@@ -11,9 +11,16 @@ import os
 
 # Importar servicios
 from services.config_service import config_service
-from services.mongodb_service import MongoDBService
+from services.async_mongodb_service import AsyncMongoDBService
 from services.password_service import password_service
+from services.miniature_service import miniature_service
+from services.storage_service import close_storages, get_storage_stats
+from services.lambda_service import lambda_service
+from services.user_cache import user_cache
+from services.token_cache import token_cache
+from services.revocation_list import revocation_list
 from services.rate_limiter import rate_limiter
+from services.index_registry import index_registry
 
 # Importar schemas de usuario
 from users.schemas import UsuarioCreate, UsuarioUpdate, UsuarioResponse
@@ -21,9 +28,10 @@ from users.schemas import UsuarioCreate, UsuarioUpdate, UsuarioResponse
 # Importar autenticación
 from Auth.auth_routes import auth_router
 from Auth.auth_dependencies import get_current_user, get_current_user_id, require_admin, require_user, UserRole
+from Auth.auth_service import auth_service
 
 # Importar dependencias compartidas
-from services.dependencies import get_mongodb, mongo_service
+from services.dependencies import get_mongodb, async_mongo_service
 from routes.storage_routes import router as storage_router
 from routes.event_routes import router as event_router
 from routes.lost_routes import router as lost_router
@@ -36,8 +44,12 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("🔄 Iniciando conexión a MongoDB Atlas...")
-    if mongo_service.connect():
+    if await async_mongo_service.connect():
         print("✅ Conexión exitosa a MongoDB Atlas")
+        # Crear índices registrados en segundo plano (no bloquea el arranque)
+        index_registry.apply_in_background(async_mongo_service)
+        # Cargar tokens revocados antes de atender peticiones
+        await revocation_list.start(async_mongo_service)
     else:
         print("❌ Error al conectar a MongoDB Atlas")
     
@@ -52,8 +64,16 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("🔄 Cerrando conexiones...")
-    if mongo_service.is_connected():
-        mongo_service.close()
+    await index_registry.stop()
+    await revocation_list.stop()
+    password_service.shutdown()
+    miniature_service.shutdown()
+    await close_storages()
+    await lambda_service.close()
+    await rate_limiter.close()
+    await auth_service.failed_attempts.close()
+    if async_mongo_service.is_connected():
+        await async_mongo_service.disconnect()
         print("✅ Conexiones cerradas")
 
 # Crear instancia de FastAPI con lifespan
@@ -71,6 +91,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Rate limiting middleware
@@ -109,7 +130,7 @@ app.include_router(user_router)
 async def health_check():
     try:
         # Verificar conexión a MongoDB
-        if not mongo_service.is_connected():
+        if not async_mongo_service.is_connected():
             return JSONResponse(
                 status_code=500,
                 content={
@@ -172,13 +193,66 @@ async def api_info():
         "documentation": "/docs"
     }
 
+# Reporte de índices de MongoDB (solo admin)
+@app.get("/admin/indexes")
+async def index_report(
+    db: AsyncMongoDBService = Depends(get_mongodb),
+    _: dict = Depends(require_admin)
+):
+    """
+    Reporte de índices registrados: faltantes, sin uso y no registrados
+    """
+    return await index_registry.report(db)
+
+@app.get("/admin/miniatures/stats")
+async def miniature_stats(_: dict = Depends(require_admin)):
+    """
+    Estado del pool de procesamiento de imágenes y tiempos por etapa
+    """
+    return miniature_service.get_stats()
+
+@app.get("/admin/storage/stats")
+async def storage_stats(_: dict = Depends(require_admin)):
+    """
+    Métricas de E/S de los almacenamientos (operaciones, bytes y tiempo medio)
+    """
+    return get_storage_stats()
+
+@app.get("/admin/lambda/stats")
+async def lambda_stats(_: dict = Depends(require_admin)):
+    """
+    Llamadas a Lambda (reintentos, fallos) y estado del circuit breaker
+    """
+    return lambda_service.get_stats()
+
+@app.get("/admin/token-cache/stats")
+async def token_cache_stats(_: dict = Depends(require_admin)):
+    """
+    Aciertos de la caché de tokens verificados (verificaciones RSA evitadas)
+    """
+    return token_cache.get_stats()
+
+@app.get("/admin/revocations/stats")
+async def revocation_stats(_: dict = Depends(require_admin)):
+    """
+    Tokens revocados en memoria y peticiones rechazadas
+    """
+    return revocation_list.get_stats()
+
+@app.get("/admin/login-attempts/stats")
+async def login_attempt_stats(_: dict = Depends(require_admin)):
+    """
+    Contadores de intentos fallidos de login (tamaño, expiraciones, desalojos y bloqueos)
+    """
+    return auth_service.failed_attempts.get_stats()
+
 # ===== RUTAS ESPECÍFICAS (DEBEN IR ANTES QUE LAS RUTAS CON PARÁMETROS) =====
 
 # CREATE - Crear usuario (ruta específica)
 @app.post("/users/create", response_model=UsuarioResponse, status_code=201)
 async def create_user(
     usuario: UsuarioCreate, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(require_admin)
 ):
     """Crear un nuevo usuario en la base de datos"""
@@ -191,7 +265,7 @@ async def create_user(
             )
         
         # Verificar si el correo ya existe
-        usuario_existente = db.find_one("usuarios", {"correo": usuario.correo})
+        usuario_existente = await db.find_one("usuarios", {"correo": usuario.correo})
         if usuario_existente:
             raise HTTPException(
                 status_code=400, 
@@ -210,19 +284,19 @@ async def create_user(
         usuario_doc = {
             "nombre": usuario.nombre,
             "correo": usuario.correo,
-            "contraseña": password_service.hash_password(usuario.contraseña),  # Encriptar contraseña
+            "contraseña": await password_service.hash_password_async(usuario.contraseña),  # Encriptar contraseña
             "tipo": usuario.tipo,
             "fecha_creacion": datetime.now().isoformat()
         }
         
         # Insertar en MongoDB
-        collection = db.get_collection("usuarios")
-        result = collection.insert_one(usuario_doc)
+        collection = await db.get_collection("usuarios")
+        result = await collection.insert_one(usuario_doc)
         
         print(f"✅ Usuario creado con ID: {result.inserted_id}")
         
         # Obtener el usuario creado usando el método mejorado
-        usuario_creado = db.find_by_id_with_validation("usuarios", str(result.inserted_id))
+        usuario_creado = await db.find_by_id_with_validation("usuarios", str(result.inserted_id))
         
         if not usuario_creado:
             raise HTTPException(
@@ -248,7 +322,7 @@ async def create_user(
 async def get_all_users(
     skip: int = 0, 
     limit: int = 100, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     _: dict = Depends(require_user)
 ):
     """
@@ -261,7 +335,7 @@ async def get_all_users(
                 detail="No hay conexión a MongoDB"
             )
             
-        usuarios = db.find_all("usuarios", limit=limit, skip=skip)
+        usuarios = await db.find_all("usuarios", limit=limit, skip=skip)
         
         if usuarios:
             print(f"Encontrados {len(usuarios)} usuarios")
@@ -288,14 +362,14 @@ async def get_all_users(
 @app.get("/user/search/email/{email}")
 async def search_user_by_email(
     email: str, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Buscar usuario por correo electrónico
     """
     try:
-        usuario = db.find_one("usuarios", {"correo": email})
+        usuario = await db.find_one("usuarios", {"correo": email})
         if not usuario:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
@@ -315,7 +389,7 @@ async def search_user_by_email(
 # DELETE - Eliminar todos los usuarios (ADMIN ONLY) (ruta específica)
 @app.delete("/user/delete/all")
 async def delete_all_users(
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(require_admin)  # Cambiar _ por current_user
 ):
     """
@@ -327,13 +401,14 @@ async def delete_all_users(
     
     try:
         # Obtener colección
-        collection = db.get_collection("usuarios")
+        collection = await db.get_collection("usuarios")
         
         # Contar usuarios antes de eliminar
-        total_usuarios = db.count_documents("usuarios")
+        total_usuarios = await db.count_documents("usuarios")
         
         # Eliminar todos los usuarios
-        result = collection.delete_many({})
+        result = await collection.delete_many({})
+        user_cache.clear()
         
         return {
             "message": "Todos los usuarios han sido eliminados",
@@ -350,7 +425,7 @@ async def delete_all_users(
 @app.get("/user/{user_id}", response_model=UsuarioResponse)
 async def get_user_by_id(
     user_id: str, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -367,7 +442,7 @@ async def get_user_by_id(
         print(f"🔍 Buscando usuario con ID: {user_id}")
         
         # Buscar usuario usando el método mejorado
-        usuario = db.find_by_id_with_validation("usuarios", user_id)
+        usuario = await db.find_by_id_with_validation("usuarios", user_id)
         if not usuario:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
@@ -392,7 +467,7 @@ async def get_user_by_id(
 async def update_user(
     user_id: str, 
     usuario_update: UsuarioUpdate, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -413,7 +488,7 @@ async def update_user(
         print(f"🔍 Verificando existencia del usuario con ID: {user_id}")
         
         # Verificar que el usuario existe usando el método mejorado
-        usuario_existente = db.find_by_id_with_validation("usuarios", user_id)
+        usuario_existente = await db.find_by_id_with_validation("usuarios", user_id)
         if not usuario_existente:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
@@ -426,7 +501,7 @@ async def update_user(
         if usuario_update.correo is not None:
             # Verificar que el nuevo correo no esté en uso por otro usuario
             if usuario_update.correo != usuario_existente["correo"]:
-                usuario_con_correo = db.find_one("usuarios", {"correo": usuario_update.correo})
+                usuario_con_correo = await db.find_one("usuarios", {"correo": usuario_update.correo})
                 if usuario_con_correo:
                     raise HTTPException(
                         status_code=400, 
@@ -442,7 +517,7 @@ async def update_user(
                     detail=f"La nueva contraseña no cumple con los requisitos de seguridad: {mensaje_error}"
                 )
             # Encriptar la nueva contraseña
-            update_fields["contraseña"] = password_service.hash_password(usuario_update.contraseña)
+            update_fields["contraseña"] = await password_service.hash_password_async(usuario_update.contraseña)
         if usuario_update.tipo is not None:
             update_fields["tipo"] = usuario_update.tipo
         
@@ -450,19 +525,22 @@ async def update_user(
         update_fields["fecha_actualizacion"] = datetime.now().isoformat()
         
         # Actualizar en MongoDB
-        collection = db.get_collection("usuarios")
-        result = collection.update_one(
+        collection = await db.get_collection("usuarios")
+        result = await collection.update_one(
             {"_id": ObjectId(user_id)},
             {"$set": update_fields}
         )
         
+        # Invalidar el usuario en la caché de autenticación
+        user_cache.invalidate(user_id)
+        
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="No se pudo actualizar el usuario")
         
         print(f"✅ Usuario actualizado exitosamente: {user_id}")
         
         # Obtener usuario actualizado
-        usuario_actualizado = db.find_by_id_with_validation("usuarios", user_id)
+        usuario_actualizado = await db.find_by_id_with_validation("usuarios", user_id)
         
         return UsuarioResponse(
             id=str(usuario_actualizado["_id"]),
@@ -482,7 +560,7 @@ async def update_user(
 @app.delete("/user/{user_id}")
 async def delete_user(
     user_id: str, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["tipo"].lower() != "admin":
@@ -497,8 +575,9 @@ async def delete_user(
             )
             
         # Eliminar usuario
-        collection = db.get_collection("usuarios")
-        result = collection.delete_one({"_id": ObjectId(user_id)})
+        collection = await db.get_collection("usuarios")
+        result = await collection.delete_one({"_id": ObjectId(user_id)})
+        user_cache.invalidate(user_id)
         
         if result.deleted_count == 0:
             raise HTTPException(
@@ -119,7 +119,8 @@ response = requests.delete(
     "http://localhost:8000/api/lost/64f5a3b1234567890abcdef1"
 )
 print(response.json())
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
 from plugins.plugin_interface import PluginInterface
 from services.dependencies import get_mongodb
 from Auth.auth_dependencies import require_admin
@@ -150,7 +151,7 @@ class Plugin(PluginInterface):
                     )
 
                 # Verificar que el objeto existe
-                item = db.find_by_id("lost_items", item_id)
+                item = await db.find_by_id("lost_items", item_id)
                 if not item:
                     raise HTTPException(
                         status_code=404,
@@ -174,12 +175,12 @@ class Plugin(PluginInterface):
                 }
 
                 # Insertar registro de remoción
-                removals_collection = db.get_collection("lost_item_removals")
-                removal_result = removals_collection.insert_one(removal_doc)
+                removals_collection = await db.get_collection("lost_item_removals")
+                removal_result = await removals_collection.insert_one(removal_doc)
 
                 # Actualizar estado del objeto perdido
-                items_collection = db.get_collection("lost_items")
-                update_result = items_collection.update_one(
+                items_collection = await db.get_collection("lost_items")
+                update_result = await items_collection.update_one(
                     {"_id": ObjectId(item_id)},
                     {
                         "$set": {
@@ -213,35 +214,64 @@ class Plugin(PluginInterface):
 
         @self.router.get("/lost/removed")
         async def list_removed_items(
+            limit: int = Query(100, ge=1, le=500),
+            cursor: Optional[str] = None,
             db = Depends(get_mongodb),
             current_user: dict = Depends(require_admin)
         ):
             """
-            Lista todos los objetos que han sido removidos
+            Lista los objetos que han sido removidos, paginados por cursor
+            
+            Usa dos consultas sin importar el tamaño de la página: una agregación
+            con $lookup para los registros de remoción y un $in para los usuarios.
             """
             try:
-                # Buscar objetos con estado "removed"
-                items = db.find_all(
-                    "lost_items",
-                    filter_query={"status": "removed"},
-                    limit=100
+                match_query = {"status": "removed"}
+                if cursor:
+                    if not ObjectId.is_valid(cursor):
+                        raise HTTPException(
+                            status_code=400,
+                            detail="Cursor de paginación inválido"
+                        )
+                    match_query["_id"] = {"$gt": ObjectId(cursor)}
+
+                # Objetos removidos junto con su registro de remoción más reciente
+                items = await db.aggregate("lost_items", [
+                    {"$match": match_query},
+                    {"$sort": {"_id": 1}},
+                    {"$limit": limit + 1},
+                    {"$lookup": {
+                        "from": "lost_item_removals",
+                        "localField": "_id",
+                        "foreignField": "item_id",
+                        "pipeline": [
+                            {"$sort": {"_id": -1}},
+                            {"$limit": 1}
+                        ],
+                        "as": "removal"
+                    }}
+                ])
+
+                next_cursor = None
+                if len(items) > limit:
+                    items = items[:limit]
+                    next_cursor = str(items[-1]["_id"])
+
+                # Buscar a todos los usuarios que removieron en una sola consulta
+                removals = {
+                    str(item["_id"]): item["removal"][0] if item.get("removal") else None
+                    for item in items
+                }
+                users = await db.find_by_ids(
+                    "usuarios",
+                    [removal["removed_by"] for removal in removals.values() if removal and "removed_by" in removal],
+                    projection={"nombre": 1}
                 )
 
                 removed_items = []
                 for item in items:
-                    # Buscar información de remoción
-                    removal_info = db.find_one(
-                        "lost_item_removals",
-                        {"item_id": item["_id"]}
-                    )
-
-                    # Buscar información del usuario que removió
-                    removed_by_user = None
-                    if removal_info and "removed_by" in removal_info:
-                        removed_by_user = db.find_by_id(
-                            "usuarios",
-                            removal_info["removed_by"]
-                        )
+                    removal_info = removals[str(item["_id"])]
+                    removed_by_user = users.get(str(removal_info.get("removed_by"))) if removal_info else None
 
                     removed_items.append({
                         "id": str(item["_id"]),
@@ -258,9 +288,12 @@ class Plugin(PluginInterface):
 
                 return {
                     "total": len(removed_items),
-                    "items": removed_items
+                    "items": removed_items,
+                    "next_cursor": next_cursor
                 }
 
+            except HTTPException:
+                raise
             except Exception as e:
                 raise HTTPException(
                     status_code=500,
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends
-from services.dependencies import get_mongodb, MongoDBService
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from typing import Optional
+from datetime import datetime
+from services.dependencies import get_mongodb
+from services.async_mongodb_service import AsyncMongoDBService
 from Auth.auth_dependencies import require_auth, require_admin
 from schemas.event_schemas import EventCreate, EventUpdate, EventResponse
 from services.event_service import EventService
@@ -7,31 +10,55 @@ from services.event_service import EventService
 router = APIRouter(prefix="/events", tags=["events"])
 
 @router.get("/", response_model=list[EventResponse])
-async def get_events(db: MongoDBService = Depends(get_mongodb)):
+async def get_events(
+    response: Response,
+    start: Optional[datetime] = Query(None, description="Inicio del rango visible (ISO 8601)"),
+    end: Optional[datetime] = Query(None, description="Fin del rango visible (ISO 8601)"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncMongoDBService = Depends(get_mongodb)
+):
+    """
+    Listar eventos
+    
+    Con `start` y `end` devuelve solo los eventos que se solapan con ese rango
+    (p. ej. el mes visible en el calendario), ordenados por fecha de inicio.
+    En ambos casos se pagina por cursor: si hay más resultados, el header
+    X-Next-Cursor trae el valor para pedir la siguiente página.
+    """
     try:
-        events = db.find_all("events", limit=100)
+        if start or end:
+            if not (start and end):
+                raise ValueError("Debe indicar tanto start como end")
+            events, next_cursor = await EventService.find_range_page(db, start, end, limit, cursor)
+        else:
+            events, next_cursor = await db.find_page("events", limit=limit, cursor=cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return [EventService._convert_to_response(event) for event in events]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/", response_model=EventResponse, status_code=201)
 async def create_event(
     event: EventCreate, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(require_admin)
 ):
     """
     Crear un nuevo evento (solo administradores)
     """
     try:
-        return EventService.create_event(event, db)
+        return await EventService.create_event(event, db)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: str, db: MongoDBService = Depends(get_mongodb)):
+async def get_event(event_id: str, db: AsyncMongoDBService = Depends(get_mongodb)):
     try:
-        return EventService.get_event_by_id(event_id, db)
+        return await EventService.get_event_by_id(event_id, db)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -39,27 +66,27 @@ async def get_event(event_id: str, db: MongoDBService = Depends(get_mongodb)):
 async def update_event(
     event_id: str, 
     event_update: EventUpdate, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(require_admin)
 ):
     """
     Actualizar un evento existente (solo administradores)
     """
     try:
-        return EventService.update_event(event_id, event_update, db)
+        return await EventService.update_event(event_id, event_update, db)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{event_id}")
 async def delete_event(
     event_id: str, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(require_admin)
 ):
     """
     Eliminar un evento (solo administradores)
     """
     try:
-        return EventService.delete_event(event_id, db)
+        return await EventService.delete_event(event_id, db)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
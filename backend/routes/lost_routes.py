@@ -1,14 +1,24 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from bson import ObjectId
+from pymongo.errors import OperationFailure
+import asyncio
+import hashlib
 import os
-import shutil
 from pathlib import Path
 
-from services.dependencies import get_mongodb, MongoDBService
+from services.dependencies import get_mongodb
+from services.async_mongodb_service import AsyncMongoDBService
 from services.miniature_service import miniature_service
+from services.storage_service import lost_item_storage
+from services.storage_backends import ByteBudget, StorageSizeLimitError
+from services.blob_store import blob_store, BlobBusyError
+from services.file_responses import conditional_file_response, bytes_stream
+from services.config_service import config_service
+from services.index_registry import index_registry
+from services.rate_limiter import rate_limiter
 from Auth.auth_dependencies import require_auth, require_admin, require_user
 from schemas.lost_item_schemas import (
     LostItemCreate,
@@ -21,17 +31,76 @@ from schemas.lost_item_schemas import (
 
 router = APIRouter(prefix="/lost", tags=["lost"])
 
-# Configurar directorio para imágenes
-UPLOAD_DIR = Path("uploads/lost_items")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# Claves de las imágenes y evidencias en el almacenamiento de objetos perdidos
+LOST_ITEM_IMAGE_KEY = "lost_items/{item_id}.jpg"
+CLAIM_EVIDENCE_PREFIX = "lost_items/claims/{item_id}/"
+EVIDENCE_CONTENT_TYPES = ["image/jpeg", "image/png", "image/gif", "application/pdf"]
+# Máximo de objetos distintos por consulta de miniaturas en lote
+MAX_MINIATURE_BATCH = 100
+
+# Imagen por defecto para objetos sin imagen (se lee una sola vez y se mantiene en memoria)
+DEFAULT_IMAGE_PATH = Path("assets/default_lost_item.jpg")
+DEFAULT_IMAGE_MAX_AGE = 60
+_default_image: Optional[dict] = None
+_default_image_loaded = False
+
+async def _get_default_image() -> Optional[dict]:
+    """
+    Obtiene la imagen por defecto desde la caché en memoria
+
+    Returns:
+        Optional[dict]: data, etag y modified, o None si el archivo no existe
+    """
+    global _default_image, _default_image_loaded
+    if not _default_image_loaded:
+        def load() -> Optional[dict]:
+            if not DEFAULT_IMAGE_PATH.is_file():
+                return None
+            data = DEFAULT_IMAGE_PATH.read_bytes()
+            return {
+                "data": data,
+                "etag": hashlib.sha256(data).hexdigest()[:32],
+                "modified": datetime.fromtimestamp(DEFAULT_IMAGE_PATH.stat().st_mtime, tz=timezone.utc)
+            }
+        _default_image = await asyncio.to_thread(load)
+        _default_image_loaded = True
+    return _default_image
+
+# Índice de texto para la búsqueda de objetos perdidos
+# (insensible a mayúsculas y tildes, con stemming en español)
+LOST_ITEMS_TEXT_INDEX_KEYS = [
+    ("title", "text"),
+    ("found_location", "text"),
+    ("description", "text")
+]
+LOST_ITEMS_TEXT_INDEX_OPTIONS = {
+    "name": "lost_items_text_search",
+    "default_language": "spanish",
+    "weights": {"title": 10, "found_location": 5, "description": 1}
+}
+
+# Índices usados por este módulo (se aplican al iniciar la aplicación)
+index_registry.register("lost_items", LOST_ITEMS_TEXT_INDEX_KEYS, **LOST_ITEMS_TEXT_INDEX_OPTIONS)
+index_registry.register("claims", [("item_id", 1)])
+# Índices del plugin de retiro de objetos: se registran aquí porque el módulo del plugin
+# solo se importa desde load_plugins y ese registro no llegaría a aplicarse
+index_registry.register("lost_items", [("status", 1)])
+index_registry.register("lost_item_removals", [("item_id", 1)])
 
 @router.get("/", response_model=List[LostItemResponse])
 async def list_lost_items(
-    q: Optional[str] = Query(None, description="Término de búsqueda"),
-    db: MongoDBService = Depends(get_mongodb)
+    response: Response,
+    q: Optional[str] = Query(None, max_length=200, description="Término de búsqueda"),
+    limit: int = Query(100, ge=1, le=500, description="Tamaño de la página"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en X-Next-Cursor por la página anterior"),
+    db: AsyncMongoDBService = Depends(get_mongodb)
 ):
     """
     Obtener lista de objetos perdidos con búsqueda opcional
+    
+    Se pagina por cursor: si hay más resultados, el header X-Next-Cursor trae el
+    valor para pedir la siguiente página. Con búsqueda los resultados van ordenados
+    por relevancia; si el índice de texto aún no está disponible se responde 503.
     """
     try:
         if not db.is_connected():
@@ -40,19 +109,25 @@ async def list_lost_items(
                 detail="No hay conexión a MongoDB"
             )
         
-        # Construir filtro de búsqueda
-        filter_query = {}
-        if q:
-            # Búsqueda por título o ubicación
-            filter_query = {
-                "$or": [
-                    {"title": {"$regex": q, "$options": "i"}},
-                    {"found_location": {"$regex": q, "$options": "i"}}
-                ]
-            }
+        try:
+            if q and q.strip():
+                # Búsqueda por título, ubicación o descripción usando el índice de texto,
+                # ordenada por relevancia
+                items, next_cursor = await db.text_search_page("lost_items", q.strip(), limit=limit, cursor=cursor)
+            else:
+                # Obtener objetos perdidos paginados por cursor
+                items, next_cursor = await db.find_page("lost_items", limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except OperationFailure:
+            # El índice de texto se crea en segundo plano al arrancar y puede no existir todavía
+            raise HTTPException(
+                status_code=503,
+                detail="Búsqueda no disponible temporalmente. Intente de nuevo en unos segundos."
+            )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         
-        # Obtener objetos perdidos
-        items = db.find_all("lost_items", filter_query=filter_query, limit=100)
         # Convertir a formato de respuesta
         items_response = []
         for item in items:
@@ -76,6 +151,8 @@ async def list_lost_items(
         
         return items_response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -85,7 +162,7 @@ async def list_lost_items(
 @router.post("/create", response_model=LostItemResponse, status_code=201)
 async def create_lost_item(
     item: LostItemCreate,
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = Depends(require_admin)
 ):
     """
@@ -110,11 +187,11 @@ async def create_lost_item(
         }
         
         # Insertar en MongoDB
-        collection = db.get_collection("lost_items")
-        result = collection.insert_one(item_doc)
+        collection = await db.get_collection("lost_items")
+        result = await collection.insert_one(item_doc)
         
         # Obtener el objeto creado
-        created_item = db.find_by_id("lost_items", str(result.inserted_id))
+        created_item = await db.find_by_id("lost_items", str(result.inserted_id))
         
         if not created_item:
             raise HTTPException(
@@ -141,10 +218,65 @@ async def create_lost_item(
             detail=f"Error interno del servidor: {str(e)}"
         )
 
+@router.get("/miniatures")
+async def get_lost_item_miniatures(
+    request: Request,
+    ids: List[str] = Query(..., description="IDs de los objetos perdidos"),
+    size: Optional[int] = Query(None, ge=1, le=4096, description="Lado en píxeles deseado")
+):
+    """
+    Obtener en una sola llamada las URLs de las miniaturas de varios objetos perdidos
+    Los objetos sin miniatura aparecen con null
+    """
+    try:
+        unique_ids = list(dict.fromkeys(ids))
+        invalid_ids = [item_id for item_id in unique_ids if not ObjectId.is_valid(item_id)]
+        if invalid_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"ID de objeto inválido: '{invalid_ids[0]}'"
+            )
+        if len(unique_ids) > MAX_MINIATURE_BATCH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Máximo {MAX_MINIATURE_BATCH} objetos por consulta"
+            )
+        
+        # Cada objeto cuenta como una consulta individual de miniatura para el rate limit
+        # (el middleware ya contó la primera)
+        if len(unique_ids) > 1:
+            is_limited, _ = await rate_limiter.is_rate_limited(request.client.host, cost=len(unique_ids) - 1)
+            if is_limited:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Rate limit exceeded. Try again later."
+                )
+        
+        resolved_size = miniature_service.resolve_size(size)
+        urls = await miniature_service.get_miniature_urls(
+            unique_ids,
+            resolved_size,
+            fallback_url=lambda item_id: str(
+                request.url_for("get_lost_item_miniature", lost_item_id=item_id)
+                .include_query_params(size=resolved_size)
+            )
+        )
+        return {
+            "size": resolved_size,
+            "urls": urls
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error al obtener las miniaturas: {str(e)}"
+        )
+
 @router.get("/{item_id}", response_model=LostItemResponse)
 async def get_lost_item(
     item_id: str,
-    db: MongoDBService = Depends(get_mongodb)
+    db: AsyncMongoDBService = Depends(get_mongodb)
 ):
     """
     Obtener un objeto perdido específico por ID
@@ -156,7 +288,7 @@ async def get_lost_item(
                 detail="ID de objeto inválido"
             )
         
-        item = db.find_by_id("lost_items", item_id)
+        item = await db.find_by_id("lost_items", item_id)
         if not item:
             raise HTTPException(
                 status_code=404,
@@ -185,10 +317,12 @@ async def get_lost_item(
 @router.get("/{item_id}/image")
 async def get_lost_item_image(
     item_id: str,
-    db: MongoDBService = Depends(get_mongodb)
+    request: Request,
+    db: AsyncMongoDBService = Depends(get_mongodb)
 ):
     """
     Obtener imagen de un objeto perdido
+    Soporta ETag/Last-Modified (304) y peticiones Range (206)
     """
     try:
         if not db.is_valid_object_id(item_id):
@@ -197,28 +331,44 @@ async def get_lost_item_image(
                 detail="ID de objeto inválido"
             )
         
+        # Si la imagen existe se sirve directamente: no hace falta consultar MongoDB
+        image_key = LOST_ITEM_IMAGE_KEY.format(item_id=item_id)
+        metadata = await lost_item_storage.stat(image_key)
+        if metadata is not None:
+            return conditional_file_response(
+                request,
+                lambda start, length: lost_item_storage.stream(image_key, start=start, length=length),
+                size=metadata["size"],
+                etag=metadata["etag"],
+                weak_etag=metadata["weak_etag"],
+                last_modified=metadata["modified"],
+                media_type="image/jpeg",
+                cache_control=f"public, max-age={config_service.lost_item_image_max_age}"
+            )
+        
         # Verificar que el objeto existe
-        item = db.find_by_id("lost_items", item_id)
-        if not item:
+        if not await db.count_documents("lost_items", {"_id": ObjectId(item_id)}):
             raise HTTPException(
                 status_code=404,
                 detail="Objeto no encontrado"
             )
         
-        # Buscar imagen en el directorio de uploads
-        image_path = UPLOAD_DIR / f"{item_id}.jpg"
-        if not image_path.exists():
-            # Si no existe imagen, devolver una imagen por defecto
-            default_image = Path("assets/default_lost_item.jpg")
-            if default_image.exists():
-                return FileResponse(default_image)
-            else:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Imagen no encontrada"
-                )
-        
-        return FileResponse(image_path)
+        # Si no existe imagen, devolver una imagen por defecto
+        default_image = await _get_default_image()
+        if default_image is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Imagen no encontrada"
+            )
+        return conditional_file_response(
+            request,
+            bytes_stream(default_image["data"]),
+            size=len(default_image["data"]),
+            etag=default_image["etag"],
+            last_modified=default_image["modified"],
+            media_type="image/jpeg",
+            cache_control=f"public, max-age={DEFAULT_IMAGE_MAX_AGE}"
+        )
         
     except HTTPException:
         raise
@@ -233,7 +383,7 @@ async def claim_lost_item(
     item_id: str,
     notes: str = Form(...),
     evidences: List[UploadFile] = File(...),
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = require_auth()
 ):
     """
@@ -247,7 +397,7 @@ async def claim_lost_item(
             )
         
         # Verificar que el objeto existe y está disponible
-        item = db.find_by_id("lost_items", item_id)
+        item = await db.find_by_id("lost_items", item_id)
         if not item:
             raise HTTPException(
                 status_code=404,
@@ -267,55 +417,51 @@ async def claim_lost_item(
                 detail="Debe proporcionar al menos una evidencia"
             )
         
-        # Crear directorio para evidencias si no existe
-        evidence_dir = UPLOAD_DIR / "claims" / item_id
-        evidence_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Guardar archivos de evidencia
-        evidence_files = []
-        for i, evidence in enumerate(evidences):
-            if evidence.content_type not in ["image/jpeg", "image/png", "image/gif", "application/pdf"]:
+        for evidence in evidences:
+            if evidence.content_type not in EVIDENCE_CONTENT_TYPES:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Tipo de archivo no permitido: {evidence.content_type}"
                 )
-            
-            # Generar nombre único para el archivo
-            file_extension = evidence.filename.split(".")[-1] if "." in evidence.filename else "bin"
-            evidence_filename = f"evidence_{i}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-            evidence_path = evidence_dir / evidence_filename
-            
-            # Guardar archivo
-            with open(evidence_path, "wb") as buffer:
-                shutil.copyfileobj(evidence.file, buffer)
-            
-            evidence_files.append(evidence_filename)
+        
+        # Guardar archivos de evidencia
+        saved_evidences = await _save_evidences(item_id, evidences, db)
         
         # Crear documento de reclamo
         claim_doc = {
             "item_id": item_id,
             "notes": notes,
-            "evidence_files": evidence_files,
+            "evidence_files": [evidence["key"] for evidence in saved_evidences],
+            "evidences": saved_evidences,
             "status": "pending",
             "created_at": datetime.now().isoformat(),
             "updated_at": None
         }
         
-        # Insertar reclamo en MongoDB
-        collection = db.get_collection("claims")
-        claim_result = collection.insert_one(claim_doc)
-        
-        # Actualizar estado del objeto perdido
-        item_collection = db.get_collection("lost_items")
-        item_collection.update_one(
-            {"_id": ObjectId(item_id)},
-            {
-                "$set": {
-                    "status": "claimed",
-                    "updated_at": datetime.now().isoformat()
+        collection = await db.get_collection("claims")
+        claim_result = None
+        try:
+            # Insertar reclamo en MongoDB
+            claim_result = await collection.insert_one(claim_doc)
+            
+            # Actualizar estado del objeto perdido
+            item_collection = await db.get_collection("lost_items")
+            await item_collection.update_one(
+                {"_id": ObjectId(item_id)},
+                {
+                    "$set": {
+                        "status": "claimed",
+                        "updated_at": datetime.now().isoformat()
+                    }
                 }
-            }
-        )
+            )
+        except Exception:
+            # Deshacer el reclamo y soltar las referencias a las evidencias para no dejar blobs huérfanos
+            if claim_result is not None:
+                await collection.delete_one({"_id": claim_result.inserted_id})
+            for evidence in saved_evidences:
+                await blob_store.release(db, evidence["sha256"])
+            raise
         
         return ClaimResponse(
             message="Reclamo enviado exitosamente",
@@ -331,11 +477,74 @@ async def claim_lost_item(
             detail=f"Error interno del servidor: {str(e)}"
         )
 
+async def _save_evidences(item_id: str, evidences: List[UploadFile], db: AsyncMongoDBService) -> List[dict]:
+    """
+    Guarda las evidencias de un reclamo en el almacén de blobs de forma concurrente
+    
+    Cada archivo se corta en cuanto supera CLAIM_EVIDENCE_MAX_FILE_BYTES y el conjunto en cuanto
+    supera CLAIM_EVIDENCE_MAX_TOTAL_BYTES. Las evidencias con un contenido ya guardado no ocupan
+    espacio extra; si algo falla se liberan las referencias ya creadas.
+    
+    Args:
+        item_id: ID del objeto reclamado
+        evidences: Archivos subidos (tipos ya validados)
+        db: Servicio asíncrono de MongoDB
+        
+    Returns:
+        List[dict]: filename, content_type, size, sha256 y key de cada evidencia
+        
+    Raises:
+        HTTPException: 413 si se supera un límite de tamaño
+    """
+    max_file_bytes = config_service.claim_evidence_max_file_bytes
+    budget = ByteBudget(config_service.claim_evidence_max_total_bytes)
+    
+    # Rechazar sin escribir nada cuando el tamaño declarado ya supera los límites
+    declared_sizes = [evidence.size for evidence in evidences if evidence.size is not None]
+    if any(size > max_file_bytes for size in declared_sizes) or sum(declared_sizes) > budget.max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail="Las evidencias superan el tamaño máximo permitido"
+        )
+    
+    results = await asyncio.gather(*[
+        blob_store.put(db, evidence.file, evidence.content_type, max_bytes=max_file_bytes, budget=budget)
+        for evidence in evidences
+    ], return_exceptions=True)
+    
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        for result in results:
+            if not isinstance(result, BaseException):
+                await blob_store.release(db, result["sha256"])
+        if any(isinstance(error, StorageSizeLimitError) for error in errors):
+            raise HTTPException(
+                status_code=413,
+                detail="Las evidencias superan el tamaño máximo permitido"
+            )
+        if any(isinstance(error, BlobBusyError) for error in errors):
+            raise HTTPException(
+                status_code=503,
+                detail="No se pudieron guardar las evidencias. Intente de nuevo en unos segundos."
+            )
+        raise errors[0]
+    
+    return [
+        {
+            "filename": evidence.filename,
+            "content_type": evidence.content_type,
+            "size": result["size"],
+            "sha256": result["sha256"],
+            "key": result["key"]
+        }
+        for evidence, result in zip(evidences, results)
+    ]
+
 @router.put("/{item_id}", response_model=LostItemResponse)
 async def update_lost_item(
     item_id: str,
     item_update: LostItemUpdate,
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = require_auth()
 ):
     """
@@ -349,7 +558,7 @@ async def update_lost_item(
             )
         
         # Verificar que el objeto existe
-        existing_item = db.find_by_id("lost_items", item_id)
+        existing_item = await db.find_by_id("lost_items", item_id)
         if not existing_item:
             raise HTTPException(
                 status_code=404,
@@ -373,8 +582,8 @@ async def update_lost_item(
         update_fields["updated_at"] = datetime.now().isoformat()
         
         # Actualizar en MongoDB
-        collection = db.get_collection("lost_items")
-        result = collection.update_one(
+        collection = await db.get_collection("lost_items")
+        result = await collection.update_one(
             {"_id": ObjectId(item_id)},
             {"$set": update_fields}
         )
@@ -386,7 +595,7 @@ async def update_lost_item(
             )
         
         # Obtener objeto actualizado
-        updated_item = db.find_by_id("lost_items", item_id)
+        updated_item = await db.find_by_id("lost_items", item_id)
         
         return LostItemResponse(
             id=str(updated_item["_id"]),
@@ -410,7 +619,7 @@ async def update_lost_item(
 @router.delete("/{item_id}")
 async def delete_lost_item(
     item_id: str,
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     current_user: dict = require_admin()
 ):
     """
@@ -424,7 +633,7 @@ async def delete_lost_item(
             )
         
         # Verificar que el objeto existe
-        existing_item = db.find_by_id("lost_items", item_id)
+        existing_item = await db.find_by_id("lost_items", item_id)
         if not existing_item:
             raise HTTPException(
                 status_code=404,
@@ -432,8 +641,8 @@ async def delete_lost_item(
             )
         
         # Eliminar objeto
-        collection = db.get_collection("lost_items")
-        result = collection.delete_one({"_id": ObjectId(item_id)})
+        collection = await db.get_collection("lost_items")
+        result = await collection.delete_one({"_id": ObjectId(item_id)})
         
         if result.deleted_count == 0:
             raise HTTPException(
@@ -442,13 +651,16 @@ async def delete_lost_item(
             )
         
         # Eliminar archivos asociados
-        image_path = UPLOAD_DIR / f"{item_id}.jpg"
-        if image_path.exists():
-            image_path.unlink()
+        await lost_item_storage.delete(LOST_ITEM_IMAGE_KEY.format(item_id=item_id))
+        
+        # Liberar las evidencias de sus reclamos (los blobs sin referencias se borran)
+        claims = await db.find_all("claims", {"item_id": item_id}, projection={"evidences.sha256": 1})
+        for claim in claims:
+            for evidence in claim.get("evidences", []):
+                await blob_store.release(db, evidence["sha256"])
         
-        evidence_dir = UPLOAD_DIR / "claims" / item_id
-        if evidence_dir.exists():
-            shutil.rmtree(evidence_dir)
+        # Evidencias guardadas antes del almacén de blobs
+        await lost_item_storage.delete_prefix(CLAIM_EVIDENCE_PREFIX.format(item_id=item_id))
         
         return {
             "message": "Objeto eliminado exitosamente",
@@ -465,17 +677,21 @@ async def delete_lost_item(
 
 @router.get("/{lost_item_id}/miniature")
 async def get_lost_item_miniature(
-    lost_item_id: str
+    lost_item_id: str,
+    size: Optional[int] = Query(None, ge=1, le=4096, description="Lado en píxeles deseado; se sirve la variante más pequeña que lo cubra")
 ):
     """
-    Obtener la miniatura de un objeto perdido desde S3
+    Obtener la miniatura de un objeto perdido desde el almacenamiento
     """
     try:
-        # Obtener URL de la miniatura desde S3
-        miniature_url = await miniature_service.get_miniature_url(lost_item_id)
+        # Obtener URL de la variante adecuada
+        miniature_url = await miniature_service.get_miniature_url(lost_item_id, size)
         
-        # Redirigir a la URL de S3
-        return RedirectResponse(url=miniature_url)
+        # Redirigir a la URL directa (S3) o servir el archivo si el almacenamiento no la ofrece
+        if miniature_url:
+            return RedirectResponse(url=miniature_url)
+        content, media_type = await miniature_service.stream_miniature(lost_item_id, size)
+        return StreamingResponse(content, media_type=media_type)
         
     except HTTPException:
         raise
@@ -488,6 +704,7 @@ async def get_lost_item_miniature(
 @router.post("/{lost_item_id}/miniature")
 async def upload_lost_item_miniature(
     lost_item_id: str,
+    request: Request,
     image: UploadFile = File(...),
     current_user: dict = require_auth()
 ):
@@ -508,7 +725,9 @@ async def upload_lost_item_miniature(
         return {
             "message": "Miniatura subida exitosamente",
             "item_id": lost_item_id,
-            "miniature_url": result["miniature_url"]
+            "miniature_url": result["miniature_url"] or str(
+                request.url_for("get_lost_item_miniature", lost_item_id=lost_item_id)
+            )
         }
         
     except HTTPException:
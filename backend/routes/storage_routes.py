@@ -1,25 +1,101 @@
-from fastapi import APIRouter, UploadFile, File, Depends
-from services.s3_service import s3_service
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
+from services.storage_service import file_storage
+from services.file_responses import conditional_file_response
+from services.storage_backends import StorageError, StorageNotFoundError
 from services.lambda_service import lambda_service
 from Auth.auth_dependencies import require_user, require_admin
+import mimetypes
+import re
+from pathlib import PurePosixPath
 
 router = APIRouter(prefix="/storage", tags=["storage"])
 
+# Tipos de archivo que se pueden subir
+ALLOWED_CONTENT_TYPES = ['image/jpeg', 'image/png', 'image/webp', 'application/pdf']
+
+def _safe_filename(filename: str) -> str:
+    """
+    Reduce el nombre enviado por el cliente a un nombre de archivo sin rutas
+    (evita escribir sobre miniaturas u otras claves del almacenamiento)
+
+    Raises:
+        HTTPException: Si el nombre queda vacío
+    """
+    name = PurePosixPath((filename or "").replace("\\", "/")).name
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", name).lstrip(".")
+    if not name:
+        raise HTTPException(status_code=400, detail="Nombre de archivo inválido")
+    return name
+
 @router.post("/upload")
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     _: dict = Depends(require_user)  # Cualquier usuario autenticado puede subir archivos
 ):
-    result = await s3_service.upload_file(file.file, file.filename)
-    return result
+    filename = _safe_filename(file.filename)
+
+    # Verificar tipo MIME usando la extensión del archivo
+    content_type = mimetypes.guess_type(filename)[0]
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="Tipo de archivo no permitido")
+
+    try:
+        result = await file_storage.write(filename, file.file, content_type)
+    except StorageError:
+        raise HTTPException(status_code=400, detail="Nombre de archivo inválido")
+    except Exception:
+        raise HTTPException(status_code=500, detail="Error al subir archivo")
+
+    return {
+        "filename": result["key"],
+        "url": await _file_url(request, result["key"]),
+        "sha256": result["sha256"],
+        "size": result["size"]
+    }
 
 @router.get("/file/{filename}")
 async def get_file(
     filename: str,
+    request: Request,
     _: dict = Depends(require_user)  # Cualquier usuario autenticado puede ver archivos
 ):
-    url = await s3_service.get_file_url(filename)
-    return {"url": url}
+    return {"url": await _file_url(request, filename)}
+
+@router.get("/download/{filename}")
+async def download_file(
+    filename: str,
+    request: Request,
+    _: dict = Depends(require_user)
+):
+    """
+    Descarga un archivo a través de la API (almacenamientos sin URLs directas)
+    """
+    try:
+        metadata = await file_storage.stat(filename)
+    except StorageError:
+        metadata = None
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Archivo no encontrado")
+
+    return conditional_file_response(
+        request,
+        lambda start, length: file_storage.stream(filename, start=start, length=length),
+        size=metadata["size"],
+        etag=metadata["etag"],
+        weak_etag=metadata["weak_etag"],
+        last_modified=metadata["modified"],
+        media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        cache_control="private, max-age=0, must-revalidate"
+    )
+
+async def _file_url(request: Request, filename: str) -> str:
+    """URL directa del almacenamiento o, si no la ofrece, la ruta de descarga de la API"""
+    try:
+        url = await file_storage.get_url(filename)
+    except StorageNotFoundError:
+        raise HTTPException(status_code=404, detail="Archivo no encontrado")
+    return url or str(request.url_for("download_file", filename=filename))
 
 @router.post("/validate")
 async def validate_data(
@@ -27,4 +103,4 @@ async def validate_data(
     _: dict = Depends(require_admin)  # Solo admins pueden validar datos
 ):
     result = await lambda_service.validate_data(data)
-    return result
\ No newline at end of file
+    return result
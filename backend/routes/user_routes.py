@@ -1,11 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 
 # Importar servicios
-from services.mongodb_service import MongoDBService
+from services.async_mongodb_service import AsyncMongoDBService
 from services.password_service import password_service
+from services.user_cache import user_cache
 from services.dependencies import get_mongodb
 
 # Importar schemas
@@ -20,13 +21,18 @@ router = APIRouter(prefix="/admin/users", tags=["Administración de Usuarios"])
 
 @router.get("/", response_model=List[UsuarioResponse])
 async def get_all_users(
+    response: Response,
     skip: int = 0, 
-    limit: int = 100, 
-    db: MongoDBService = Depends(get_mongodb),
+    limit: int = Query(100, ge=1, le=500), 
+    cursor: Optional[str] = None,
+    db: AsyncMongoDBService = Depends(get_mongodb),
     _: dict = Depends(require_admin)
 ):
     """
     Obtener lista de todos los usuarios (solo admin)
+    
+    Con `cursor` se pagina por keyset (el header X-Next-Cursor trae la siguiente página);
+    `skip` se mantiene por compatibilidad.
     """
     try:
         if not db.is_connected():
@@ -35,7 +41,15 @@ async def get_all_users(
                 detail="No hay conexión a MongoDB"
             )
             
-        usuarios = db.find_all("usuarios", limit=limit, skip=skip)
+        if skip > 0 and not cursor:
+            usuarios = await db.find_all("usuarios", limit=limit, skip=skip)
+        else:
+            try:
+                usuarios, next_cursor = await db.find_page("usuarios", limit=limit, cursor=cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
         
         if usuarios:
             print(f"✅ Encontrados {len(usuarios)} usuarios")
@@ -61,10 +75,20 @@ async def get_all_users(
         raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}")
 
 
+@router.get("/cache/stats")
+async def get_user_cache_stats(
+    _: dict = Depends(require_admin)
+):
+    """
+    Obtener métricas de la caché de usuarios autenticados (solo admin)
+    """
+    return user_cache.get_stats()
+
+
 @router.get("/{user_id}", response_model=UsuarioResponse)
 async def get_user_by_id(
     user_id: str, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     _: dict = Depends(require_admin)
 ):
     """
@@ -81,7 +105,7 @@ async def get_user_by_id(
         print(f"🔍 Buscando usuario con ID: {user_id}")
         
         # Buscar usuario
-        usuario = db.find_by_id_with_validation("usuarios", user_id)
+        usuario = await db.find_by_id_with_validation("usuarios", user_id)
         if not usuario:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
@@ -105,7 +129,7 @@ async def get_user_by_id(
 @router.post("/", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     usuario: UsuarioCreate, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     _: dict = Depends(require_admin)
 ):
     """
@@ -113,7 +137,7 @@ async def create_user(
     """
     try:
         # Verificar si el correo ya existe
-        usuario_existente = db.find_one("usuarios", {"correo": usuario.correo})
+        usuario_existente = await db.find_one("usuarios", {"correo": usuario.correo})
         if usuario_existente:
             raise HTTPException(
                 status_code=400, 
@@ -132,19 +156,19 @@ async def create_user(
         usuario_doc = {
             "nombre": usuario.nombre,
             "correo": usuario.correo,
-            "contraseña": password_service.hash_password(usuario.contraseña),
+            "contraseña": await password_service.hash_password_async(usuario.contraseña),
             "tipo": usuario.tipo,
             "fecha_creacion": datetime.now().isoformat()
         }
         
         # Insertar en MongoDB
-        collection = db.get_collection("usuarios")
-        result = collection.insert_one(usuario_doc)
+        collection = await db.get_collection("usuarios")
+        result = await collection.insert_one(usuario_doc)
         
         print(f"✅ Usuario creado con ID: {result.inserted_id}")
         
         # Obtener el usuario creado
-        usuario_creado = db.find_by_id_with_validation("usuarios", str(result.inserted_id))
+        usuario_creado = await db.find_by_id_with_validation("usuarios", str(result.inserted_id))
         
         if not usuario_creado:
             raise HTTPException(
@@ -171,7 +195,7 @@ async def create_user(
 async def update_user(
     user_id: str, 
     usuario_update: UsuarioUpdate, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     _: dict = Depends(require_admin)
 ):
     """
@@ -188,7 +212,7 @@ async def update_user(
         print(f"🔍 Verificando existencia del usuario con ID: {user_id}")
         
         # Verificar que el usuario existe
-        usuario_existente = db.find_by_id_with_validation("usuarios", user_id)
+        usuario_existente = await db.find_by_id_with_validation("usuarios", user_id)
         if not usuario_existente:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
@@ -203,7 +227,7 @@ async def update_user(
         if usuario_update.correo is not None:
             # Verificar que el nuevo correo no esté en uso por otro usuario
             if usuario_update.correo != usuario_existente["correo"]:
-                usuario_con_correo = db.find_one("usuarios", {"correo": usuario_update.correo})
+                usuario_con_correo = await db.find_one("usuarios", {"correo": usuario_update.correo})
                 if usuario_con_correo:
                     raise HTTPException(
                         status_code=400, 
@@ -220,7 +244,7 @@ async def update_user(
                     detail=f"La nueva contraseña no cumple con los requisitos de seguridad: {mensaje_error}"
                 )
             # Encriptar la nueva contraseña
-            update_fields["contraseña"] = password_service.hash_password(usuario_update.contraseña)
+            update_fields["contraseña"] = await password_service.hash_password_async(usuario_update.contraseña)
             
         if usuario_update.tipo is not None:
             update_fields["tipo"] = usuario_update.tipo
@@ -236,19 +260,22 @@ async def update_user(
         update_fields["fecha_actualizacion"] = datetime.now().isoformat()
         
         # Actualizar en MongoDB
-        collection = db.get_collection("usuarios")
-        result = collection.update_one(
+        collection = await db.get_collection("usuarios")
+        result = await collection.update_one(
             {"_id": ObjectId(user_id)},
             {"$set": update_fields}
         )
         
+        # Invalidar el usuario en la caché de autenticación
+        user_cache.invalidate(user_id)
+        
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="No se pudo actualizar el usuario")
         
         print(f"✅ Usuario actualizado exitosamente: {user_id}")
         
         # Obtener usuario actualizado
-        usuario_actualizado = db.find_by_id_with_validation("usuarios", user_id)
+        usuario_actualizado = await db.find_by_id_with_validation("usuarios", user_id)
         
         return UsuarioResponse(
             id=str(usuario_actualizado["_id"]),
@@ -268,7 +295,7 @@ async def update_user(
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: str, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     _: dict = Depends(require_admin)
 ):
     """
@@ -285,7 +312,7 @@ async def delete_user(
         print(f"🗑️ Intentando eliminar usuario con ID: {user_id}")
         
         # Verificar que el usuario existe antes de eliminar
-        usuario_existente = db.find_by_id_with_validation("usuarios", user_id)
+        usuario_existente = await db.find_by_id_with_validation("usuarios", user_id)
         if not usuario_existente:
             raise HTTPException(
                 status_code=404,
@@ -293,8 +320,9 @@ async def delete_user(
             )
             
         # Eliminar usuario
-        collection = db.get_collection("usuarios")
-        result = collection.delete_one({"_id": ObjectId(user_id)})
+        collection = await db.get_collection("usuarios")
+        result = await collection.delete_one({"_id": ObjectId(user_id)})
+        user_cache.invalidate(user_id)
         
         if result.deleted_count == 0:
             raise HTTPException(
@@ -324,14 +352,14 @@ async def delete_user(
 @router.get("/search/email/{email}", response_model=UsuarioResponse)
 async def search_user_by_email(
     email: str, 
-    db: MongoDBService = Depends(get_mongodb),
+    db: AsyncMongoDBService = Depends(get_mongodb),
     _: dict = Depends(require_admin)
 ):
     """
     Buscar usuario por correo electrónico (solo admin)
     """
     try:
-        usuario = db.find_one("usuarios", {"correo": email})
+        usuario = await db.find_one("usuarios", {"correo": email})
         if not usuario:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
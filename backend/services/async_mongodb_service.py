@@ -0,0 +1,361 @@
+import logging
+import re
+from typing import List, Dict, Any, Optional, Tuple
+from pymongo import AsyncMongoClient
+from pymongo.server_api import ServerApi
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+from bson import ObjectId
+
+class AsyncMongoDBService:
+    """
+    Servicio asíncrono para interactuar con MongoDB
+    Expone la misma interfaz que MongoDBService pero con métodos awaitables,
+    de modo que las consultas no bloquean el event loop de uvicorn
+    """
+    def __init__(self, uri: str, database_name: str):
+        """
+        Inicializa el servicio asíncrono de MongoDB
+
+        Args:
+            uri: URI de conexión a MongoDB
+            database_name: Nombre de la base de datos
+        """
+        self.uri = uri
+        self.database_name = database_name
+        self.client: Optional[AsyncMongoClient] = None
+        self.database: Optional[AsyncDatabase] = None
+        self._connected = False
+        self.logger = logging.getLogger(__name__)
+
+    async def connect(self) -> bool:
+        """
+        Establece conexión con MongoDB usando ServerApi
+        """
+        try:
+            if not self.uri or not self.database_name:
+                raise ValueError("MongoDB URI or database name not provided")
+
+            self.logger.info(f"Conectando (async) a la base de datos: {self.database_name}")
+            self.client = AsyncMongoClient(
+                self.uri,
+                server_api=ServerApi('1'),
+                serverSelectionTimeoutMS=5000  # 5 segundos de timeout
+            )
+            self.database = self.client[self.database_name]
+
+            # Prueba la conexión
+            await self.client.admin.command('ping')
+            self._connected = True
+            self.logger.info("Conexión asíncrona a MongoDB Atlas exitosa")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error de conexión a MongoDB Atlas: {e}")
+            self._connected = False
+            return False
+
+    async def disconnect(self):
+        """Cierra la conexión con MongoDB"""
+        if self.client:
+            await self.client.close()
+            self.client = None
+            self.database = None
+            self._connected = False
+
+    async def get_collection(self, collection_name: str) -> Optional[AsyncCollection]:
+        """
+        Obtiene una colección específica
+        """
+        if not self.is_connected():
+            if not await self.connect():
+                return None
+        return self.database[collection_name]
+
+    async def find_all(
+        self,
+        collection_name: str,
+        filter_query: Dict = None,
+        limit: int = 0,
+        skip: int = 0,
+        projection: Dict = None,
+        sort: List = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca todos los documentos en una colección
+
+        Args:
+            collection_name: Nombre de la colección
+            filter_query: Query de filtrado (opcional)
+            limit: Límite de documentos a retornar (0 = sin límite)
+            skip: Número de documentos a saltar para paginación (0 = no saltar)
+            projection: Proyección de campos (opcional)
+            sort: Lista de pares (campo, dirección) para ordenar (opcional)
+        """
+        try:
+            collection = await self.get_collection(collection_name)
+            if collection is None:
+                return []
+            query = filter_query if filter_query else {}
+            cursor = collection.find(query, projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            if skip > 0:
+                cursor = cursor.skip(skip)
+            if limit > 0:
+                cursor = cursor.limit(limit)
+            return await cursor.to_list(length=None)
+        except Exception as e:
+            self.logger.error(f"Error en find_all: {e}")
+            return []
+
+    async def find_one(self, collection_name: str, filter_query: Dict) -> Optional[Dict[str, Any]]:
+        """
+        Busca un documento específico en una colección
+        """
+        try:
+            collection = await self.get_collection(collection_name)
+            if collection is None:
+                return None
+            return await collection.find_one(filter_query)
+        except Exception as e:
+            self.logger.error(f"Error en find_one: {e}")
+            return None
+
+    async def find_by_id(self, collection_name: str, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca un documento por su ID
+        """
+        try:
+            collection = await self.get_collection(collection_name)
+            if collection is None or not ObjectId.is_valid(document_id):
+                return None
+            return await collection.find_one({"_id": ObjectId(document_id)})
+        except Exception as e:
+            self.logger.error(f"Error en find_by_id: {e}")
+            return None
+
+    async def find_by_id_with_validation(self, collection_name: str, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca un documento por su ID con validación adicional
+        """
+        try:
+            # Validar formato del ID
+            if not ObjectId.is_valid(document_id):
+                self.logger.error(f"ID inválido: {document_id}")
+                return None
+
+            # Buscar documento
+            collection = await self.get_collection(collection_name)
+            if collection is None:
+                self.logger.error(f"Colección no encontrada: {collection_name}")
+                return None
+
+            document = await collection.find_one({"_id": ObjectId(document_id)})
+            if not document:
+                self.logger.error(f"Documento no encontrado con ID: {document_id}")
+                return None
+
+            return document
+
+        except Exception as e:
+            self.logger.error(f"Error en find_by_id_with_validation: {e}")
+            return None
+
+    async def find_page(
+        self,
+        collection_name: str,
+        filter_query: Dict = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Dict = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Paginación por cursor (keyset) sobre _id
+        Cada página cuesta lo mismo sin importar su profundidad, a diferencia de skip
+
+        Args:
+            collection_name: Nombre de la colección
+            filter_query: Query de filtrado (opcional)
+            limit: Tamaño de la página
+            cursor: _id del último documento de la página anterior (opcional)
+            projection: Proyección de campos (opcional)
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (documentos, cursor de la siguiente página o None)
+
+        Raises:
+            ValueError: Si el cursor no es un ObjectId válido
+        """
+        query = dict(filter_query) if filter_query else {}
+        if cursor:
+            if not ObjectId.is_valid(cursor):
+                raise ValueError("Cursor de paginación inválido")
+            keyset = {"_id": {"$gt": ObjectId(cursor)}}
+            query = {"$and": [query, keyset]} if query else keyset
+
+        # Pedir un documento extra para saber si existe una página siguiente
+        documents = await self.find_all(
+            collection_name,
+            filter_query=query,
+            limit=limit + 1,
+            projection=projection,
+            sort=[("_id", 1)]
+        )
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = str(documents[-1]["_id"])
+        return documents, next_cursor
+
+    async def text_search_page(
+        self,
+        collection_name: str,
+        search: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Búsqueda en el índice de texto paginada por cursor (keyset) sobre (relevancia, _id)
+        A diferencia de find_all, los errores de MongoDB no se ocultan: si el índice de texto
+        no existe todavía la búsqueda falla en lugar de devolver una lista vacía.
+
+        Args:
+            collection_name: Nombre de la colección
+            search: Términos de búsqueda ($text)
+            limit: Tamaño de la página
+            cursor: "relevancia:_id" del último documento de la página anterior (opcional)
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (documentos con su campo score, cursor de la
+            siguiente página o None)
+
+        Raises:
+            ValueError: Si el cursor no es válido
+            pymongo.errors.OperationFailure: Si la consulta falla (p. ej. falta el índice de texto)
+        """
+        pipeline = [
+            {"$match": {"$text": {"$search": search}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}}
+        ]
+        if cursor:
+            score, _, last_id = cursor.partition(":")
+            try:
+                score = float(score)
+            except ValueError:
+                raise ValueError("Cursor de paginación inválido")
+            if not ObjectId.is_valid(last_id):
+                raise ValueError("Cursor de paginación inválido")
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": score}},
+                {"score": score, "_id": {"$gt": ObjectId(last_id)}}
+            ]}})
+        # Pedir un documento extra para saber si existe una página siguiente
+        pipeline += [{"$sort": {"score": -1, "_id": 1}}, {"$limit": limit + 1}]
+
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return [], None
+        documents = await (await collection.aggregate(pipeline)).to_list(length=None)
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = f"{documents[-1]['score']!r}:{documents[-1]['_id']}"
+        return documents, next_cursor
+
+    async def find_by_ids(self, collection_name: str, document_ids: List[str], projection: Dict = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Busca varios documentos por ID en una sola consulta ($in)
+
+        Args:
+            collection_name: Nombre de la colección
+            document_ids: Lista de IDs (los inválidos se ignoran)
+            projection: Proyección de campos (opcional)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Documentos indexados por su ID en string
+        """
+        object_ids = list({ObjectId(doc_id) for doc_id in document_ids if doc_id and ObjectId.is_valid(str(doc_id))})
+        if not object_ids:
+            return {}
+        documents = await self.find_all(
+            collection_name,
+            filter_query={"_id": {"$in": object_ids}},
+            projection=projection
+        )
+        return {str(document["_id"]): document for document in documents}
+
+    async def count_documents(self, collection_name: str, filter_query: Dict = None) -> int:
+        """
+        Cuenta documentos en una colección
+        """
+        try:
+            collection = await self.get_collection(collection_name)
+            if collection is None:
+                return 0
+            query = filter_query if filter_query else {}
+            return await collection.count_documents(query)
+        except Exception as e:
+            self.logger.error(f"Error en count_documents: {e}")
+            return 0
+
+    async def aggregate(self, collection_name: str, pipeline: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Ejecuta una agregación en la colección
+        """
+        try:
+            collection = await self.get_collection(collection_name)
+            if collection is None:
+                return []
+            cursor = await collection.aggregate(pipeline)
+            return await cursor.to_list(length=None)
+        except Exception as e:
+            self.logger.error(f"Error en aggregate: {e}")
+            return []
+
+    async def create_index(self, collection_name: str, keys: List, **kwargs) -> Optional[str]:
+        """
+        Crea un índice en la colección si no existe (operación idempotente)
+
+        Args:
+            collection_name: Nombre de la colección
+            keys: Lista de pares (campo, tipo de índice)
+            **kwargs: Opciones del índice (name, unique, weights, default_language...)
+
+        Returns:
+            Optional[str]: Nombre del índice o None si falla
+        """
+        try:
+            collection = await self.get_collection(collection_name)
+            if collection is None:
+                return None
+            return await collection.create_index(keys, **kwargs)
+        except Exception as e:
+            self.logger.error(f"Error en create_index: {e}")
+            return None
+
+    def is_valid_object_id(self, id_str: str) -> bool:
+        """Verifica si un string es un ObjectId válido"""
+        return ObjectId.is_valid(id_str)
+
+    def is_connected(self) -> bool:
+        """
+        Verifica si la conexión está activa
+        """
+        return self._connected
+
+    async def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Búsqueda segura por email con sanitización"""
+        if not isinstance(email, str):
+            return None
+
+        # Sanitizar email
+        email = email.lower().strip()
+        if not self._is_valid_email(email):
+            return None
+
+        return await self.find_one("usuarios", {"correo": email})
+
+    def _is_valid_email(self, email: str) -> bool:
+        """Validación de formato de email"""
+        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+        return bool(re.match(pattern, email))
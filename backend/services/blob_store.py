@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import BinaryIO, Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from services.storage_backends import StorageBackend, StorageError, ByteBudget, HashingReader, DEFAULT_CHUNK_SIZE
+from services.storage_service import lost_item_storage
+
+# Espera entre intentos de put() mientras release() borra el mismo blob
+TOMBSTONE_RETRY_SECONDS = 0.05
+# Intentos de put() antes de rendirse (release() solo tiene que borrar un archivo)
+TOMBSTONE_MAX_RETRIES = 5
+# Un borrado que no terminó en este tiempo se considera abandonado (proceso caído)
+TOMBSTONE_STALE_SECONDS = 60
+
+class BlobBusyError(StorageError):
+    """El blob se está borrando y no se le pueden sumar referencias todavía"""
+    pass
+
+class BlobStore:
+    """
+    Almacén de archivos direccionado por contenido
+    Cada archivo se guarda una sola vez con su SHA-256 como nombre y la colección "blobs"
+    lleva la cuenta de referencias; el archivo se borra cuando deja de estar referenciado.
+    Mientras se borra, el documento queda marcado con "deleting_at" y put() espera a que
+    desaparezca antes de sumar referencias, así nunca se referencia un archivo a medio borrar.
+    """
+
+    collection_name = "blobs"
+
+    def __init__(self, storage: StorageBackend, prefix: str = "blobs"):
+        """
+        Inicializa el almacén de blobs
+
+        Args:
+            storage: Almacenamiento donde se guardan los archivos
+            prefix: Carpeta de los blobs dentro del almacenamiento
+        """
+        self.storage = storage
+        self.prefix = prefix
+        self.logger = logging.getLogger(__name__)
+
+    def blob_key(self, sha256: str) -> str:
+        """Clave del blob en el almacenamiento (repartida en subcarpetas por los 2 primeros caracteres)"""
+        return f"{self.prefix}/{sha256[:2]}/{sha256}"
+
+    @staticmethod
+    def _hash_file(fileobj: BinaryIO, max_bytes: Optional[int], budget: Optional[ByteBudget]) -> tuple:
+        """Calcula SHA-256 y tamaño aplicando los límites, y deja el archivo al inicio"""
+        reader = HashingReader(fileobj, max_bytes, budget)
+        while reader.read(DEFAULT_CHUNK_SIZE):
+            pass
+        fileobj.seek(0)
+        return reader.hexdigest(), reader.size
+
+    async def put(
+        self,
+        db,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        budget: Optional[ByteBudget] = None
+    ) -> dict:
+        """
+        Guarda un archivo (si su contenido no existía ya) y suma una referencia
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+            fileobj: Archivo binario síncrono y con seek (UploadFile.file, BytesIO...)
+            content_type: Tipo MIME del archivo
+            max_bytes: Tamaño máximo del archivo (opcional)
+            budget: Límite compartido con otros archivos de la petición (opcional)
+
+        Returns:
+            dict: sha256, key, size y deduplicated (True si el contenido ya estaba guardado)
+
+        Raises:
+            StorageSizeLimitError: Si se supera un límite (no se escribe ni se referencia nada)
+            BlobBusyError: Si el mismo contenido se sigue borrando tras varios intentos
+        """
+        # Primera pasada: hash y límites, sin escribir nada
+        sha256, size = await asyncio.to_thread(self._hash_file, fileobj, max_bytes, budget)
+        key = self.blob_key(sha256)
+
+        collection = await db.get_collection(self.collection_name)
+        created = await self._add_reference(collection, sha256, size, content_type)
+
+        # Segunda pasada: escribir solo si el contenido es nuevo
+        deduplicated = not created and await self.storage.exists(key)
+        if not deduplicated:
+            try:
+                await self.storage.write(key, fileobj, content_type)
+            except Exception:
+                await self.release(db, sha256)
+                raise
+
+        return {"sha256": sha256, "key": key, "size": size, "deduplicated": deduplicated}
+
+    async def _add_reference(self, collection, sha256: str, size: int, content_type: Optional[str]) -> bool:
+        """
+        Suma una referencia al blob, esperando si release() lo está borrando
+
+        Returns:
+            bool: True si se creó el documento (el archivo hay que escribirlo)
+
+        Raises:
+            BlobBusyError: Si el borrado no termina tras TOMBSTONE_MAX_RETRIES intentos
+        """
+        for attempt in range(TOMBSTONE_MAX_RETRIES + 1):
+            try:
+                # Con la marca de borrado el filtro no coincide y el upsert choca con el _id existente
+                result = await collection.update_one(
+                    {"_id": sha256, "deleting_at": None},
+                    {
+                        "$inc": {"refcount": 1},
+                        "$setOnInsert": {"size": size, "content_type": content_type, "created_at": datetime.now()}
+                    },
+                    upsert=True
+                )
+                return result.upserted_id is not None
+            except DuplicateKeyError:
+                # Retomar borrados abandonados; el archivo se vuelve a escribir al recrear el documento
+                stale_before = datetime.now() - timedelta(seconds=TOMBSTONE_STALE_SECONDS)
+                await collection.delete_one({"_id": sha256, "deleting_at": {"$lt": stale_before}})
+                if attempt < TOMBSTONE_MAX_RETRIES:
+                    await asyncio.sleep(TOMBSTONE_RETRY_SECONDS * (attempt + 1))
+        raise BlobBusyError(f"El blob {sha256} se está eliminando")
+
+    async def release(self, db, sha256: str) -> bool:
+        """
+        Resta una referencia y borra el blob si ya no está referenciado
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+            sha256: Hash del blob
+
+        Returns:
+            bool: True si el blob se eliminó del almacenamiento
+        """
+        collection = await db.get_collection(self.collection_name)
+        blob = await collection.find_one_and_update(
+            {"_id": sha256},
+            {"$inc": {"refcount": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if blob is None or blob["refcount"] > 0:
+            return False
+
+        # Marcar el borrado solo si nadie lo volvió a referenciar entretanto; desde aquí
+        # put() no puede sumar referencias hasta que se elimine el documento
+        marked = await collection.update_one(
+            {"_id": sha256, "refcount": {"$lte": 0}, "deleting_at": None},
+            {"$set": {"deleting_at": datetime.now()}}
+        )
+        if marked.modified_count == 0:
+            return False
+
+        # Primero el archivo y después el documento: un put() posterior lo recrea y lo reescribe
+        try:
+            await self.storage.delete(self.blob_key(sha256))
+        finally:
+            await collection.delete_one({"_id": sha256, "deleting_at": {"$ne": None}})
+        self.logger.info(f"Blob sin referencias eliminado: {sha256}")
+        return True
+
+# Instancia global del almacén de blobs (evidencias de reclamos)
+blob_store = BlobStore(lost_item_storage)
@@ -48,13 +48,69 @@ class ConfigService:
         self.app_host = os.getenv("APP_HOST", "0.0.0.0")
         self.app_port = int(os.getenv("APP_PORT", "8000"))
         self.app_debug = os.getenv("DEBUG", "false").lower() == "true"
-        
+
+        # Cache Configuration
+        self.user_cache_ttl_seconds = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+        self.user_cache_max_size = int(os.getenv("USER_CACHE_MAX_SIZE", "1000"))
+        self.token_cache_max_size = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+        self.revocation_sync_interval_seconds = int(os.getenv("REVOCATION_SYNC_INTERVAL_SECONDS", "10"))
+        self.refresh_token_ttl_days = int(os.getenv("REFRESH_TOKEN_TTL_DAYS", "7"))
+        self.refresh_token_reuse_grace_seconds = int(os.getenv("REFRESH_TOKEN_REUSE_GRACE_SECONDS", "10"))
+
+        # Rate Limiting Configuration
+        self.rate_limit_backend = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+        self.rate_limit_redis_url = os.getenv("RATE_LIMIT_REDIS_URL", "unix:///tmp/ratelimit.sock")
+        self.rate_limit_max_requests = int(os.getenv("RATE_LIMIT_MAX_REQUESTS", "100"))
+        self.rate_limit_window_seconds = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+
+        # Failed Login Tracking Configuration
+        self.login_attempts_backend = os.getenv("LOGIN_ATTEMPTS_BACKEND", "memory").lower()
+        self.login_attempts_redis_url = os.getenv("LOGIN_ATTEMPTS_REDIS_URL", self.rate_limit_redis_url)
+        self.login_attempts_max_keys = int(os.getenv("LOGIN_ATTEMPTS_MAX_KEYS", "100000"))
+
+        # Password Hashing Pool Configuration
+        self.password_pool_workers = int(os.getenv("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 1)))
+        self.password_pool_max_pending = int(os.getenv("PASSWORD_POOL_MAX_PENDING", "32"))
+
+        # Image Processing Pool Configuration
+        self.image_pool_workers = int(os.getenv("IMAGE_POOL_WORKERS", "2"))
+        self.image_pool_max_pending = int(os.getenv("IMAGE_POOL_MAX_PENDING", "8"))
+
+        # Miniature Variants Configuration
+        self.miniature_sizes = self._parse_sizes_env("MINIATURE_SIZES", ["64", "150", "300", "800"])
+        self.miniature_format = os.getenv("MINIATURE_FORMAT", "webp").lower()
+        self.miniature_quality = int(os.getenv("MINIATURE_QUALITY", "80"))
+        self.miniature_max_upload_bytes = int(os.getenv("MINIATURE_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+        # Storage Configuration (local | s3)
+        self.file_storage_backend = os.getenv("FILE_STORAGE_BACKEND", "s3").lower()
+        self.lost_item_storage_backend = os.getenv("LOST_ITEM_STORAGE_BACKEND", "local").lower()
+        self.local_storage_dir = os.getenv("LOCAL_STORAGE_DIR", "uploads")
+        # Los archivos subidos por usuarios van en su propio directorio, separados de los objetos perdidos
+        self.file_storage_local_dir = os.getenv("FILE_STORAGE_LOCAL_DIR", os.path.join(self.local_storage_dir, "files"))
+        self.storage_io_workers = int(os.getenv("STORAGE_IO_WORKERS", "4"))
+        self.claim_evidence_max_file_bytes = int(os.getenv("CLAIM_EVIDENCE_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+        self.claim_evidence_max_total_bytes = int(os.getenv("CLAIM_EVIDENCE_MAX_TOTAL_BYTES", str(25 * 1024 * 1024)))
+        self.lost_item_image_max_age = int(os.getenv("LOST_ITEM_IMAGE_MAX_AGE", "3600"))
+
         # AWS Configuration
         self.aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
         self.aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
         self.aws_region = os.getenv("AWS_REGION", "us-east-1")
         self.aws_bucket = os.getenv("AWS_S3_BUCKET")
+        self.s3_upload_chunk_size = int(os.getenv("S3_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+        self.presigned_url_expires_in = int(os.getenv("PRESIGNED_URL_EXPIRES_IN", "3600"))
+        self.presigned_url_refresh_margin_seconds = int(os.getenv("PRESIGNED_URL_REFRESH_MARGIN_SECONDS", "300"))
+        self.presigned_url_missing_ttl_seconds = int(os.getenv("PRESIGNED_URL_MISSING_TTL_SECONDS", "60"))
+        self.presigned_url_cache_max_size = int(os.getenv("PRESIGNED_URL_CACHE_MAX_SIZE", "5000"))
         self.lambda_api_url = os.getenv("LAMBDA_API_URL")
+        self.lambda_timeout_seconds = float(os.getenv("LAMBDA_TIMEOUT_SECONDS", "10"))
+        self.lambda_connect_timeout_seconds = float(os.getenv("LAMBDA_CONNECT_TIMEOUT_SECONDS", "3"))
+        self.lambda_max_connections = int(os.getenv("LAMBDA_MAX_CONNECTIONS", "20"))
+        self.lambda_max_retries = int(os.getenv("LAMBDA_MAX_RETRIES", "2"))
+        self.lambda_retry_backoff_seconds = float(os.getenv("LAMBDA_RETRY_BACKOFF_SECONDS", "0.2"))
+        self.lambda_circuit_failure_threshold = int(os.getenv("LAMBDA_CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.lambda_circuit_reset_seconds = float(os.getenv("LAMBDA_CIRCUIT_RESET_SECONDS", "30"))
         
         self.logger.info("Configuración cargada exitosamente")
     
@@ -74,12 +130,37 @@ class ConfigService:
             try:
                 # Intentar parsear como JSON si es posible
                 import json
-                return json.loads(value)
+                parsed = json.loads(value)
+                # Un valor suelto ("300") se trata como lista de un elemento
+                return parsed if isinstance(parsed, list) else [parsed]
             except (json.JSONDecodeError, ValueError):
                 # Si falla, dividir por comas
                 return [item.strip() for item in value.split(",")]
         return default
     
+    def _parse_sizes_env(self, env_var: str, default: List[str]) -> List[int]:
+        """
+        Parsea una variable de entorno con una lista de tamaños en píxeles
+        
+        Args:
+            env_var: Nombre de la variable de entorno
+            default: Valor por defecto si no se encuentra
+            
+        Returns:
+            List[int]: Tamaños positivos
+            
+        Raises:
+            ValueError: Si algún tamaño no es un entero positivo o la lista queda vacía
+        """
+        items = self._parse_list_env(env_var, default)
+        try:
+            sizes = [int(str(item).strip()) for item in items if str(item).strip() != ""]
+        except (TypeError, ValueError):
+            raise ValueError(f"{env_var} debe ser una lista de enteros positivos: {items}")
+        if not sizes or any(size <= 0 for size in sizes):
+            raise ValueError(f"{env_var} debe ser una lista de enteros positivos: {items}")
+        return sizes
+    
     def get_mongodb_config(self) -> dict:
         """
         Obtiene la configuración de MongoDB
@@ -1,16 +1,23 @@
 from fastapi import HTTPException, Depends
 from services.mongodb_service import MongoDBService
+from services.async_mongodb_service import AsyncMongoDBService
 from services.config_service import config_service
 
-# Instancia del servicio MongoDB usando configuración
+# Instancia síncrona del servicio MongoDB (scripts como utils/create_test_objs.py)
 mongo_service = MongoDBService(
     config_service.mongodb_uri,
     config_service.mongodb_database
 )
 
+# Instancia asíncrona usada por las rutas de la API
+async_mongo_service = AsyncMongoDBService(
+    config_service.mongodb_uri,
+    config_service.mongodb_database
+)
+
 # Dependency para verificar conexión a MongoDB
 async def get_mongodb():
-    if not mongo_service.is_connected():
-        if not mongo_service.connect():
+    if not async_mongo_service.is_connected():
+        if not await async_mongo_service.connect():
             raise HTTPException(status_code=500, detail="Error de conexión a MongoDB")
-    return mongo_service
+    return async_mongo_service
@@ -1,7 +1,12 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 from bson import ObjectId
 from schemas.event_schemas import EventCreate, EventUpdate, EventResponse
+from services.index_registry import index_registry
+
+# Índices para las consultas del calendario por rango de fechas
+index_registry.register("events", [("start", 1)])
+index_registry.register("events", [("end", 1), ("start", 1)])
 
 class EventService:
     @staticmethod
@@ -17,91 +22,151 @@ class EventService:
             raise ValueError("ID de evento inválido")
 
     @staticmethod
-    def create_event(event_data: EventCreate, db) -> EventResponse:
+    async def create_event(event_data: EventCreate, db) -> EventResponse:
         """Crear un nuevo evento."""
+        EventService.validate_event_dates(event_data.start, event_data.end)
         event_doc = {
             "title": event_data.title,
-            "start": event_data.start.isoformat(),
-            "end": event_data.end.isoformat() if event_data.end else None,
+            # Fechas como BSON Date nativo para poder consultar por rango con índice
+            "start": event_data.start,
+            "end": event_data.end,
             "location": event_data.location,
             "description": event_data.description,
             "created_at": datetime.now().isoformat(),
             "updated_at": None
         }
-        collection = db.get_collection("events")
-        result = collection.insert_one(event_doc)
-        return EventService.get_event_by_id(str(result.inserted_id), db)
+        collection = await db.get_collection("events")
+        result = await collection.insert_one(event_doc)
+        return await EventService.get_event_by_id(str(result.inserted_id), db)
 
     @staticmethod
-    def get_event_by_id(event_id: str, db) -> EventResponse:
+    async def get_event_by_id(event_id: str, db) -> EventResponse:
         """Obtener un evento por ID."""
         EventService.validate_event_id(event_id, db)
-        event = db.find_by_id("events", event_id)
+        event = await db.find_by_id("events", event_id)
         if not event:
             raise ValueError("Evento no encontrado")
         return EventService._convert_to_response(event)
 
     @staticmethod
-    def update_event(event_id: str, event_update: EventUpdate, db) -> EventResponse:
+    async def update_event(event_id: str, event_update: EventUpdate, db) -> EventResponse:
         """Actualizar un evento existente."""
         EventService.validate_event_id(event_id, db)
-        existing_event = db.find_by_id("events", event_id)
+        existing_event = await db.find_by_id("events", event_id)
         if not existing_event:
             raise ValueError("Evento no encontrado")
 
         update_fields = {k: v for k, v in event_update.dict(exclude_unset=True).items()}
         update_fields["updated_at"] = datetime.now().isoformat()
 
-        collection = db.get_collection("events")
-        result = collection.update_one(
+        collection = await db.get_collection("events")
+        result = await collection.update_one(
             {"_id": ObjectId(event_id)},
             {"$set": update_fields}
         )
         if result.modified_count == 0:
             raise ValueError("No se pudo actualizar el evento")
-        return EventService.get_event_by_id(event_id, db)
+        return await EventService.get_event_by_id(event_id, db)
 
     @staticmethod
-    def delete_event(event_id: str, db) -> dict:
+    async def delete_event(event_id: str, db) -> dict:
         """Eliminar un evento."""
         EventService.validate_event_id(event_id, db)
-        existing_event = db.find_by_id("events", event_id)
+        existing_event = await db.find_by_id("events", event_id)
         if not existing_event:
             raise ValueError("Evento no encontrado")
 
-        collection = db.get_collection("events")
-        result = collection.delete_one({"_id": ObjectId(event_id)})
+        collection = await db.get_collection("events")
+        result = await collection.delete_one({"_id": ObjectId(event_id)})
         if result.deleted_count == 0:
             raise ValueError("No se pudo eliminar el evento")
         return {"message": "Evento eliminado exitosamente", "event_id": event_id}
 
     @staticmethod
-    def filter_events_by_date(events: List[EventResponse], date: datetime) -> List[EventResponse]:
-        """Filtrar eventos por una fecha específica."""
-        return [
-            event for event in events
-            if datetime.fromisoformat(event.start).date() == date.date()
-        ]
+    def build_date_range_query(start: datetime, end: datetime) -> dict:
+        """
+        Construye el filtro de eventos que se solapan con el rango [start, end)
+        
+        Un evento se solapa si empieza antes del fin del rango y termina después
+        de su inicio; los eventos sin fecha de fin se tratan como instantáneos.
+        """
+        if start >= end:
+            raise ValueError("La fecha de inicio debe ser anterior a la fecha de fin")
+        return {
+            "$or": [
+                {"end": {"$gt": start}, "start": {"$lt": end}},
+                {"end": None, "start": {"$gte": start, "$lt": end}}
+            ]
+        }
 
     @staticmethod
-    def _convert_to_response(event) -> EventResponse:
-        """Convertir un documento de MongoDB a EventResponse."""
-        # Convertir datetime a string ISO si es necesario
-        start = event["start"]
-        if isinstance(start, datetime):
-            start = start.isoformat()
+    async def find_range_page(
+        db,
+        start: datetime,
+        end: datetime,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Eventos que se solapan con [start, end) paginados por cursor (keyset) sobre (start, _id)
         
-        end = event.get("end")
-        if end and isinstance(end, datetime):
-            end = end.isoformat()
+        Args:
+            db: Servicio asíncrono de MongoDB
+            start: Inicio del rango
+            end: Fin del rango
+            limit: Tamaño de la página
+            cursor: "inicio_id" del último evento de la página anterior (opcional)
+            
+        Returns:
+            Tuple[List[dict], Optional[str]]: (eventos ordenados por inicio, cursor de la siguiente página o None)
+            
+        Raises:
+            ValueError: Si el rango o el cursor no son válidos
+        """
+        query = EventService.build_date_range_query(start, end)
+        if cursor:
+            last_start, _, last_id = cursor.rpartition("_")
+            try:
+                last_start = datetime.fromisoformat(last_start)
+            except ValueError:
+                raise ValueError("Cursor de paginación inválido")
+            if not ObjectId.is_valid(last_id):
+                raise ValueError("Cursor de paginación inválido")
+            query = {"$and": [query, {"$or": [
+                {"start": {"$gt": last_start}},
+                {"start": last_start, "_id": {"$gt": ObjectId(last_id)}}
+            ]}]}
         
-        created_at = event.get("created_at", "")
-        if isinstance(created_at, datetime):
-            created_at = created_at.isoformat()
+        # Pedir un evento extra para saber si existe una página siguiente
+        events = await db.find_all("events", filter_query=query, limit=limit + 1, sort=[("start", 1), ("_id", 1)])
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = f"{events[-1]['start'].isoformat()}_{events[-1]['_id']}"
+        return events, next_cursor
+
+    @staticmethod
+    def _to_iso(value):
+        """
+        Convertir una fecha de MongoDB a string ISO con zona horaria explícita
         
-        updated_at = event.get("updated_at")
-        if updated_at and isinstance(updated_at, datetime):
-            updated_at = updated_at.isoformat()
+        MongoDB guarda las fechas en UTC y el cliente las devuelve sin zona horaria;
+        sin el offset el calendario las interpretaría como hora local.
+        """
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _convert_to_response(event) -> EventResponse:
+        """Convertir un documento de MongoDB a EventResponse."""
+        # Convertir datetime a string ISO (UTC explícito) si es necesario
+        start = EventService._to_iso(event["start"])
+        end = EventService._to_iso(event.get("end"))
+        created_at = EventService._to_iso(event.get("created_at", ""))
+        updated_at = EventService._to_iso(event.get("updated_at"))
         
         return EventResponse(
             id=str(event["_id"]),
@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Callable, Optional, Tuple
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interpreta una cabecera Range de un solo rango
+
+    Args:
+        range_header: Valor de la cabecera (bytes=inicio-fin, bytes=inicio- o bytes=-sufijo)
+        size: Tamaño total del archivo
+
+    Returns:
+        Optional[Tuple[int, int]]: (inicio, fin inclusivo), o None si el rango no es satisfacible
+
+    Raises:
+        ValueError: Si la cabecera no tiene un formato soportado (se ignora y se responde completo)
+    """
+    if size == 0:
+        return None
+
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        raise ValueError("Rango no soportado")
+
+    first, _, last = ranges.strip().partition("-")
+    if not first:
+        # Sufijo: los últimos N bytes
+        suffix = int(last)
+        if suffix <= 0:
+            return None
+        return max(0, size - suffix), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        return None
+    if start > end:
+        raise ValueError("Rango inválido")
+    return start, min(end, size - 1)
+
+def _etag_matches(header_value: str, etag: str) -> bool:
+    """Comparación débil de ETags para If-None-Match (admite * y listas)"""
+    candidates = [candidate.strip() for candidate in header_value.split(",")]
+    etag = etag.removeprefix("W/")
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def _not_modified_since(header_value: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header_value)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        # Las fechas con zona "-0000" se devuelven sin zona; HTTP siempre usa UTC
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+def conditional_file_response(
+    request: Request,
+    open_stream: Callable[[int, Optional[int]], AsyncIterator[bytes]],
+    size: int,
+    etag: str,
+    last_modified: datetime,
+    media_type: str,
+    cache_control: str,
+    weak_etag: bool = False
+) -> Response:
+    """
+    Respuesta de archivo con validación condicional (304) y soporte de Range (206)
+
+    Args:
+        request: Petición HTTP
+        open_stream: Función (inicio, longitud) que devuelve el contenido por bloques
+        size: Tamaño total del archivo
+        etag: Identificador del contenido (sin comillas)
+        last_modified: Fecha de última modificación (UTC)
+        media_type: Tipo MIME
+        cache_control: Valor de la cabecera Cache-Control
+        weak_etag: El ETag no se deriva del contenido (se envía como W/ y no valida If-Range)
+
+    Returns:
+        Response: 200, 206, 304 o 416
+    """
+    quoted_etag = f'W/"{etag}"' if weak_etag else f'"{etag}"'
+    headers = {
+        "ETag": quoted_etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes"
+    }
+
+    # If-None-Match tiene prioridad sobre If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, quoted_etag):
+            return Response(status_code=304, headers=headers)
+    elif _not_modified_since(request.headers.get("if-modified-since", ""), last_modified):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # Con If-Range solo se atiende el rango si el archivo no cambió (ETag fuerte o fecha exacta)
+    if_range_matches = if_range == headers["Last-Modified"] or (not weak_etag and if_range == quoted_etag)
+    if range_header and if_range and not if_range_matches:
+        range_header = None
+
+    if range_header:
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            # Rango con formato no soportado: se responde el archivo completo
+            pass
+        else:
+            if byte_range is None:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+            start, end = byte_range
+            length = end - start + 1
+            return StreamingResponse(
+                open_stream(start, length),
+                status_code=206,
+                media_type=media_type,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(length)}
+            )
+
+    return StreamingResponse(
+        open_stream(0, None),
+        media_type=media_type,
+        headers={**headers, "Content-Length": str(size)}
+    )
+
+def bytes_stream(data: bytes) -> Callable[[int, Optional[int]], AsyncIterator[bytes]]:
+    """Adapta bytes en memoria a la función open_stream de conditional_file_response"""
+    async def open_stream(start: int, length: Optional[int]) -> AsyncIterator[bytes]:
+        yield data[start:] if length is None else data[start:start + length]
+    return open_stream
@@ -0,0 +1,126 @@
+"""
+Procesamiento de imágenes con Pillow
+Funciones puras que se ejecutan dentro de los procesos del pool de MiniatureService
+"""
+import io
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+from PIL import Image, ImageOps
+
+EXIF_ORIENTATION_TAG = 0x0112
+# Orientaciones EXIF que rotan la imagen 90°/270° (intercambian ancho y alto)
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+# Margen sobre el tamaño final al reducir en el decoder (igual que reducing_gap de Pillow)
+DRAFT_REDUCING_GAP = 2.0
+
+def draft_request(image_size: Tuple[int, int], box: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Tamaño mínimo a pedir a draft() para una miniatura que encaja en `box`
+
+    Se calcula sobre el tamaño real de la miniatura (respetando la proporción de la imagen),
+    no sobre la caja: pedir una caja cuadrada a una foto 4:3 obliga a draft() a mantener el
+    lado corto y suele impedir cualquier reducción.
+
+    Args:
+        image_size: Tamaño (ancho, alto) de la imagen original
+        box: Tamaño máximo (ancho, alto) de la miniatura, ya orientado como la imagen
+
+    Returns:
+        Optional[Tuple[int, int]]: Tamaño a pedir, o None si no cabe ninguna reducción
+    """
+    width, height = image_size
+    ratio = min(box[0] / width, box[1] / height) * DRAFT_REDUCING_GAP
+    if ratio >= 0.5:
+        # draft() solo reduce a la mitad o menos
+        return None
+    return math.ceil(width * ratio), math.ceil(height * ratio)
+
+def decode_image(image_data: bytes, size: Tuple[int, int], use_draft: bool = True) -> Tuple[Image.Image, int]:
+    """
+    Decodifica la imagen ya orientada, reduciéndola en el decoder cuando es posible
+
+    Para JPEG, draft() decodifica a 1/2, 1/4 o 1/8 de la resolución eligiendo la escala
+    más pequeña que siga siendo al menos DRAFT_REDUCING_GAP veces el tamaño final. Los
+    demás formatos se decodifican completos.
+
+    Args:
+        image_data: Bytes de la imagen original
+        size: Tamaño máximo (ancho, alto) de la miniatura
+        use_draft: Si es False siempre decodifica a resolución completa
+
+    Returns:
+        Tuple[Image.Image, int]: Imagen RGB con la orientación EXIF aplicada y el divisor
+            de escala con el que se decodificó (1 = resolución completa, 2, 4 u 8)
+    """
+    image = Image.open(io.BytesIO(image_data))
+    original_width = image.width
+
+    if use_draft and image.format == "JPEG":
+        width, height = size
+        # El tamaño pedido se refiere a la imagen ya rotada
+        if image.getexif().get(EXIF_ORIENTATION_TAG) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        requested = draft_request(image.size, (width, height))
+        if requested is not None:
+            image.draft(None, requested)
+
+    scale = max(1, round(original_width / image.width))
+    image.load()
+    image = ImageOps.exif_transpose(image)
+
+    # Convertir a RGB si es necesario
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image, scale
+
+# Formatos de salida de las miniaturas: extensión y opciones de codificación de Pillow
+MINIATURE_FORMATS = {
+    "webp": {"extension": "webp", "pillow_format": "WEBP", "options": {"method": 4}},
+    "jpeg": {"extension": "jpg", "pillow_format": "JPEG", "options": {"optimize": True, "progressive": True}},
+}
+
+def render_miniatures(
+    image_data: bytes,
+    sizes: List[int],
+    image_format: str = "webp",
+    quality: int = 80
+) -> Tuple[Dict[int, bytes], Dict[str, float], int]:
+    """
+    Genera todas las variantes de la miniatura con una sola decodificación
+
+    Las variantes se obtienen de mayor a menor reduciendo cada una a partir de la anterior,
+    así cada LANCZOS trabaja sobre la imagen más pequeña posible.
+
+    Args:
+        image_data: Bytes de la imagen original
+        sizes: Lados máximos en píxeles de cada variante
+        image_format: Formato de salida (clave de MINIATURE_FORMATS)
+        quality: Calidad de codificación (1-100)
+
+    Returns:
+        Tuple[Dict[int, bytes], Dict[str, float], int]: (bytes por tamaño, milisegundos por etapa,
+            divisor de escala de la decodificación)
+    """
+    output_format = MINIATURE_FORMATS[image_format]
+    sizes = sorted(set(sizes), reverse=True)
+    timings = {"resize": 0.0, "encode": 0.0}
+    variants = {}
+
+    start = time.perf_counter()
+    image, decode_scale = decode_image(image_data, (sizes[0], sizes[0]))
+    timings["decode"] = (time.perf_counter() - start) * 1000
+
+    for size in sizes:
+        start = time.perf_counter()
+        image = image.copy()
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        timings["resize"] += (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        buffer = io.BytesIO()
+        image.save(buffer, format=output_format["pillow_format"], quality=quality, **output_format["options"])
+        variants[size] = buffer.getvalue()
+        timings["encode"] += (time.perf_counter() - start) * 1000
+
+    return variants, timings, decode_scale
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+class IndexRegistry:
+    """
+    Registro declarativo de índices de MongoDB
+    Cada módulo registra los índices que necesitan sus consultas y el lifespan de la
+    aplicación los aplica al iniciar (create_index es idempotente).
+    """
+
+    def __init__(self):
+        self._specs: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.last_result: Optional[dict] = None
+        self.logger = logging.getLogger(__name__)
+
+    def register(self, collection_name: str, keys: List[Tuple[str, Any]], **options) -> str:
+        """
+        Registra un índice
+
+        Args:
+            collection_name: Nombre de la colección
+            keys: Lista de pares (campo, dirección o tipo de índice)
+            **options: Opciones de create_index (name, unique, weights...)
+
+        Returns:
+            str: Nombre del índice
+        """
+        name = options.setdefault("name", self._default_name(keys))
+        self._specs[(collection_name, name)] = {
+            "collection": collection_name,
+            "keys": keys,
+            "options": options
+        }
+        return name
+
+    @staticmethod
+    def _default_name(keys: List[Tuple[str, Any]]) -> str:
+        """Nombre por defecto con la misma convención que MongoDB (campo_dirección)"""
+        return "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    def get_specs(self) -> List[Dict[str, Any]]:
+        """Obtiene los índices registrados"""
+        return list(self._specs.values())
+
+    async def apply(self, db) -> dict:
+        """
+        Crea todos los índices registrados
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+
+        Returns:
+            dict: Índices aplicados y fallidos
+        """
+        applied, failed = [], []
+        for spec in self._specs.values():
+            label = f"{spec['collection']}.{spec['options']['name']}"
+            name = await db.create_index(spec["collection"], spec["keys"], **spec["options"])
+            (applied if name else failed).append(label)
+
+        self.last_result = {"applied": applied, "failed": failed}
+        if failed:
+            self.logger.warning(f"Índices que no se pudieron crear: {failed}")
+        self.logger.info(f"Índices aplicados: {len(applied)}/{len(self._specs)}")
+        return self.last_result
+
+    def apply_in_background(self, db) -> asyncio.Task:
+        """Aplica los índices en segundo plano para no retrasar el arranque"""
+        self._task = asyncio.create_task(self.apply(db))
+        return self._task
+
+    async def stop(self):
+        """Cancela la creación de índices si sigue en curso"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def report(self, db) -> dict:
+        """
+        Compara los índices registrados con los existentes usando $indexStats
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+
+        Returns:
+            dict: Por colección, índices faltantes, sin uso y no registrados
+        """
+        collections: Dict[str, dict] = {}
+        for collection_name in sorted({spec["collection"] for spec in self._specs.values()}):
+            stats = await db.aggregate(collection_name, [{"$indexStats": {}}])
+            existing = {stat["name"]: stat for stat in stats}
+            registered = {name for (coll, name) in self._specs if coll == collection_name}
+
+            collections[collection_name] = {
+                "missing": sorted(registered - existing.keys()),
+                "unused": sorted(
+                    name for name, stat in existing.items()
+                    if name != "_id_" and stat.get("accesses", {}).get("ops", 0) == 0
+                ),
+                "unregistered": sorted(
+                    name for name in existing
+                    if name != "_id_" and name not in registered
+                ),
+                "usage": {
+                    name: stat.get("accesses", {}).get("ops", 0)
+                    for name, stat in existing.items()
+                }
+            }
+
+        return {
+            "registered": len(self._specs),
+            "background_task": (
+                "running" if self._task is not None and not self._task.done() else "done"
+            ),
+            "last_result": self.last_result,
+            "collections": collections
+        }
+
+# Instancia global del registro de índices
+index_registry = IndexRegistry()
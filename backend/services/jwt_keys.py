@@ -0,0 +1,158 @@
+"""
+Llaves de firma JWT: detección del algoritmo, identificador (kid) y soporte EdDSA
+"""
+import base64
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jose import jwk
+from jose.backends.base import Key
+
+# Algoritmos de firma soportados para los tokens de acceso
+SUPPORTED_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+
+class Ed25519Key(Key):
+    """
+    Llave Ed25519 para python-jose (que no incluye EdDSA)
+    Se registra con jwk.register_key para poder usar algorithm="EdDSA" en jwt.encode/decode.
+    """
+
+    def __init__(self, key, algorithm):
+        if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+            self._key = key
+            return
+
+        pem = key.encode() if isinstance(key, str) else key
+        if b"PRIVATE KEY" in pem:
+            self._key = serialization.load_pem_private_key(pem, password=None)
+        else:
+            self._key = serialization.load_pem_public_key(pem)
+        if not isinstance(self._key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+            raise ValueError("La llave no es Ed25519")
+
+    def sign(self, msg: bytes) -> bytes:
+        return self._key.sign(msg)
+
+    def verify(self, msg: bytes, sig: bytes) -> bool:
+        public_key = self._key.public_key() if isinstance(self._key, ed25519.Ed25519PrivateKey) else self._key
+        try:
+            public_key.verify(sig, msg)
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_key(self) -> "Ed25519Key":
+        if isinstance(self._key, ed25519.Ed25519PrivateKey):
+            return Ed25519Key(self._key.public_key(), "EdDSA")
+        return self
+
+    def to_pem(self) -> bytes:
+        if isinstance(self._key, ed25519.Ed25519PrivateKey):
+            return self._key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption()
+            )
+        return self._key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+
+    def to_dict(self) -> dict:
+        public_key = self.public_key()._key
+        raw = public_key.public_bytes(encoding=serialization.Encoding.Raw, format=serialization.PublicFormat.Raw)
+        return {
+            "alg": "EdDSA",
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "x": base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+        }
+
+jwk.register_key("EdDSA", Ed25519Key)
+
+def detect_algorithm(key) -> str:
+    """
+    Algoritmo JWT correspondiente a una llave (pública o privada) de cryptography
+
+    Args:
+        key: Llave cargada con cryptography
+
+    Returns:
+        str: RS256, ES256 o EdDSA
+
+    Raises:
+        ValueError: Si el tipo de llave no está soportado
+    """
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        if not isinstance(key.curve, ec.SECP256R1):
+            raise ValueError(f"Curva no soportada para ES256: {key.curve.name}")
+        return "ES256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    raise ValueError(f"Tipo de llave no soportado: {type(key).__name__}")
+
+def key_id(public_key) -> str:
+    """
+    Identificador estable (kid) de una llave pública: huella SHA-256 de su SubjectPublicKeyInfo
+
+    Args:
+        public_key: Llave pública de cryptography
+
+    Returns:
+        str: kid de 16 caracteres hexadecimales
+    """
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.sha256(der).hexdigest()[:16]
+
+def load_signing_key(private_pem: str) -> Tuple[str, str, Key]:
+    """
+    Carga la llave privada de firma
+
+    Args:
+        private_pem: Llave privada en formato PEM
+
+    Returns:
+        Tuple[str, str, Key]: (algoritmo, kid, llave de python-jose)
+    """
+    private_key = serialization.load_pem_private_key(private_pem.encode(), password=None)
+    algorithm = detect_algorithm(private_key)
+    return algorithm, key_id(private_key.public_key()), jwk.construct(private_pem, algorithm)
+
+def load_verification_key(public_pem: str) -> Tuple[str, str, Key]:
+    """
+    Carga una llave pública de verificación
+
+    Args:
+        public_pem: Llave pública en formato PEM
+
+    Returns:
+        Tuple[str, str, Key]: (algoritmo, kid, llave de python-jose)
+    """
+    public_key = serialization.load_pem_public_key(public_pem.encode())
+    algorithm = detect_algorithm(public_key)
+    return algorithm, key_id(public_key), jwk.construct(public_pem, algorithm)
+
+def load_retired_keys(retired_dir: Path) -> Dict[str, Tuple[str, Key]]:
+    """
+    Carga las llaves públicas retiradas que siguen aceptándose durante una rotación
+
+    Args:
+        retired_dir: Directorio con archivos *.pem
+
+    Returns:
+        Dict[str, Tuple[str, Key]]: kid -> (algoritmo, llave)
+    """
+    keys = {}
+    if retired_dir.is_dir():
+        for path in sorted(retired_dir.glob("*.pem")):
+            algorithm, kid, key = load_verification_key(path.read_text())
+            keys[kid] = (algorithm, key)
+    return keys
@@ -1,30 +1,211 @@
-import requests
+import asyncio
+import httpx
 import logging
+import random
+import time
+from typing import Optional
 from fastapi import HTTPException
 from services.config_service import config_service
 from urllib.parse import urlparse
 
+# Códigos de respuesta transitorios que se reintentan
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+class CircuitBreaker:
+    """
+    Circuit breaker de tres estados (closed → open → half_open)
+    Tras `failure_threshold` fallos seguidos deja de llamar al servicio durante
+    `reset_timeout` segundos; después permite una única llamada de prueba.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Inicializa el circuit breaker
+
+        Args:
+            failure_threshold: Fallos consecutivos que abren el circuito
+            reset_timeout: Segundos que el circuito permanece abierto
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_progress = False
+
+    def allow_request(self) -> bool:
+        """
+        Indica si se puede llamar al servicio
+
+        Returns:
+            bool: False mientras el circuito esté abierto
+        """
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            self._trial_in_progress = False
+
+        if self.state == "half_open":
+            # Solo una llamada de prueba a la vez
+            if self._trial_in_progress:
+                return False
+            self._trial_in_progress = True
+        return True
+
+    def release_trial(self):
+        """Libera la llamada de prueba en curso sin contarla como éxito ni como fallo"""
+        self._trial_in_progress = False
+
+    def record_success(self):
+        """Registra una llamada correcta y cierra el circuito"""
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._trial_in_progress = False
+
+    def record_failure(self):
+        """Registra un fallo y abre el circuito si se alcanza el umbral"""
+        self.consecutive_failures += 1
+        self._trial_in_progress = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+
+    def get_stats(self) -> dict:
+        """Estado actual del circuito"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened
+        }
+
 class LambdaService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.api_url = config_service.lambda_api_url
+        self.max_retries = config_service.lambda_max_retries
+        self.retry_backoff = config_service.lambda_retry_backoff_seconds
+        self.circuit_breaker = CircuitBreaker(
+            config_service.lambda_circuit_failure_threshold,
+            config_service.lambda_circuit_reset_seconds
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._stats = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Obtiene el cliente HTTP compartido (se crea la primera vez que se usa)
+        Mantiene un pool de conexiones persistentes hacia Lambda.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    config_service.lambda_timeout_seconds,
+                    connect=config_service.lambda_connect_timeout_seconds
+                ),
+                limits=httpx.Limits(
+                    max_connections=config_service.lambda_max_connections,
+                    max_keepalive_connections=config_service.lambda_max_connections
+                )
+            )
+        return self._client
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Espera antes del reintento (backoff exponencial con jitter completo)"""
+        return random.uniform(0, self.retry_backoff * (2 ** attempt))
+
+    async def _post_with_retries(self, data: dict) -> httpx.Response:
+        """
+        Envía la petición reintentando errores de red y respuestas transitorias
+
+        Args:
+            data: Cuerpo JSON de la petición
+
+        Returns:
+            httpx.Response: Última respuesta recibida
+
+        Raises:
+            httpx.TransportError: Si todos los intentos fallan por errores de red
+        """
+        client = self._get_client()
+        for attempt in range(self.max_retries + 1):
+            is_last_attempt = attempt == self.max_retries
+            try:
+                response = await client.post(self.api_url, json=data)
+                if response.status_code not in RETRYABLE_STATUS_CODES or is_last_attempt:
+                    return response
+                self.logger.warning(f"Lambda respondió {response.status_code}, reintentando ({attempt + 1}/{self.max_retries})")
+            except httpx.TransportError as e:
+                if is_last_attempt:
+                    raise
+                self.logger.warning(f"Error de red con Lambda: {str(e)}, reintentando ({attempt + 1}/{self.max_retries})")
+
+            self._stats["retries"] += 1
+            await asyncio.sleep(self._backoff_delay(attempt))
 
     async def validate_data(self, data: dict) -> dict:
+        if not self.api_url:
+            raise HTTPException(
+                status_code=500,
+                detail="Error al conectar con Lambda"
+            )
+
+        if not self.circuit_breaker.allow_request():
+            self._stats["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Servicio de validación no disponible temporalmente"
+            )
+
+        self._stats["requests"] += 1
         try:
-            response = requests.post(self.api_url, json=data)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail="Error en validación Lambda"
-                )
+            response = await self._post_with_retries(data)
         except Exception as e:
+            self.circuit_breaker.record_failure()
+            self._stats["failures"] += 1
             self.logger.error(f"Error Lambda: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail="Error al conectar con Lambda"
             )
+        except asyncio.CancelledError:
+            # Cancelación (cliente desconectado): no es un fallo de Lambda, solo se libera
+            # la llamada de prueba del half_open para que el circuito no quede bloqueado
+            self.circuit_breaker.release_trial()
+            raise
+
+        if response.status_code >= 500 or response.status_code in RETRYABLE_STATUS_CODES:
+            self.circuit_breaker.record_failure()
+            self._stats["failures"] += 1
+        else:
+            # Un 4xx indica que Lambda está disponible aunque rechace los datos
+            self.circuit_breaker.record_success()
+
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail="Error en validación Lambda"
+            )
+        try:
+            return response.json()
+        except ValueError as e:
+            self.logger.error(f"Error Lambda: respuesta no es JSON ({str(e)})")
+            raise HTTPException(
+                status_code=500,
+                detail="Error en validación Lambda"
+            )
+
+    def get_stats(self) -> dict:
+        """Métricas de llamadas a Lambda y estado del circuit breaker"""
+        return {**self._stats, "circuit_breaker": self.circuit_breaker.get_stats()}
+
+    async def close(self):
+        """Cierra el pool de conexiones HTTP"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _validate_url(self, url: str) -> bool:
         """Validar URL para prevenir SSRF"""
@@ -43,4 +224,4 @@ class LambdaService:
             return False
 
 # Instancia global
-lambda_service = LambdaService()
\ No newline at end of file
+lambda_service = LambdaService()
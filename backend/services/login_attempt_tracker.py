@@ -0,0 +1,215 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List
+import logging
+import time
+from services.config_service import config_service
+from services.rate_limit_backends import RateLimitBackendError, RedisRateLimitBackend
+
+class LoginAttemptBackend(ABC):
+    """
+    Almacén de contadores de intentos fallidos de login
+    Cada contador expira `ttl_seconds` después del último intento fallido
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> int:
+        """Obtiene el contador vigente (0 si no existe o expiró)"""
+        pass
+
+    @abstractmethod
+    async def increment(self, key: str, ttl_seconds: int) -> int:
+        """Incrementa el contador y renueva su expiración; devuelve el nuevo valor"""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Elimina el contador"""
+        pass
+
+    async def close(self):
+        """Libera los recursos del backend"""
+        pass
+
+    def get_stats(self) -> dict:
+        """Obtiene métricas del backend"""
+        return {}
+
+class MemoryLoginAttemptBackend(LoginAttemptBackend):
+    """
+    Contadores en memoria del proceso, LRU acotado con expiración
+    Como el TTL es el mismo para todas las claves y cada intento mueve la clave al final,
+    el orden del diccionario coincide con el de expiración: las vencidas se desalojan
+    desde el inicio en O(1) amortizado y, si se llega al máximo, se desaloja la más antigua.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, List]" = OrderedDict()  # clave -> [valor, expira_en]
+        self.expirations = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> int:
+        entry = self._counters.get(key)
+        if entry is None:
+            return 0
+        if entry[1] <= time.monotonic():
+            del self._counters[key]
+            self.expirations += 1
+            return 0
+        return entry[0]
+
+    async def increment(self, key: str, ttl_seconds: int) -> int:
+        now = time.monotonic()
+        count = await self.get(key) + 1
+        self._counters[key] = [count, now + ttl_seconds]
+        self._counters.move_to_end(key)
+        self._evict(now)
+        return count
+
+    async def delete(self, key: str) -> None:
+        self._counters.pop(key, None)
+
+    def _evict(self, now: float):
+        """Desaloja contadores vencidos o por exceso de claves"""
+        while self._counters:
+            key, (_, expires_at) = next(iter(self._counters.items()))
+            if expires_at <= now:
+                self.expirations += 1
+            elif len(self._counters) > self.max_keys:
+                self.evictions += 1
+            else:
+                break
+            self._counters.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "keys": len(self._counters),
+            "max_keys": self.max_keys,
+            "expirations": self.expirations,
+            "evictions": self.evictions
+        }
+
+class RedisLoginAttemptBackend(LoginAttemptBackend):
+    """
+    Contadores compartidos entre workers en un servidor RESP (Redis o services/rate_limit_store.py)
+    El servidor expira las claves, así que la memoria no crece en los workers.
+    """
+
+    def __init__(self, url: str):
+        self.connection = RedisRateLimitBackend(url)
+
+    async def get(self, key: str) -> int:
+        value, = await self.connection.pipeline([("GET", key)])
+        return int(value) if value is not None else 0
+
+    async def increment(self, key: str, ttl_seconds: int) -> int:
+        count, _ = await self.connection.pipeline([
+            ("INCR", key),
+            ("EXPIRE", key, str(ttl_seconds))
+        ])
+        return int(count)
+
+    async def delete(self, key: str) -> None:
+        await self.connection.pipeline([("DEL", key)])
+
+    async def close(self):
+        await self.connection.close()
+
+    def get_stats(self) -> dict:
+        return self.connection.get_stats()
+
+class LoginAttemptTracker:
+    """
+    Seguimiento de intentos fallidos de login por correo
+    Una cuenta queda bloqueada al llegar a `max_attempts` fallos y se desbloquea
+    `lockout_duration` segundos después del último fallo (el contador expira).
+    """
+
+    def __init__(self, max_attempts: int, lockout_duration: int, backend: LoginAttemptBackend):
+        """
+        Inicializa el seguimiento de intentos
+
+        Args:
+            max_attempts: Fallos que bloquean la cuenta
+            lockout_duration: Segundos de bloqueo desde el último fallo
+            backend: Almacén de contadores
+        """
+        self.max_attempts = max_attempts
+        self.lockout_duration = lockout_duration
+        self.backend = backend
+        self.lockouts = 0
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _key(correo: str) -> str:
+        return f"fl:{correo}"
+
+    async def is_locked(self, correo: str) -> bool:
+        """
+        Verifica si la cuenta está bloqueada
+
+        Args:
+            correo: Correo electrónico del usuario
+
+        Returns:
+            bool: True si la cuenta está bloqueada
+        """
+        try:
+            return await self.backend.get(self._key(correo)) >= self.max_attempts
+        except RateLimitBackendError as e:
+            # Si el backend compartido no responde, no bloquear el login
+            self.logger.error(str(e))
+            return False
+
+    async def record_failure(self, correo: str) -> None:
+        """
+        Registra un intento fallido
+
+        Args:
+            correo: Correo electrónico del usuario
+        """
+        try:
+            count = await self.backend.increment(self._key(correo), self.lockout_duration)
+        except RateLimitBackendError as e:
+            self.logger.error(str(e))
+            return
+        if count == self.max_attempts:
+            self.lockouts += 1
+            self.logger.warning(f"Cuenta bloqueada temporalmente por intentos fallidos: {correo}")
+
+    async def reset(self, correo: str) -> None:
+        """
+        Reinicia el contador tras un login correcto
+
+        Args:
+            correo: Correo electrónico del usuario
+        """
+        try:
+            await self.backend.delete(self._key(correo))
+        except RateLimitBackendError as e:
+            self.logger.error(str(e))
+
+    async def close(self):
+        """Cierra el backend de contadores"""
+        await self.backend.close()
+
+    def get_stats(self) -> dict:
+        """Obtiene métricas del seguimiento de intentos"""
+        return {
+            "max_attempts": self.max_attempts,
+            "lockout_duration": self.lockout_duration,
+            "lockouts": self.lockouts,
+            **self.backend.get_stats()
+        }
+
+def create_login_attempt_tracker(max_attempts: int, lockout_duration: int) -> LoginAttemptTracker:
+    """
+    Crea el seguimiento de intentos según la configuración (LOGIN_ATTEMPTS_BACKEND = memory | redis)
+    """
+    if config_service.login_attempts_backend == "redis":
+        backend = RedisLoginAttemptBackend(config_service.login_attempts_redis_url)
+    else:
+        backend = MemoryLoginAttemptBackend(config_service.login_attempts_max_keys)
+    return LoginAttemptTracker(max_attempts, lockout_duration, backend)
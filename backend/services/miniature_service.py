@@ -1,91 +1,251 @@
 import logging
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from fastapi import HTTPException, UploadFile
-from services.s3_service import s3_service
-from PIL import Image
-import io
-import os
+from services.storage_service import file_storage
+from services.storage_backends import StorageNotFoundError
+from services.config_service import config_service
+from services.image_processing import render_miniatures, MINIATURE_FORMATS
+
+PIPELINE_STAGES = ("decode", "resize", "encode", "upload")
 
 class MiniatureService:
     """
-    Servicio para gestionar miniaturas de imágenes usando S3
+    Servicio para gestionar miniaturas de imágenes en el almacenamiento de archivos
+    El procesamiento con Pillow se ejecuta en un pool de procesos para no bloquear el event loop
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        pool_workers: int = 1,
+        max_pending: int = 8,
+        sizes: List[int] = None,
+        image_format: str = "webp",
+        quality: int = 80,
+        max_upload_bytes: int = 10 * 1024 * 1024
+    ):
+        """
+        Inicializa el servicio de miniaturas
+        
+        Args:
+            pool_workers: Número de procesos para procesar imágenes
+            max_pending: Máximo de imágenes en cola antes de responder 503
+            sizes: Lados máximos en píxeles de las variantes a generar
+            image_format: Formato de las variantes (webp o jpeg)
+            quality: Calidad de codificación de las variantes
+            max_upload_bytes: Tamaño máximo de la imagen original (413 si se supera)
+        """
         self.logger = logging.getLogger(__name__)
-        self.miniature_size = (300, 300)  # Tamaño de la miniatura
-        self.quality = 85  # Calidad de la imagen JPEG
+        if image_format not in MINIATURE_FORMATS:
+            raise ValueError(f"Formato de miniatura no soportado: {image_format}")
+        self.sizes = sorted(set(sizes or [64, 150, 300, 800]))  # Tamaños de las variantes
+        self.default_size = 300 if 300 in self.sizes else self.sizes[-1]
+        self.image_format = image_format
+        self.extension = MINIATURE_FORMATS[image_format]["extension"]
+        self.media_type = f"image/{image_format}"
+        self.quality = quality  # Calidad de codificación
+        self.pool_workers = max(1, pool_workers)
+        self.max_pending = max_pending
+        self.max_upload_bytes = max_upload_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._timings = {stage: {"count": 0, "total_ms": 0.0, "max_ms": 0.0} for stage in PIPELINE_STAGES}
+        self._decode_by_scale: Dict[int, dict] = {}  # Tiempos de decodificación por escala de draft
+    
+    def miniature_key(self, item_id: str, size: int) -> str:
+        """Clave en el almacenamiento de una variante de la miniatura"""
+        return f"miniatures/{item_id}_{size}.{self.extension}"
+    
+    @staticmethod
+    def legacy_miniature_key(item_id: str) -> str:
+        """Clave de la miniatura PNG única del formato anterior (items sin variantes)"""
+        return f"miniatures/{item_id}_miniature.png"
+    
+    def resolve_size(self, requested_size: Optional[int]) -> int:
+        """
+        Elige la variante más pequeña que cubra el tamaño pedido
+        
+        Args:
+            requested_size: Lado en píxeles pedido por el cliente (None = tamaño por defecto)
+            
+        Returns:
+            int: Tamaño de una variante existente
+        """
+        if requested_size is None:
+            return self.default_size
+        for size in self.sizes:
+            if size >= requested_size:
+                return size
+        return self.sizes[-1]
     
     async def upload_miniature(self, item_id: str, image_file: UploadFile) -> dict:
         """
-        Sube una miniatura de imagen para un item perdido
+        Genera y sube todas las variantes de la miniatura de un item perdido
         
         Args:
             item_id: ID del item perdido
             image_file: Archivo de imagen a procesar
             
         Returns:
-            dict: Información de la miniatura subida
+            dict: Información de las variantes subidas
+            
+        Raises:
+            HTTPException: 503 si la cola de procesamiento está llena, 413 si la imagen es demasiado grande
         """
+        # Comprobar cola y tamaño declarado antes de leer el cuerpo en memoria
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Servicio de imágenes saturado. Intente de nuevo en unos segundos."
+            )
+        if image_file.size is not None and image_file.size > self.max_upload_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail="La imagen supera el tamaño máximo permitido"
+            )
+        
+        self._pending += 1
         try:
-            # Leer la imagen original
-            image_data = await image_file.read()
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convertir a RGB si es necesario
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Crear miniatura
-            miniature = image.copy()
-            miniature.thumbnail(self.miniature_size, Image.Resampling.LANCZOS)
-            
-            # Guardar miniatura en buffer
-            miniature_buffer = io.BytesIO()
-            miniature.save(miniature_buffer, format='PNG', optimize=True)
-            miniature_buffer.seek(0)
+            # Leer la imagen original sin pasar del límite (el tamaño declarado puede faltar o mentir)
+            image_data = await image_file.read(self.max_upload_bytes + 1)
+            if len(image_data) > self.max_upload_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail="La imagen supera el tamaño máximo permitido"
+                )
             
-            # Generar nombre del archivo
-            miniature_filename = f"miniatures/{item_id}_miniature.png"
+            # Decodificar una vez, redimensionar y codificar cada variante fuera del event loop
+            variants, timings, decode_scale = await self._run_in_pool(
+                render_miniatures, image_data, self.sizes, self.image_format, self.quality
+            )
             
-            # Subir a S3
-            result = await s3_service.upload_file(miniature_buffer, miniature_filename)
+            # Guardar las variantes en paralelo
+            start = time.perf_counter()
+            sizes = list(variants)
+            results = await asyncio.gather(*[
+                file_storage.write_bytes(self.miniature_key(item_id, size), variants[size], self.media_type)
+                for size in sizes
+            ])
+            uploaded = {
+                size: {"filename": result["key"], "bytes": result["size"]}
+                for size, result in zip(sizes, results)
+            }
+            timings["upload"] = (time.perf_counter() - start) * 1000
+            self._record_timings(timings, decode_scale)
             
-            self.logger.info(f"Miniatura subida exitosamente para item {item_id}")
+            self.logger.info(
+                f"Miniaturas subidas exitosamente para item {item_id} "
+                f"({', '.join(f'{stage}={ms:.1f}ms' for stage, ms in timings.items())}, escala 1/{decode_scale})"
+            )
             return {
                 "item_id": item_id,
-                "miniature_url": result["url"],
-                "filename": result["filename"]
+                "miniature_url": await file_storage.get_url(self.miniature_key(item_id, self.default_size)),
+                "filename": uploaded[self.default_size]["filename"],
+                "variants": uploaded,
+                "timings_ms": timings,
+                "decode_scale": decode_scale
             }
             
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"Error al crear miniatura para item {item_id}: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Error al procesar la miniatura: {str(e)}"
             )
+        finally:
+            self._pending -= 1
+    
+    async def _run_in_pool(self, func, *args):
+        """
+        Ejecuta el procesamiento de una imagen en el pool (el límite de cola lo aplica upload_miniature)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos bajo demanda"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.pool_workers)
+        return self._executor
+    
+    @staticmethod
+    def _accumulate(stats: dict, elapsed_ms: float):
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
     
-    async def get_miniature_url(self, item_id: str) -> str:
+    @staticmethod
+    def _summarize(stats: dict) -> dict:
+        return {
+            "count": stats["count"],
+            "avg_ms": round(stats["total_ms"] / stats["count"], 2) if stats["count"] else 0.0,
+            "max_ms": round(stats["max_ms"], 2)
+        }
+    
+    def _record_timings(self, timings: Dict[str, float], decode_scale: int):
+        """Acumula los tiempos por etapa de una miniatura procesada (la decodificación también por escala)"""
+        for stage, elapsed_ms in timings.items():
+            self._accumulate(self._timings[stage], elapsed_ms)
+        scale_stats = self._decode_by_scale.setdefault(decode_scale, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        self._accumulate(scale_stats, timings["decode"])
+    
+    def get_stats(self) -> dict:
+        """
+        Obtiene el estado del pool y los tiempos por etapa
+        
+        Returns:
+            dict: Procesos configurados, imágenes en cola y tiempos medio/máximo por etapa
+        """
+        return {
+            "workers": self.pool_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "stages": {stage: self._summarize(stats) for stage, stats in self._timings.items()},
+            "decode_by_scale": {
+                f"1/{scale}": self._summarize(stats)
+                for scale, stats in sorted(self._decode_by_scale.items())
+            },
+            "storage": file_storage.get_stats()
+        }
+    
+    def shutdown(self):
+        """Cierra el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def get_miniature_url(self, item_id: str, size: Optional[int] = None) -> Optional[str]:
         """
         Obtiene la URL de la miniatura para un item perdido
         
         Args:
             item_id: ID del item perdido
+            size: Lado en píxeles deseado (se usa la variante más pequeña que lo cubra)
             
         Returns:
-            str: URL de la miniatura
+            Optional[str]: URL de la miniatura, o None si el almacenamiento no ofrece URLs
+            directas (hay que servirla con stream_miniature)
+            
+        Raises:
+            HTTPException: 404 si el item no tiene miniatura
         """
         try:
-            miniature_filename = f"miniatures/{item_id}_miniature.png"
-            url = await s3_service.get_file_url(miniature_filename)
-            return url
+            miniature_key = self.miniature_key(item_id, self.resolve_size(size))
+            try:
+                return await file_storage.get_url(miniature_key, check_exists=True)
+            except StorageNotFoundError:
+                # Items subidos antes de las variantes: solo tienen la miniatura PNG
+                return await file_storage.get_url(self.legacy_miniature_key(item_id), check_exists=True)
             
-        except HTTPException as e:
-            if e.status_code == 404:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No se encontró miniatura para el item {item_id}"
-                )
-            raise e
+        except StorageNotFoundError:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No se encontró miniatura para el item {item_id}"
+            )
         except Exception as e:
             self.logger.error(f"Error al obtener miniatura para item {item_id}: {str(e)}")
             raise HTTPException(
@@ -93,9 +253,71 @@ class MiniatureService:
                 detail=f"Error al obtener la miniatura: {str(e)}"
             )
     
+    async def get_miniature_urls(
+        self,
+        item_ids: List[str],
+        size: Optional[int] = None,
+        fallback_url: Callable[[str], str] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Obtiene las URLs de las miniaturas de varios items en una sola llamada
+        
+        Args:
+            item_ids: IDs de los items perdidos
+            size: Lado en píxeles deseado (se usa la variante más pequeña que lo cubra)
+            fallback_url: URL a usar para un item cuando el almacenamiento no ofrece URLs directas
+            
+        Returns:
+            Dict[str, Optional[str]]: URL por item (None si el item no tiene miniatura)
+        """
+        async def resolve(item_id: str) -> Optional[str]:
+            try:
+                url = await self.get_miniature_url(item_id, size)
+                return url if url is not None or fallback_url is None else fallback_url(item_id)
+            except HTTPException as e:
+                if e.status_code == 404:
+                    return None
+                raise
+        
+        unique_ids = list(dict.fromkeys(item_ids))
+        urls = await asyncio.gather(*[resolve(item_id) for item_id in unique_ids])
+        return dict(zip(unique_ids, urls))
+    
+    async def stream_miniature(
+        self,
+        item_id: str,
+        size: Optional[int] = None
+    ) -> Tuple[AsyncIterator[bytes], str]:
+        """
+        Lee por bloques una variante de la miniatura desde el almacenamiento
+        
+        Args:
+            item_id: ID del item perdido
+            size: Lado en píxeles deseado (se usa la variante más pequeña que lo cubra)
+            
+        Returns:
+            Tuple[AsyncIterator[bytes], str]: Contenido de la miniatura y su tipo MIME
+            (la miniatura PNG del formato anterior si el item no tiene variantes)
+            
+        Raises:
+            HTTPException: 404 si el item no tiene miniatura
+        """
+        miniature_key = self.miniature_key(item_id, self.resolve_size(size))
+        if await file_storage.exists(miniature_key):
+            return file_storage.stream(miniature_key), self.media_type
+        
+        legacy_key = self.legacy_miniature_key(item_id)
+        if await file_storage.exists(legacy_key):
+            return file_storage.stream(legacy_key), "image/png"
+        
+        raise HTTPException(
+            status_code=404,
+            detail=f"No se encontró miniatura para el item {item_id}"
+        )
+    
     async def delete_miniature(self, item_id: str) -> bool:
         """
-        Elimina la miniatura de un item perdido
+        Elimina todas las variantes de la miniatura de un item perdido
         
         Args:
             item_id: ID del item perdido
@@ -104,13 +326,12 @@ class MiniatureService:
             bool: True si se eliminó correctamente
         """
         try:
-            miniature_filename = f"miniatures/{item_id}_miniature.png"
+            # Variantes actuales y la miniatura PNG del formato anterior
+            keys = [self.miniature_key(item_id, size) for size in self.sizes]
+            keys.append(self.legacy_miniature_key(item_id))
             
-            # Eliminar de S3
-            s3_service.s3.delete_object(
-                Bucket=s3_service.bucket,
-                Key=miniature_filename
-            )
+            # Eliminar del almacenamiento (una sola petición en S3)
+            await file_storage.delete_many(keys)
             
             self.logger.info(f"Miniatura eliminada exitosamente para item {item_id}")
             return True
@@ -123,4 +344,11 @@ class MiniatureService:
             )
 
 # Instancia global del servicio de miniaturas
-miniature_service = MiniatureService()
+miniature_service = MiniatureService(
+    pool_workers=config_service.image_pool_workers,
+    max_pending=config_service.image_pool_max_pending,
+    sizes=config_service.miniature_sizes,
+    image_format=config_service.miniature_format,
+    quality=config_service.miniature_quality,
+    max_upload_bytes=config_service.miniature_max_upload_bytes
+)
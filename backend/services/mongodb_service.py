@@ -1,5 +1,5 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
 from pymongo.database import Database
@@ -69,7 +69,15 @@ class MongoDBService:
                 return None
         return self.database[collection_name]
 
-    def find_all(self, collection_name: str, filter_query: Dict = None, limit: int = 0, skip: int = 0) -> List[Dict[str, Any]]:
+    def find_all(
+        self,
+        collection_name: str,
+        filter_query: Dict = None,
+        limit: int = 0,
+        skip: int = 0,
+        projection: Dict = None,
+        sort: List = None
+    ) -> List[Dict[str, Any]]:
         """
         Busca todos los documentos en una colección
         
@@ -78,13 +86,17 @@ class MongoDBService:
             filter_query: Query de filtrado (opcional)
             limit: Límite de documentos a retornar (0 = sin límite)
             skip: Número de documentos a saltar para paginación (0 = no saltar)
+            projection: Proyección de campos (opcional)
+            sort: Lista de pares (campo, dirección) para ordenar (opcional)
         """
         try:
             collection = self.get_collection(collection_name)
             if collection is None:
                 return []
             query = filter_query if filter_query else {}
-            cursor = collection.find(query)
+            cursor = collection.find(query, projection)
+            if sort:
+                cursor = cursor.sort(sort)
             if skip > 0:
                 cursor = cursor.skip(skip)
             if limit > 0:
@@ -147,6 +159,129 @@ class MongoDBService:
             self.logger.error(f"Error en find_by_id_with_validation: {e}")
             return None
 
+    def find_page(
+        self,
+        collection_name: str,
+        filter_query: Dict = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        projection: Dict = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Paginación por cursor (keyset) sobre _id
+        Cada página cuesta lo mismo sin importar su profundidad, a diferencia de skip
+        
+        Args:
+            collection_name: Nombre de la colección
+            filter_query: Query de filtrado (opcional)
+            limit: Tamaño de la página
+            cursor: _id del último documento de la página anterior (opcional)
+            projection: Proyección de campos (opcional)
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (documentos, cursor de la siguiente página o None)
+        
+        Raises:
+            ValueError: Si el cursor no es un ObjectId válido
+        """
+        query = dict(filter_query) if filter_query else {}
+        if cursor:
+            if not ObjectId.is_valid(cursor):
+                raise ValueError("Cursor de paginación inválido")
+            keyset = {"_id": {"$gt": ObjectId(cursor)}}
+            query = {"$and": [query, keyset]} if query else keyset
+        
+        # Pedir un documento extra para saber si existe una página siguiente
+        documents = self.find_all(
+            collection_name,
+            filter_query=query,
+            limit=limit + 1,
+            projection=projection,
+            sort=[("_id", 1)]
+        )
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = str(documents[-1]["_id"])
+        return documents, next_cursor
+
+    def text_search_page(
+        self,
+        collection_name: str,
+        search: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Búsqueda en el índice de texto paginada por cursor (keyset) sobre (relevancia, _id)
+        A diferencia de find_all, los errores de MongoDB no se ocultan: si el índice de texto
+        no existe todavía la búsqueda falla en lugar de devolver una lista vacía.
+
+        Args:
+            collection_name: Nombre de la colección
+            search: Términos de búsqueda ($text)
+            limit: Tamaño de la página
+            cursor: "relevancia:_id" del último documento de la página anterior (opcional)
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[str]]: (documentos con su campo score, cursor de la
+            siguiente página o None)
+
+        Raises:
+            ValueError: Si el cursor no es válido
+            pymongo.errors.OperationFailure: Si la consulta falla (p. ej. falta el índice de texto)
+        """
+        pipeline = [
+            {"$match": {"$text": {"$search": search}}},
+            {"$addFields": {"score": {"$meta": "textScore"}}}
+        ]
+        if cursor:
+            score, _, last_id = cursor.partition(":")
+            try:
+                score = float(score)
+            except ValueError:
+                raise ValueError("Cursor de paginación inválido")
+            if not ObjectId.is_valid(last_id):
+                raise ValueError("Cursor de paginación inválido")
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": score}},
+                {"score": score, "_id": {"$gt": ObjectId(last_id)}}
+            ]}})
+        # Pedir un documento extra para saber si existe una página siguiente
+        pipeline += [{"$sort": {"score": -1, "_id": 1}}, {"$limit": limit + 1}]
+
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return [], None
+        documents = list(collection.aggregate(pipeline))
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = f"{documents[-1]['score']!r}:{documents[-1]['_id']}"
+        return documents, next_cursor
+
+    def find_by_ids(self, collection_name: str, document_ids: List[str], projection: Dict = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Busca varios documentos por ID en una sola consulta ($in)
+        
+        Args:
+            collection_name: Nombre de la colección
+            document_ids: Lista de IDs (los inválidos se ignoran)
+            projection: Proyección de campos (opcional)
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Documentos indexados por su ID en string
+        """
+        object_ids = list({ObjectId(doc_id) for doc_id in document_ids if doc_id and ObjectId.is_valid(str(doc_id))})
+        if not object_ids:
+            return {}
+        documents = self.find_all(
+            collection_name,
+            filter_query={"_id": {"$in": object_ids}},
+            projection=projection
+        )
+        return {str(document["_id"]): document for document in documents}
+
     def count_documents(self, collection_name: str, filter_query: Dict = None) -> int:
         """
         Cuenta documentos en una colección
@@ -174,6 +309,27 @@ class MongoDBService:
             self.logger.error(f"Error en aggregate: {e}")
             return []
 
+    def create_index(self, collection_name: str, keys: List, **kwargs) -> Optional[str]:
+        """
+        Crea un índice en la colección si no existe (operación idempotente)
+        
+        Args:
+            collection_name: Nombre de la colección
+            keys: Lista de pares (campo, tipo de índice)
+            **kwargs: Opciones del índice (name, unique, weights, default_language...)
+        
+        Returns:
+            Optional[str]: Nombre del índice o None si falla
+        """
+        try:
+            collection = self.get_collection(collection_name)
+            if collection is None:
+                return None
+            return collection.create_index(keys, **kwargs)
+        except Exception as e:
+            self.logger.error(f"Error en create_index: {e}")
+            return None
+
     def is_valid_object_id(self, id_str: str) -> bool:
         """Verifica si un string es un ObjectId válido"""
         return ObjectId.is_valid(id_str)
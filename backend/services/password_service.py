@@ -1,7 +1,35 @@
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException
 from typing import Optional
+import asyncio
 import hashlib
 from services.secret_manager import secret_manager
+from services.config_service import config_service
+
+BCRYPT_ROUNDS = 14  # Aumentado de 12 a 14
+
+# Contexto de bcrypt propio de cada proceso del pool (se crea bajo demanda)
+_worker_context: Optional[CryptContext] = None
+
+def _get_worker_context() -> CryptContext:
+    """Obtiene el contexto de encriptación del proceso actual"""
+    global _worker_context
+    if _worker_context is None:
+        _worker_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=BCRYPT_ROUNDS
+        )
+    return _worker_context
+
+def _bcrypt_hash(sha512_hash: str) -> str:
+    """Aplica bcrypt dentro de un proceso del pool"""
+    return _get_worker_context().hash(sha512_hash)
+
+def _bcrypt_verify(sha512_hash: str, hashed_password: str) -> bool:
+    """Verifica bcrypt dentro de un proceso del pool"""
+    return _get_worker_context().verify(sha512_hash, hashed_password)
 
 class PasswordService:
     """
@@ -9,31 +37,53 @@ class PasswordService:
     Utiliza SHA512 + bcrypt para el hash seguro de contraseñas
     """
     
-    def __init__(self):
+    def __init__(self, pool_workers: int = 1, max_pending: int = 32):
+        """
+        Inicializa el servicio de contraseñas
+        
+        Args:
+            pool_workers: Número de procesos para bcrypt
+            max_pending: Máximo de operaciones bcrypt en cola antes de responder 503
+        """
         # Configurar el contexto de encriptación con bcrypt y sha512
         # Aumentar rondas de bcrypt para mayor seguridad
         self.pwd_context = CryptContext(
             schemes=["bcrypt"],
             deprecated="auto",
-            bcrypt__rounds=14  # Aumentado de 12 a 14
+            bcrypt__rounds=BCRYPT_ROUNDS
         )
+        self.pool_workers = max(1, pool_workers)
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
     
-    def hash_password(self, password: str) -> str:
+    def _pre_hash(self, password: str) -> str:
         """
-        Encripta una contraseña usando SHA512 + bcrypt
+        Aplica pepper + SHA512 a la contraseña antes de bcrypt
         
         Args:
             password: Contraseña en texto plano
             
         Returns:
-            str: Contraseña encriptada (hash)
+            str: Hash SHA512 en hexadecimal
         """
         # Añadir sal adicional usando secret_manager
         pepper = secret_manager.obtener_secret("PASSWORD_PEPPER") or "default_pepper"
         peppered_password = f"{password}{pepper}"
-        sha512_hash = hashlib.sha512(peppered_password.encode()).hexdigest()
+        return hashlib.sha512(peppered_password.encode()).hexdigest()
+    
+    def hash_password(self, password: str) -> str:
+        """
+        Encripta una contraseña usando SHA512 + bcrypt
+        
+        Args:
+            password: Contraseña en texto plano
+            
+        Returns:
+            str: Contraseña encriptada (hash)
+        """
         # Luego aplicar bcrypt
-        return self.pwd_context.hash(sha512_hash)
+        return self.pwd_context.hash(self._pre_hash(password))
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -47,10 +97,80 @@ class PasswordService:
             bool: True si la contraseña coincide, False en caso contrario
         """
         # Aplicar SHA512 antes de verificar con bcrypt
-        pepper = secret_manager.obtener_secret("PASSWORD_PEPPER") or "default_pepper"
-        peppered_password = f"{plain_password}{pepper}"
-        sha512_hash = hashlib.sha512(peppered_password.encode()).hexdigest()
-        return self.pwd_context.verify(sha512_hash, hashed_password)
+        return self.pwd_context.verify(self._pre_hash(plain_password), hashed_password)
+    
+    async def hash_password_async(self, password: str) -> str:
+        """
+        Encripta una contraseña en el pool de procesos sin bloquear el event loop
+        
+        Args:
+            password: Contraseña en texto plano
+            
+        Returns:
+            str: Contraseña encriptada (hash)
+            
+        Raises:
+            HTTPException: 503 si la cola de bcrypt está llena
+        """
+        return await self._run_in_pool(_bcrypt_hash, self._pre_hash(password))
+    
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verifica una contraseña en el pool de procesos sin bloquear el event loop
+        
+        Args:
+            plain_password: Contraseña en texto plano
+            hashed_password: Contraseña encriptada (hash)
+            
+        Returns:
+            bool: True si la contraseña coincide, False en caso contrario
+            
+        Raises:
+            HTTPException: 503 si la cola de bcrypt está llena
+        """
+        return await self._run_in_pool(_bcrypt_verify, self._pre_hash(plain_password), hashed_password)
+    
+    async def _run_in_pool(self, func, *args):
+        """
+        Ejecuta una operación bcrypt en el pool aplicando el límite de cola
+        """
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Servicio de autenticación saturado. Intente de nuevo en unos segundos."
+            )
+        
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos bajo demanda"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.pool_workers)
+        return self._executor
+    
+    def get_stats(self) -> dict:
+        """
+        Obtiene el estado del pool de bcrypt
+        
+        Returns:
+            dict: Procesos configurados y operaciones en cola
+        """
+        return {
+            "workers": self.pool_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending
+        }
+    
+    def shutdown(self):
+        """Cierra el pool de procesos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
     
     def is_password_strong(self, password: str) -> tuple[bool, Optional[str]]:
         """
@@ -80,4 +200,7 @@ class PasswordService:
         return True, None
 
 # Instancia global del servicio de contraseñas
-password_service = PasswordService()
+password_service = PasswordService(
+    pool_workers=config_service.password_pool_workers,
+    max_pending=config_service.password_pool_max_pending
+)
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from services.config_service import config_service
+
+class PresignedUrlCache:
+    """
+    Caché en memoria de URLs prefirmadas de S3 indexada por la clave del objeto
+    LRU acotado; cada URL se reutiliza hasta poco antes de que expire su firma.
+    También recuerda durante un tiempo corto las claves que no existen en el bucket.
+    """
+
+    def __init__(self, max_size: int = 5000, refresh_margin_seconds: int = 300, missing_ttl_seconds: int = 60):
+        """
+        Inicializa la caché de URLs
+
+        Args:
+            max_size: Número máximo de claves en caché
+            refresh_margin_seconds: Segundos antes de la expiración en que se deja de reutilizar una URL
+            missing_ttl_seconds: Tiempo que se recuerda que un objeto no existe
+        """
+        self.max_size = max_size
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.missing_ttl_seconds = missing_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Busca la URL de un objeto
+
+        Args:
+            key: Clave del objeto en S3
+
+        Returns:
+            Tuple[bool, Optional[str]]: (encontrado, URL o None si se sabe que el objeto no existe)
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def set_url(self, key: str, url: str, expires_in: int) -> None:
+        """
+        Guarda una URL prefirmada
+
+        Args:
+            key: Clave del objeto en S3
+            url: URL prefirmada
+            expires_in: Segundos de validez con los que se firmó la URL
+        """
+        self._store(key, url, max(0, expires_in - self.refresh_margin_seconds))
+
+    def set_missing(self, key: str) -> None:
+        """Recuerda que un objeto no existe en el bucket"""
+        self._store(key, None, self.missing_ttl_seconds)
+
+    def _store(self, key: str, url: Optional[str], ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, url)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Elimina una clave de la caché (tras subir o borrar el objeto)"""
+        self._entries.pop(key, None)
+
+    def get_stats(self) -> dict:
+        """
+        Obtiene las métricas de la caché
+
+        Returns:
+            dict: Tamaño, aciertos, fallos y desalojos
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+# Instancia global de la caché de URLs prefirmadas
+presigned_url_cache = PresignedUrlCache(
+    max_size=config_service.presigned_url_cache_max_size,
+    refresh_margin_seconds=config_service.presigned_url_refresh_margin_seconds,
+    missing_ttl_seconds=config_service.presigned_url_missing_ttl_seconds
+)
@@ -0,0 +1,207 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import logging
+import time
+
+class RateLimitBackendError(Exception):
+    """Error de comunicación con el backend de rate limiting"""
+    pass
+
+class RateLimitBackend(ABC):
+    """
+    Almacén de contadores para el rate limiter
+    Cada contador corresponde a una IP en una ventana fija de tiempo
+    """
+
+    @abstractmethod
+    async def hit(self, current_key: str, previous_key: str, ttl_seconds: int, amount: int = 1) -> Tuple[int, int]:
+        """
+        Incrementa atómicamente el contador de la ventana actual y lee el de la anterior
+
+        Args:
+            current_key: Clave del contador de la ventana actual
+            previous_key: Clave del contador de la ventana anterior
+            ttl_seconds: Tiempo de vida del contador actual
+            amount: Cuánto se incrementa el contador
+
+        Returns:
+            Tuple[int, int]: (valor actual tras incrementar, valor de la ventana anterior)
+        """
+        pass
+
+    async def close(self):
+        """Libera los recursos del backend"""
+        pass
+
+    def get_stats(self) -> dict:
+        """Obtiene métricas del backend"""
+        return {}
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Contadores en memoria del proceso (no se comparten entre workers)
+    Como el TTL es el mismo para todas las claves, el orden de inserción coincide
+    con el de expiración y las claves vencidas se desalojan desde el inicio en O(1) amortizado
+    """
+
+    def __init__(self, max_keys: int = 200_000):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, List]" = OrderedDict()  # clave -> [valor, expira_en]
+        self.evictions = 0
+
+    async def hit(self, current_key: str, previous_key: str, ttl_seconds: int, amount: int = 1) -> Tuple[int, int]:
+        now = time.time()
+        self._evict_expired(now)
+
+        entry = self._counters.get(current_key)
+        if entry is None:
+            entry = [0, now + ttl_seconds]
+            self._counters[current_key] = entry
+        entry[0] += amount
+
+        previous = self._counters.get(previous_key)
+        previous_count = previous[0] if previous is not None and previous[1] > now else 0
+        return entry[0], previous_count
+
+    def _evict_expired(self, now: float):
+        """Desaloja contadores vencidos o por exceso de claves"""
+        while self._counters:
+            key, (_, expires_at) = next(iter(self._counters.items()))
+            if expires_at > now and len(self._counters) < self.max_keys:
+                break
+            self._counters.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "keys": len(self._counters),
+            "max_keys": self.max_keys,
+            "evictions": self.evictions
+        }
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Contadores compartidos en un servidor que habla el protocolo de Redis (RESP)
+    Sirve tanto para Redis como para el almacén local de services/rate_limit_store.py.
+    INCR es atómico en el servidor, por lo que todos los workers comparten el mismo límite.
+
+    URLs soportadas:
+        redis://[:password@]host:port/db
+        unix:///ruta/al/socket
+    """
+
+    def __init__(self, url: str, timeout: float = 0.5):
+        self.url = url
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        self.errors = 0
+        self.logger = logging.getLogger(__name__)
+
+    async def hit(self, current_key: str, previous_key: str, ttl_seconds: int, amount: int = 1) -> Tuple[int, int]:
+        replies = await self.pipeline([
+            ("INCRBY", current_key, str(amount)),
+            ("EXPIRE", current_key, str(ttl_seconds)),
+            ("GET", previous_key)
+        ])
+        current, _, previous = replies
+        return int(current), int(previous) if previous is not None else 0
+
+    async def pipeline(self, commands: List[tuple]) -> list:
+        """Envía varios comandos en un solo round-trip y lee sus respuestas en orden"""
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await asyncio.wait_for(self._connect(), self.timeout)
+                self._writer.write(b"".join(_encode_command(*command) for command in commands))
+                await self._writer.drain()
+                return [
+                    await asyncio.wait_for(_read_reply(self._reader), self.timeout)
+                    for _ in commands
+                ]
+            except Exception as e:
+                self.errors += 1
+                await self._reset()
+                raise RateLimitBackendError(f"Error en backend de rate limiting: {e}") from e
+
+    async def _connect(self):
+        """Abre la conexión y ejecuta AUTH/SELECT si la URL lo indica"""
+        parsed = urlparse(self.url)
+        if parsed.scheme == "unix":
+            self._reader, self._writer = await asyncio.open_unix_connection(parsed.path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(
+                parsed.hostname or "127.0.0.1",
+                parsed.port or 6379
+            )
+
+        setup = []
+        if parsed.password:
+            setup.append(("AUTH", parsed.password))
+        database = parsed.path.lstrip("/") if parsed.scheme != "unix" else ""
+        if database and database != "0":
+            setup.append(("SELECT", database))
+        for command in setup:
+            self._writer.write(_encode_command(*command))
+            await self._writer.drain()
+            await _read_reply(self._reader)
+
+    async def _reset(self):
+        """Cierra la conexión actual para reconectar en el siguiente uso"""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = None
+        self._writer = None
+
+    async def close(self):
+        async with self._lock:
+            await self._reset()
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "url": self.url.split("@")[-1],
+            "connected": self._writer is not None,
+            "errors": self.errors
+        }
+
+def _encode_command(*args: str) -> bytes:
+    """Codifica un comando como array RESP"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg.encode() if isinstance(arg, str) else arg
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+async def _read_reply(reader: asyncio.StreamReader):
+    """Lee una respuesta RESP (simple, error, entero, bulk o array)"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Conexión cerrada por el servidor")
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode()
+    if prefix == b"-":
+        raise RateLimitBackendError(payload.decode())
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+    raise RateLimitBackendError(f"Respuesta RESP desconocida: {line!r}")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Almacén local de contadores compatible con el protocolo de Redis (RESP)
+Permite compartir el estado del rate limiter entre varios workers de uvicorn/gunicorn
+en un mismo host sin instalar Redis.
+
+Uso:
+    python -m services.rate_limit_store --unix /tmp/ratelimit.sock
+    python -m services.rate_limit_store --host 127.0.0.1 --port 6380
+
+Y en el .env:
+    RATE_LIMIT_BACKEND=redis
+    RATE_LIMIT_REDIS_URL=unix:///tmp/ratelimit.sock
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+class RateLimitStore:
+    """
+    Subconjunto de comandos de Redis: PING, GET, SET, INCR, INCRBY, EXPIRE, TTL, DEL, AUTH, SELECT
+    Cada comando se ejecuta completo dentro del event loop, así que INCR es atómico
+    """
+
+    def __init__(self, sweep_interval: float = 10.0):
+        self.sweep_interval = sweep_interval
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}  # clave -> (valor, expira_en)
+        self.logger = logging.getLogger(__name__)
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes]) -> bytes:
+        """Ejecuta un comando y devuelve la respuesta codificada en RESP"""
+        if not args:
+            return b"-ERR empty command\r\n"
+        command = args[0].upper()
+
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command in (b"AUTH", b"SELECT"):
+            return b"+OK\r\n"
+        if command == b"GET" and len(args) == 2:
+            value = self._get(args[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET" and len(args) >= 3:
+            self._data[args[1]] = (args[2], None)
+            return b"+OK\r\n"
+        if (command == b"INCR" and len(args) == 2) or (command == b"INCRBY" and len(args) == 3):
+            current = self._get(args[1])
+            try:
+                value = int(current or 0) + (int(args[2]) if command == b"INCRBY" else 1)
+            except ValueError:
+                return b"-ERR value is not an integer or out of range\r\n"
+            expires_at = self._data[args[1]][1] if current is not None else None
+            self._data[args[1]] = (str(value).encode(), expires_at)
+            return b":%d\r\n" % value
+        if command == b"EXPIRE" and len(args) >= 3:
+            current = self._get(args[1])
+            if current is None:
+                return b":0\r\n"
+            self._data[args[1]] = (current, time.time() + int(args[2]))
+            return b":1\r\n"
+        if command == b"TTL" and len(args) == 2:
+            if self._get(args[1]) is None:
+                return b":-2\r\n"
+            expires_at = self._data[args[1]][1]
+            return b":-1\r\n" if expires_at is None else b":%d\r\n" % int(expires_at - time.time())
+        if command == b"DEL" and len(args) >= 2:
+            deleted = sum(1 for key in args[1:] if self._data.pop(key, None) is not None)
+            return b":%d\r\n" % deleted
+        return b"-ERR unknown command '%s'\r\n" % args[0]
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende una conexión: lee arrays RESP y responde en orden (admite pipelining)"""
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if args and args[0].upper() == b"QUIT":
+                    writer.write(b"+OK\r\n")
+                    break
+                writer.write(self.execute(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if line[:1] != b"*":
+            # Comando inline (p. ej. desde telnet o redis-cli)
+            return line.split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            header = await reader.readline()
+            length = int(header[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def sweep_expired(self):
+        """Elimina periódicamente las claves vencidas"""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            now = time.time()
+            expired = [
+                key for key, (_, expires_at) in self._data.items()
+                if expires_at is not None and expires_at <= now
+            ]
+            for key in expired:
+                del self._data[key]
+
+async def serve(host: str, port: int, unix_path: Optional[str] = None):
+    """Inicia el servidor en un socket unix o TCP"""
+    store = RateLimitStore()
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)
+        server = await asyncio.start_unix_server(store.handle_client, path=unix_path)
+        print(f"🚦 Almacén de rate limiting escuchando en unix://{unix_path}")
+    else:
+        server = await asyncio.start_server(store.handle_client, host, port)
+        print(f"🚦 Almacén de rate limiting escuchando en {host}:{port}")
+
+    sweeper = asyncio.create_task(store.sweep_expired())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description="Almacén local de contadores para el rate limiter")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    parser.add_argument("--unix", default=None, help="Ruta de socket unix (tiene prioridad sobre host/port)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\n🛑 Almacén detenido")
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,89 @@
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
 import logging
+import time
+from services.config_service import config_service
+from services.rate_limit_backends import (
+    RateLimitBackend,
+    RateLimitBackendError,
+    MemoryRateLimitBackend,
+    RedisRateLimitBackend
+)
 
 class RateLimiter:
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    """
+    Rate limiter de ventana deslizante aproximada (sliding window counter)
+    Cada IP usa solo dos contadores (ventana fija actual y anterior), por lo que el costo
+    por solicitud y la memoria por cliente son constantes. Los contadores viven en un
+    backend intercambiable: en memoria del proceso o compartido entre workers.
+    """
+    def __init__(self, max_requests: int = 100, window_seconds: int = 60, backend: Optional[RateLimitBackend] = None):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, List[datetime]] = {}
+        self.backend = backend or MemoryRateLimitBackend()
         self.logger = logging.getLogger(__name__)
 
-    async def is_rate_limited(self, ip: str) -> Tuple[bool, int]:
-        now = datetime.now()
-        if ip not in self.requests:
-            self.requests[ip] = []
+    async def is_rate_limited(self, ip: str, cost: int = 1) -> Tuple[bool, int]:
+        """
+        Registra una solicitud de la IP y verifica si supera el límite
 
-        # Limpiar solicitudes antiguas
-        self.requests[ip] = [
-            req_time for req_time in self.requests[ip]
-            if now - req_time < timedelta(seconds=self.window_seconds)
-        ]
+        Args:
+            ip: IP del cliente
+            cost: Solicitudes que cuenta esta llamada (endpoints por lotes cuentan cada elemento)
+
+        Returns:
+            Tuple[bool, int]: (si está limitada, solicitudes estimadas en la ventana)
+        """
+        # Reloj de pared: las ventanas deben coincidir entre procesos
+        now = time.time()
+        window = int(now // self.window_seconds)
+
+        try:
+            current, previous = await self.backend.hit(
+                f"rl:{ip}:{window}",
+                f"rl:{ip}:{window - 1}",
+                2 * self.window_seconds,
+                cost
+            )
+        except RateLimitBackendError as e:
+            # Si el backend compartido no responde, no bloquear el tráfico
+            self.logger.error(str(e))
+            return False, 0
+
+        # Ponderar la ventana anterior según cuánto se solapa con la actual
+        overlap = 1.0 - (now - window * self.window_seconds) / self.window_seconds
+        estimated = int(previous * overlap) + current
 
         # Verificar límite
-        if len(self.requests[ip]) >= self.max_requests:
+        if estimated > self.max_requests:
             self.logger.warning(f"Rate limit exceeded for IP: {ip}")
-            return True, len(self.requests[ip])
+            return True, estimated
+
+        return False, estimated
+
+    async def close(self):
+        """Cierra el backend de contadores"""
+        await self.backend.close()
+
+    def get_stats(self) -> dict:
+        """Obtiene métricas del rate limiter"""
+        return {
+            "max_requests": self.max_requests,
+            "window_seconds": self.window_seconds,
+            **self.backend.get_stats()
+        }
 
-        self.requests[ip].append(now)
-        return False, len(self.requests[ip])
+def create_rate_limiter() -> RateLimiter:
+    """
+    Crea el rate limiter según la configuración (RATE_LIMIT_BACKEND = memory | redis)
+    """
+    if config_service.rate_limit_backend == "redis":
+        backend = RedisRateLimitBackend(config_service.rate_limit_redis_url)
+    else:
+        backend = MemoryRateLimitBackend()
+    return RateLimiter(
+        max_requests=config_service.rate_limit_max_requests,
+        window_seconds=config_service.rate_limit_window_seconds,
+        backend=backend
+    )
 
-rate_limiter = RateLimiter()
\ No newline at end of file
+rate_limiter = create_rate_limiter()
@@ -0,0 +1,155 @@
+import hashlib
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from services.config_service import config_service
+from services.index_registry import index_registry
+
+# Los refresh tokens caducados se eliminan solos; las familias se revocan por "family"
+index_registry.register("refresh_tokens", [("expires_at", 1)], expireAfterSeconds=0)
+index_registry.register("refresh_tokens", [("family", 1)])
+index_registry.register("refresh_tokens", [("user_id", 1)])
+
+class RefreshTokenService:
+    """
+    Refresh tokens rotativos para renovar sesiones sin volver a verificar la contraseña
+    Cada uso entrega un token nuevo de la misma familia y marca el anterior como usado.
+    Si un token ya usado se presenta otra vez (posible robo), se revoca toda la familia,
+    salvo dentro de un margen corto tras su uso: dos renovaciones simultáneas legítimas
+    (varias pestañas, reintentos de red) reciben cada una un token nuevo de la familia.
+    Los tokens son aleatorios de 256 bits, así que basta un SHA-256 para guardarlos.
+    """
+
+    collection_name = "refresh_tokens"
+
+    def __init__(self, ttl_days: int = 7, reuse_grace_seconds: int = 10):
+        """
+        Inicializa el servicio de refresh tokens
+
+        Args:
+            ttl_days: Duración de cada refresh token en días
+            reuse_grace_seconds: Segundos tras el uso en que el token se acepta otra vez
+        """
+        self.ttl = timedelta(days=ttl_days)
+        self.reuse_grace = timedelta(seconds=reuse_grace_seconds)
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def issue(self, db, user_id: str, family: Optional[str] = None) -> str:
+        """
+        Emite un refresh token
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+            user_id: ID del usuario
+            family: Familia del token (None para una sesión nueva)
+
+        Returns:
+            str: Refresh token en claro (solo se guarda su hash)
+        """
+        token = secrets.token_urlsafe(32)
+        now = datetime.now(timezone.utc)
+        collection = await db.get_collection(self.collection_name)
+        await collection.insert_one({
+            "_id": self._hash(token),
+            "family": family or secrets.token_hex(16),
+            "user_id": user_id,
+            "created_at": now,
+            "expires_at": now + self.ttl,
+            "used_at": None
+        })
+        return token
+
+    async def rotate(self, db, token: str) -> Tuple[str, str]:
+        """
+        Consume un refresh token y emite el siguiente de la misma familia
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+            token: Refresh token presentado
+
+        Returns:
+            Tuple[str, str]: (ID del usuario, nuevo refresh token)
+
+        Raises:
+            HTTPException: Si el token es inválido, expiró o ya fue usado fuera del margen de reutilización
+        """
+        collection = await db.get_collection(self.collection_name)
+        now = datetime.now(timezone.utc)
+        token_hash = self._hash(token)
+
+        # Marcar como usado de forma atómica: solo una petición puede consumir el token
+        document = await collection.find_one_and_update(
+            {"_id": token_hash, "used_at": None, "expires_at": {"$gt": now}},
+            {"$set": {"used_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            previous = await collection.find_one({"_id": token_hash}, {"family": 1, "user_id": 1, "used_at": 1})
+            used_at = previous.get("used_at") if previous is not None else None
+            if used_at is not None and used_at.tzinfo is None:
+                # MongoDB devuelve las fechas sin zona (UTC)
+                used_at = used_at.replace(tzinfo=timezone.utc)
+            if used_at is not None and now - used_at <= self.reuse_grace:
+                # Renovación simultánea con la que acaba de consumir el token: no es reutilización
+                new_token = await self.issue(db, previous["user_id"], previous["family"])
+                return previous["user_id"], new_token
+            if used_at is not None:
+                # Reutilización: alguien más tiene un token de esta familia
+                result = await collection.delete_many({"family": previous["family"]})
+                self.logger.warning(
+                    f"Reutilización de refresh token detectada, familia {previous['family']} revocada "
+                    f"({result.deleted_count} tokens)"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token inválido"
+            )
+
+        new_token = await self.issue(db, document["user_id"], document["family"])
+        return document["user_id"], new_token
+
+    async def revoke(self, db, token: str) -> bool:
+        """
+        Revoca la familia completa de un refresh token (logout)
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+            token: Refresh token de la sesión
+
+        Returns:
+            bool: True si el token existía
+        """
+        collection = await db.get_collection(self.collection_name)
+        document = await collection.find_one({"_id": self._hash(token)}, {"family": 1})
+        if document is None:
+            return False
+        await collection.delete_many({"family": document["family"]})
+        return True
+
+    async def revoke_user(self, db, user_id: str) -> int:
+        """
+        Revoca todas las sesiones de refresh de un usuario
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+            user_id: ID del usuario
+
+        Returns:
+            int: Número de refresh tokens eliminados
+        """
+        collection = await db.get_collection(self.collection_name)
+        result = await collection.delete_many({"user_id": user_id})
+        return result.deleted_count
+
+# Instancia global del servicio de refresh tokens
+refresh_token_service = RefreshTokenService(
+    ttl_days=config_service.refresh_token_ttl_days,
+    reuse_grace_seconds=config_service.refresh_token_reuse_grace_seconds
+)
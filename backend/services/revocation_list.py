@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from services.config_service import config_service
+from services.index_registry import index_registry
+
+# Los documentos revocados se eliminan solos cuando el token habría expirado
+index_registry.register("revoked_tokens", [("expires_at", 1)], expireAfterSeconds=0)
+
+class RevocationList:
+    """
+    Lista de tokens revocados (por jti) en memoria, respaldada por la colección "revoked_tokens"
+    Las comprobaciones son una búsqueda en un diccionario local, sin consultar MongoDB.
+    Un proceso en segundo plano sincroniza periódicamente las revocaciones hechas por otras
+    instancias y descarta las ya expiradas.
+    """
+
+    collection_name = "revoked_tokens"
+
+    def __init__(self, sync_interval_seconds: int = 10):
+        """
+        Inicializa la lista de revocación
+
+        Args:
+            sync_interval_seconds: Intervalo entre sincronizaciones con MongoDB
+        """
+        self.sync_interval_seconds = sync_interval_seconds
+        self._revoked: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.last_sync: Optional[datetime] = None
+        self.rejected = 0
+        self.logger = logging.getLogger(__name__)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """
+        Indica si un token está revocado
+
+        Args:
+            jti: Identificador del token
+
+        Returns:
+            bool: True si el token fue revocado y aún no ha expirado
+        """
+        if jti is None:
+            return False
+        expires_at = self._revoked.get(jti)
+        if expires_at is None or expires_at <= time.time():
+            return False
+        self.rejected += 1
+        return True
+
+    async def revoke(self, db, jti: str, expires_at: datetime) -> None:
+        """
+        Revoca un token hasta su expiración
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+            jti: Identificador del token
+            expires_at: Expiración del token (tras ella el documento se elimina por TTL)
+        """
+        self._revoked[jti] = expires_at.timestamp()
+        collection = await db.get_collection(self.collection_name)
+        await collection.update_one(
+            {"_id": jti},
+            {"$setOnInsert": {"expires_at": expires_at, "revoked_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def sync(self, db) -> int:
+        """
+        Recarga las revocaciones vigentes desde MongoDB
+        (el conjunto está acotado por la duración de los tokens, así que se recarga completo)
+
+        Args:
+            db: Servicio asíncrono de MongoDB
+
+        Returns:
+            int: Número de tokens revocados vigentes
+        """
+        collection = await db.get_collection(self.collection_name)
+        now = datetime.now(timezone.utc)
+        revoked: Dict[str, float] = {}
+        async for document in collection.find({"expires_at": {"$gt": now}}, {"expires_at": 1}):
+            expires_at = document["expires_at"]
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            revoked[document["_id"]] = expires_at.timestamp()
+
+        # Conservar revocaciones locales que aún no aparezcan en la consulta
+        current_time = time.time()
+        for jti, expires_at in self._revoked.items():
+            if jti not in revoked and expires_at > current_time:
+                revoked[jti] = expires_at
+
+        self._revoked = revoked
+        self.last_sync = now
+        return len(revoked)
+
+    async def _sync_loop(self, db):
+        while True:
+            await asyncio.sleep(self.sync_interval_seconds)
+            try:
+                await self.sync(db)
+            except Exception as e:
+                self.logger.error(f"Error al sincronizar tokens revocados: {str(e)}")
+
+    async def start(self, db):
+        """Carga las revocaciones existentes y lanza la sincronización periódica"""
+        try:
+            await self.sync(db)
+        except Exception as e:
+            self.logger.error(f"Error al cargar tokens revocados: {str(e)}")
+        self._task = asyncio.create_task(self._sync_loop(db))
+
+    async def stop(self):
+        """Detiene la sincronización periódica"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> dict:
+        """Métricas de la lista de revocación"""
+        return {
+            "revoked": len(self._revoked),
+            "rejected_requests": self.rejected,
+            "last_sync": self.last_sync.isoformat() if self.last_sync else None
+        }
+
+# Instancia global de la lista de revocación
+revocation_list = RevocationList(
+    sync_interval_seconds=config_service.revocation_sync_interval_seconds
+)
@@ -0,0 +1,586 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, List, Optional
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+
+# Tamaño de bloque para leer y copiar archivos
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Tamaño mínimo de parte que acepta S3 en un multipart upload (salvo la última)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+class StorageError(Exception):
+    """Error del backend de almacenamiento"""
+    pass
+
+class StorageNotFoundError(StorageError):
+    """El objeto no existe en el almacenamiento"""
+    pass
+
+class StorageSizeLimitError(StorageError):
+    """El archivo (o el conjunto de archivos de una petición) supera el tamaño permitido"""
+    pass
+
+class ByteBudget:
+    """
+    Límite de bytes compartido por varias escrituras concurrentes (p. ej. una petición)
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int):
+        """
+        Descuenta bytes del presupuesto
+
+        Raises:
+            StorageSizeLimitError: Si se supera el límite
+        """
+        with self._lock:
+            self.used += nbytes
+            if self.used > self.max_bytes:
+                raise StorageSizeLimitError(f"Se superó el límite de {self.max_bytes} bytes")
+
+class HashingReader:
+    """
+    Envoltorio de un archivo que calcula el SHA-256 y el tamaño mientras se lee
+    Opcionalmente corta la lectura en cuanto se supera un tamaño máximo
+    """
+
+    def __init__(self, fileobj: BinaryIO, max_bytes: Optional[int] = None, budget: Optional[ByteBudget] = None):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.max_bytes = max_bytes
+        self.budget = budget
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.fileobj.read(size)
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise StorageSizeLimitError(f"El archivo supera el límite de {self.max_bytes} bytes")
+        if self.budget is not None:
+            self.budget.consume(len(chunk))
+        self.sha256.update(chunk)
+        return chunk
+
+    def read_chunk(self, chunk_size: int) -> bytes:
+        """Lee hasta chunk_size bytes (menos solo al llegar al final del archivo)"""
+        parts = []
+        remaining = chunk_size
+        while remaining > 0:
+            data = self.read(remaining)
+            if not data:
+                break
+            parts.append(data)
+            remaining -= len(data)
+        return b"".join(parts)
+
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
+
+class StorageBackend(ABC):
+    """
+    Almacenamiento de archivos por clave ("carpeta/archivo.ext")
+    Las operaciones bloqueantes se ejecutan en un pool de hilos propio del backend
+    y cada operación acumula conteo, bytes y tiempo para poder medir la E/S.
+    """
+
+    name = "base"
+
+    def __init__(self, io_workers: int = 4):
+        self.logger = logging.getLogger(__name__)
+        self.io_workers = max(1, io_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix=f"storage-{self.name}")
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    async def _run(self, func, *args):
+        """Ejecuta una llamada bloqueante en el pool de hilos del backend"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _record(self, operation: str, started: float, nbytes: int = 0):
+        """Acumula las métricas de una operación"""
+        stats = self._stats.setdefault(operation, {"count": 0, "bytes": 0, "total_ms": 0.0})
+        stats["count"] += 1
+        stats["bytes"] += nbytes
+        stats["total_ms"] += (time.perf_counter() - started) * 1000
+
+    @abstractmethod
+    async def write(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        budget: Optional[ByteBudget] = None
+    ) -> dict:
+        """
+        Guarda un archivo leyéndolo por bloques y calculando su SHA-256 en la misma pasada
+
+        Args:
+            key: Clave del objeto
+            fileobj: Archivo binario síncrono (UploadFile.file, BytesIO...)
+            content_type: Tipo MIME del objeto (opcional)
+            max_bytes: Tamaño máximo del archivo (opcional)
+            budget: Límite compartido con otras escrituras (opcional)
+
+        Returns:
+            dict: key, size y sha256 del objeto guardado
+
+        Raises:
+            StorageSizeLimitError: Si se supera un límite; no queda nada escrito
+        """
+        pass
+
+    async def write_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> dict:
+        """Guarda un objeto a partir de bytes en memoria"""
+        return await self.write(key, io.BytesIO(data), content_type)
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        """
+        Lee un objeto completo
+
+        Raises:
+            StorageNotFoundError: Si el objeto no existe
+        """
+        pass
+
+    @abstractmethod
+    def stream(
+        self,
+        key: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Lee un objeto por bloques (para StreamingResponse)
+
+        Args:
+            key: Clave del objeto
+            chunk_size: Tamaño de cada bloque
+            start: Byte inicial (para peticiones Range)
+            length: Número de bytes a leer (None = hasta el final)
+
+        Raises:
+            StorageNotFoundError: Si el objeto no existe
+        """
+        pass
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[dict]:
+        """
+        Obtiene los metadatos de un objeto
+
+        Returns:
+            Optional[dict]: size, modified (datetime UTC), etag y weak_etag (True si el etag
+            no se deriva del contenido), o None si no existe
+        """
+        pass
+
+    async def exists(self, key: str) -> bool:
+        """Comprueba si un objeto existe"""
+        return await self.stat(key) is not None
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Elimina un objeto (no falla si no existe)"""
+        pass
+
+    async def delete_many(self, keys: List[str]) -> None:
+        """Elimina varios objetos"""
+        for key in keys:
+            await self.delete(key)
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """Elimina todos los objetos cuya clave empieza por prefix (una "carpeta")"""
+        pass
+
+    async def get_url(self, key: str, check_exists: bool = False) -> Optional[str]:
+        """
+        Obtiene una URL de descarga directa
+
+        Args:
+            key: Clave del objeto
+            check_exists: Comprobar que el objeto existe antes de generar la URL
+
+        Returns:
+            Optional[str]: URL, o None si el backend no ofrece URLs directas (hay que usar stream)
+
+        Raises:
+            StorageNotFoundError: Si check_exists y el objeto no existe
+        """
+        if check_exists and not await self.exists(key):
+            raise StorageNotFoundError(key)
+        return None
+
+    def get_stats(self) -> dict:
+        """
+        Obtiene las métricas de E/S del backend
+
+        Returns:
+            dict: Por operación, conteo, bytes y tiempo medio
+        """
+        return {
+            "backend": self.name,
+            "io_workers": self.io_workers,
+            "operations": {
+                operation: {
+                    "count": stats["count"],
+                    "bytes": stats["bytes"],
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 2) if stats["count"] else 0.0
+                }
+                for operation, stats in self._stats.items()
+            }
+        }
+
+    async def close(self):
+        """Cierra el pool de hilos"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Almacenamiento en disco local bajo un directorio raíz
+    No requiere red: sirve para desarrollo, pruebas y benchmarks
+    """
+
+    name = "local"
+
+    def __init__(self, root: str, io_workers: int = 4):
+        super().__init__(io_workers)
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        """Ruta de un objeto, impidiendo claves que salgan del directorio raíz"""
+        path = (self.root / key).resolve()
+        if path != self.root and self.root not in path.parents:
+            raise StorageError(f"Clave inválida: {key}")
+        return path
+
+    async def write(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        budget: Optional[ByteBudget] = None
+    ) -> dict:
+        started = time.perf_counter()
+        reader = HashingReader(fileobj, max_bytes, budget)
+        size, content_hash = await self._run(self._write_sync, self._path(key), reader)
+        self._record("write", started, size)
+        return {"key": key, "size": size, "sha256": content_hash}
+
+    def _write_sync(self, path: Path, reader: HashingReader) -> tuple:
+        """Copia por bloques a un temporal y lo renombra (el objeto nunca queda a medias)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                while chunk := reader.read(DEFAULT_CHUNK_SIZE):
+                    buffer.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return reader.size, reader.hexdigest()
+
+    async def read(self, key: str) -> bytes:
+        started = time.perf_counter()
+        path = self._path(key)
+        try:
+            data = await self._run(path.read_bytes)
+        except (FileNotFoundError, IsADirectoryError):
+            raise StorageNotFoundError(key)
+        self._record("read", started, len(data))
+        return data
+
+    async def stream(
+        self,
+        key: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        path = self._path(key)
+        try:
+            handle = await self._run(open, path, "rb")
+        except (FileNotFoundError, IsADirectoryError):
+            raise StorageNotFoundError(key)
+        total = 0
+        try:
+            if start:
+                await self._run(handle.seek, start)
+            while length is None or total < length:
+                to_read = chunk_size if length is None else min(chunk_size, length - total)
+                chunk = await self._run(handle.read, to_read)
+                if not chunk:
+                    break
+                total += len(chunk)
+                yield chunk
+        finally:
+            handle.close()
+            self._record("stream", started, total)
+
+    async def stat(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            file_stat = await self._run(os.stat, path)
+        except FileNotFoundError:
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        return {
+            "size": file_stat.st_size,
+            "modified": datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc),
+            # Tamaño + mtime identifican la versión del archivo pero no su contenido: ETag débil
+            "etag": f"{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}",
+            "weak_etag": True
+        }
+
+    async def delete(self, key: str) -> None:
+        started = time.perf_counter()
+        await self._run(lambda: self._path(key).unlink(missing_ok=True))
+        self._record("delete", started)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        started = time.perf_counter()
+        path = self._path(prefix.rstrip("/"))
+        if path != self.root:
+            await self._run(lambda: shutil.rmtree(path, ignore_errors=True))
+        self._record("delete_prefix", started)
+
+class S3StorageBackend(StorageBackend):
+    """
+    Almacenamiento en un bucket de S3
+    Las subidas se hacen por partes y las URLs prefirmadas se reutilizan desde una caché
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        io_workers: int = 4,
+        chunk_size: int = 8 * 1024 * 1024,
+        url_expires_in: int = 3600,
+        url_cache=None
+    ):
+        super().__init__(io_workers)
+        self.s3 = client
+        self.bucket = bucket
+        self.chunk_size = max(S3_MIN_PART_SIZE, chunk_size)
+        self.url_expires_in = url_expires_in
+        self.url_cache = url_cache
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    async def write(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        budget: Optional[ByteBudget] = None
+    ) -> dict:
+        started = time.perf_counter()
+        reader = HashingReader(fileobj, max_bytes, budget)
+        content_hash, size = await self._run(self._stream_upload, reader, key, content_type)
+        if self.url_cache is not None:
+            self.url_cache.invalidate(key)
+        self._record("write", started, size)
+        return {"key": key, "size": size, "sha256": content_hash}
+
+    def _stream_upload(self, reader: HashingReader, key: str, content_type: Optional[str]) -> tuple:
+        """
+        Sube el archivo leyendo partes de tamaño fijo (se ejecuta en el pool de hilos)
+
+        Si el archivo cabe en una parte se usa un único put_object con el hash en los
+        metadatos. Si no, se hace un multipart upload y al terminar se copia el objeto
+        sobre sí mismo (en el servidor) para guardar el hash, que solo se conoce al final.
+
+        Returns:
+            tuple: (sha256 en hexadecimal, tamaño en bytes)
+        """
+        extra_args = {"ContentType": content_type} if content_type else {}
+        chunk = reader.read_chunk(self.chunk_size)
+        next_chunk = reader.read_chunk(self.chunk_size) if len(chunk) == self.chunk_size else b""
+
+        if not next_chunk:
+            self.s3.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=chunk,
+                Metadata={"sha256": reader.hexdigest()},
+                **extra_args
+            )
+            return reader.hexdigest(), reader.size
+
+        upload_id = self.s3.create_multipart_upload(Bucket=self.bucket, Key=key, **extra_args)["UploadId"]
+        try:
+            parts = []
+            while chunk:
+                part_number = len(parts) + 1
+                response = self.s3.upload_part(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk
+                )
+                parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+                chunk, next_chunk = next_chunk, (reader.read_chunk(self.chunk_size) if next_chunk else b"")
+
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except Exception:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+        self.s3.copy_object(
+            Bucket=self.bucket,
+            Key=key,
+            CopySource={"Bucket": self.bucket, "Key": key},
+            Metadata={"sha256": reader.hexdigest()},
+            MetadataDirective="REPLACE",
+            **extra_args
+        )
+        return reader.hexdigest(), reader.size
+
+    async def _get_object(self, key: str, **kwargs) -> dict:
+        try:
+            return await self._run(lambda: self.s3.get_object(Bucket=self.bucket, Key=key, **kwargs))
+        except Exception as e:
+            if self._is_not_found(e):
+                raise StorageNotFoundError(key)
+            raise
+
+    async def read(self, key: str) -> bytes:
+        started = time.perf_counter()
+        response = await self._get_object(key)
+        data = await self._run(response["Body"].read)
+        self._record("read", started, len(data))
+        return data
+
+    async def stream(
+        self,
+        key: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        extra_args = {}
+        if start or length is not None:
+            end = "" if length is None else str(start + length - 1)
+            extra_args["Range"] = f"bytes={start}-{end}"
+        body = (await self._get_object(key, **extra_args))["Body"]
+        total = 0
+        try:
+            while chunk := await self._run(body.read, chunk_size):
+                total += len(chunk)
+                yield chunk
+        finally:
+            body.close()
+            self._record("stream", started, total)
+
+    async def stat(self, key: str) -> Optional[dict]:
+        started = time.perf_counter()
+        try:
+            response = await self._run(lambda: self.s3.head_object(Bucket=self.bucket, Key=key))
+        except Exception as e:
+            if self._is_not_found(e):
+                return None
+            raise
+        finally:
+            self._record("stat", started)
+        return {
+            "size": response["ContentLength"],
+            "modified": response["LastModified"],
+            "etag": response["ETag"].strip('"'),
+            "weak_etag": False,
+            "sha256": response.get("Metadata", {}).get("sha256")
+        }
+
+    async def delete(self, key: str) -> None:
+        await self.delete_many([key])
+
+    async def delete_many(self, keys: List[str]) -> None:
+        started = time.perf_counter()
+        # delete_objects acepta hasta 1000 claves por petición
+        for i in range(0, len(keys), 1000):
+            batch = keys[i:i + 1000]
+            await self._run(lambda: self.s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            ))
+        if self.url_cache is not None:
+            for key in keys:
+                self.url_cache.invalidate(key)
+        self._record("delete", started)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        paginator = self.s3.get_paginator("list_objects_v2")
+        pages = await self._run(lambda: list(paginator.paginate(Bucket=self.bucket, Prefix=prefix)))
+        keys = [obj["Key"] for page in pages for obj in page.get("Contents", [])]
+        if keys:
+            await self.delete_many(keys)
+
+    async def get_url(self, key: str, check_exists: bool = False) -> Optional[str]:
+        """
+        Obtiene una URL prefirmada, reutilizando la de la caché mientras siga vigente
+        """
+        if self.url_cache is not None:
+            found, url = self.url_cache.lookup(key)
+            if found:
+                if url is None:
+                    raise StorageNotFoundError(key)
+                return url
+
+        if check_exists and not await self.exists(key):
+            if self.url_cache is not None:
+                self.url_cache.set_missing(key)
+            raise StorageNotFoundError(key)
+
+        started = time.perf_counter()
+        url = self.s3.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': key},
+            ExpiresIn=self.url_expires_in
+        )
+        self._record("sign_url", started)
+        if self.url_cache is not None:
+            self.url_cache.set_url(key, url, self.url_expires_in)
+        return url
+
+    def get_stats(self) -> dict:
+        stats = super().get_stats()
+        stats["bucket"] = self.bucket
+        if self.url_cache is not None:
+            stats["url_cache"] = self.url_cache.get_stats()
+        return stats
@@ -0,0 +1,52 @@
+from services.config_service import config_service
+from services.presigned_url_cache import presigned_url_cache
+from services.storage_backends import StorageBackend, LocalStorageBackend, S3StorageBackend
+
+def create_storage(backend_name: str, local_root: str) -> StorageBackend:
+    """
+    Crea un almacenamiento según la configuración (local | s3)
+
+    Args:
+        backend_name: Nombre del backend
+        local_root: Directorio raíz cuando el backend es local
+
+    Returns:
+        StorageBackend: Backend de almacenamiento
+    """
+    if backend_name == "s3":
+        import boto3
+        client = boto3.client(
+            's3',
+            aws_access_key_id=config_service.aws_access_key,
+            aws_secret_access_key=config_service.aws_secret_key,
+            region_name=config_service.aws_region
+        )
+        return S3StorageBackend(
+            client,
+            config_service.aws_bucket,
+            io_workers=config_service.storage_io_workers,
+            chunk_size=config_service.s3_upload_chunk_size,
+            url_expires_in=config_service.presigned_url_expires_in,
+            url_cache=presigned_url_cache
+        )
+    if backend_name == "local":
+        return LocalStorageBackend(local_root, io_workers=config_service.storage_io_workers)
+    raise ValueError(f"Backend de almacenamiento no soportado: {backend_name}")
+
+# Archivos públicos de la aplicación: miniaturas y /storage/upload
+file_storage = create_storage(config_service.file_storage_backend, config_service.file_storage_local_dir)
+
+# Imágenes de objetos perdidos y evidencias de reclamos
+lost_item_storage = create_storage(config_service.lost_item_storage_backend, config_service.local_storage_dir)
+
+async def close_storages():
+    """Cierra los pools de hilos de los almacenamientos"""
+    await file_storage.close()
+    await lost_item_storage.close()
+
+def get_storage_stats() -> dict:
+    """Métricas de E/S de cada almacenamiento"""
+    return {
+        "file_storage": file_storage.get_stats(),
+        "lost_item_storage": lost_item_storage.get_stats()
+    }
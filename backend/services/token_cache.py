@@ -0,0 +1,103 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from services.config_service import config_service
+
+class TokenCache:
+    """
+    Caché en memoria de tokens JWT ya verificados
+    LRU acotado indexado por el SHA-256 del token; cada entrada expira en el `exp` del token,
+    así que un acierto equivale a una verificación de firma correcta y vigente.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Inicializa la caché de tokens
+
+        Args:
+            max_size: Número máximo de tokens en caché
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """Clave de la caché (no se guarda el token en claro)"""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene el payload de un token verificado si sigue vigente
+
+        Args:
+            token: Token JWT
+
+        Returns:
+            Optional[Dict[str, Any]]: Copia del payload o None
+        """
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(payload)
+
+    def set(self, token: str, payload: Dict[str, Any]) -> None:
+        """
+        Guarda el payload de un token verificado hasta su expiración
+
+        Args:
+            token: Token JWT
+            payload: Payload verificado (debe incluir exp)
+        """
+        expires_at = float(payload["exp"])
+        if expires_at <= time.time():
+            return
+
+        key = self._digest(token)
+        self._entries[key] = (expires_at, dict(payload))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        """Elimina un token de la caché"""
+        self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        """Vacía la caché completa"""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Obtiene las métricas de la caché
+
+        Returns:
+            dict: Tamaño, aciertos, fallos y desalojos
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+# Instancia global de la caché de tokens verificados
+token_cache = TokenCache(max_size=config_service.token_cache_max_size)
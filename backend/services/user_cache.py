@@ -0,0 +1,98 @@
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from services.config_service import config_service
+
+class UserCache:
+    """
+    Caché en memoria de documentos de usuario para la autenticación
+    LRU acotado con expiración por TTL, indexado por el ID del usuario
+    """
+
+    def __init__(self, max_size: int = 1000, ttl_seconds: int = 60):
+        """
+        Inicializa la caché de usuarios
+
+        Args:
+            max_size: Número máximo de usuarios en caché
+            ttl_seconds: Tiempo de vida de cada entrada en segundos
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.logger = logging.getLogger(__name__)
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un usuario de la caché si existe y no ha expirado
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            Optional[Dict[str, Any]]: Documento del usuario o None
+        """
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, usuario = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return usuario
+
+    def set(self, user_id: str, usuario: Dict[str, Any]) -> None:
+        """
+        Guarda un usuario en la caché, desalojando el menos usado si está llena
+
+        Args:
+            user_id: ID del usuario
+            usuario: Documento del usuario
+        """
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, usuario)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """Elimina un usuario de la caché (tras actualizarlo o eliminarlo)"""
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Vacía la caché completa"""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Obtiene las métricas de la caché
+
+        Returns:
+            dict: Tamaño, aciertos, fallos y desalojos
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+# Instancia global de la caché de usuarios
+user_cache = UserCache(
+    max_size=config_service.user_cache_max_size,
+    ttl_seconds=config_service.user_cache_ttl_seconds
+)
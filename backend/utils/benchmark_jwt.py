@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark de firma y verificación de tokens JWT con cada algoritmo soportado
+
+Uso:
+    python utils/benchmark_jwt.py
+    python utils/benchmark_jwt.py --iterations 5000
+"""
+import sys
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(str(Path(__file__).parent.parent))
+
+from cryptography.hazmat.primitives import serialization
+from jose import jwt
+from services.jwt_keys import SUPPORTED_ALGORITHMS, load_signing_key, load_verification_key
+from generate_keys import generate_private_key
+
+def key_pair_pem(algorithm: str):
+    """Genera un par de llaves en memoria y lo devuelve en PEM"""
+    private_key = generate_private_key(algorithm)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+def ops_per_second(operation, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return iterations / (time.perf_counter() - start)
+
+def run_benchmark(algorithm: str, iterations: int) -> dict:
+    """Mide firmas y verificaciones por segundo con llaves ya parseadas (como AuthService)"""
+    private_pem, public_pem = key_pair_pem(algorithm)
+    _, kid, signing_key = load_signing_key(private_pem)
+    _, _, verification_key = load_verification_key(public_pem)
+
+    payload = {
+        "user_id": "64b000000000000000000000",
+        "tipo": "usuario",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=30)
+    }
+    headers = {"kid": kid}
+    token = jwt.encode(payload, signing_key, algorithm=algorithm, headers=headers)
+
+    return {
+        "sign": ops_per_second(lambda: jwt.encode(payload, signing_key, algorithm=algorithm, headers=headers), iterations),
+        "verify": ops_per_second(lambda: jwt.decode(token, verification_key, algorithms=[algorithm]), iterations),
+        "token_bytes": len(token)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de algoritmos JWT")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"🔐 Benchmark JWT ({args.iterations} operaciones por medición)\n")
+    results = {}
+    for algorithm in SUPPORTED_ALGORITHMS:
+        results[algorithm] = run_benchmark(algorithm, args.iterations)
+        result = results[algorithm]
+        print(
+            f"   • {algorithm:<6} firma {result['sign']:>10,.0f} ops/s | "
+            f"verificación {result['verify']:>10,.0f} ops/s | token {result['token_bytes']} bytes"
+        )
+
+    baseline = results["RS256"]["sign"]
+    print("\n📊 Firma relativa a RS256:")
+    for algorithm, result in results.items():
+        print(f"   • {algorithm:<6} x{result['sign'] / baseline:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la decodificación de miniaturas: decodificación completa vs draft de JPEG
+
+Uso:
+    python utils/benchmark_miniatures.py                      # corpus sintético de fotos 12 MP
+    python utils/benchmark_miniatures.py --corpus ~/Fotos     # fotos reales (*.jpg, *.jpeg, *.png)
+"""
+import sys
+import argparse
+import io
+import statistics
+import time
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(str(Path(__file__).parent.parent))
+
+from PIL import Image
+from services.image_processing import decode_image, EXIF_ORIENTATION_TAG
+
+MINIATURE_SIZE = (300, 300)
+CORPUS_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+def build_synthetic_corpus(count: int) -> list:
+    """Genera fotos JPEG de 4000x3000 (12 MP) con y sin rotación EXIF, como las de un celular"""
+    corpus = []
+    for i in range(count):
+        image = Image.radial_gradient("L").resize((4000, 3000)).convert("RGB")
+        exif = Image.Exif()
+        exif[EXIF_ORIENTATION_TAG] = 6 if i % 2 else 1
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90, exif=exif)
+        corpus.append((f"sintetica_{i}.jpg", buffer.getvalue()))
+    return corpus
+
+def load_corpus(directory: Path) -> list:
+    """Carga las imágenes de un directorio"""
+    return [
+        (path.name, path.read_bytes())
+        for path in sorted(directory.iterdir())
+        if path.suffix.lower() in CORPUS_EXTENSIONS
+    ]
+
+def measure(corpus: list, use_draft: bool, rounds: int) -> dict:
+    """Decodifica y redimensiona el corpus midiendo el tiempo y la resolución decodificada"""
+    latencies = []
+    decoded_pixels = []
+    for _ in range(rounds):
+        for _, image_data in corpus:
+            start = time.perf_counter()
+            image, _ = decode_image(image_data, MINIATURE_SIZE, use_draft=use_draft)
+            decoded_pixels.append(image.width * image.height / 1_000_000)
+            image.thumbnail(MINIATURE_SIZE, Image.Resampling.LANCZOS)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "max_ms": latencies[-1],
+        "decoded_mp": statistics.fmean(decoded_pixels)
+    }
+
+def print_result(name: str, result: dict):
+    print(
+        f"   • {name:<14} media {result['mean_ms']:8.2f} ms | p50 {result['p50_ms']:8.2f} ms | "
+        f"máx {result['max_ms']:8.2f} ms | decodificado {result['decoded_mp']:6.2f} MP"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de decodificación de miniaturas")
+    parser.add_argument("--corpus", type=Path, default=None, help="Directorio con fotos")
+    parser.add_argument("--synthetic", type=int, default=6, help="Fotos sintéticas si no hay corpus")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else build_synthetic_corpus(args.synthetic)
+    if not corpus:
+        print("❌ No se encontraron imágenes en el corpus")
+        return
+
+    print("🚀 Benchmark de decodificación de miniaturas")
+    print(f"   Imágenes: {len(corpus)} | Rondas: {args.rounds} | Miniatura: {MINIATURE_SIZE}")
+    print("=" * 50)
+
+    full = measure(corpus, use_draft=False, rounds=args.rounds)
+    draft = measure(corpus, use_draft=True, rounds=args.rounds)
+    print_result("completa", full)
+    print_result("draft JPEG", draft)
+    print(f"   ⚡ Aceleración: {full['mean_ms'] / draft['mean_ms']:.1f}x")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark del costo por solicitud del rate limiter con cada backend
+
+Uso:
+    python utils/benchmark_rate_limiter.py
+    python utils/benchmark_rate_limiter.py --requests 50000 --ips 1000
+    python utils/benchmark_rate_limiter.py --redis-url redis://127.0.0.1:6379/0
+"""
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.rate_limiter import RateLimiter
+from services.rate_limit_backends import MemoryRateLimitBackend, RedisRateLimitBackend
+
+async def run_benchmark(limiter: RateLimiter, total_requests: int, distinct_ips: int) -> dict:
+    """Ejecuta solicitudes secuenciales y mide la latencia de cada una"""
+    latencies = []
+    for i in range(total_requests):
+        n = i % distinct_ips
+        ip = f"10.0.{n // 256}.{n % 256}"
+        start = time.perf_counter()
+        await limiter.is_rate_limited(ip)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+
+    latencies.sort()
+    return {
+        "mean_us": statistics.fmean(latencies),
+        "p50_us": latencies[len(latencies) // 2],
+        "p99_us": latencies[int(len(latencies) * 0.99)],
+        "req_per_s": total_requests / (sum(latencies) / 1_000_000)
+    }
+
+def print_result(name: str, result: dict):
+    print(
+        f"   • {name:<28} media {result['mean_us']:8.2f} µs | "
+        f"p50 {result['p50_us']:8.2f} µs | p99 {result['p99_us']:8.2f} µs | "
+        f"{result['req_per_s']:>10,.0f} req/s"
+    )
+
+async def wait_for_socket(path: str, timeout: float = 5.0):
+    """Espera a que el almacén local cree su socket"""
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"El almacén no creó el socket {path}")
+        await asyncio.sleep(0.05)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark del rate limiter")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--ips", type=int, default=500)
+    parser.add_argument("--redis-url", default=None, help="Medir también contra un Redis real")
+    args = parser.parse_args()
+
+    print("🚀 Benchmark del rate limiter")
+    print(f"   Solicitudes: {args.requests} | IPs distintas: {args.ips}")
+    print("=" * 50)
+
+    # Backend en memoria del proceso
+    limiter = RateLimiter(max_requests=100, window_seconds=60, backend=MemoryRateLimitBackend())
+    print_result("memory", await run_benchmark(limiter, args.requests, args.ips))
+
+    # Backend compartido contra el almacén local en un socket unix
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        socket_path = os.path.join(tmp_dir, "ratelimit.sock")
+        store = subprocess.Popen(
+            [sys.executable, "-m", "services.rate_limit_store", "--unix", socket_path],
+            cwd=str(Path(__file__).parent.parent),
+            stdout=subprocess.DEVNULL
+        )
+        try:
+            await wait_for_socket(socket_path)
+            limiter = RateLimiter(
+                max_requests=100,
+                window_seconds=60,
+                backend=RedisRateLimitBackend(f"unix://{socket_path}")
+            )
+            print_result("rate_limit_store (unix)", await run_benchmark(limiter, args.requests, args.ips))
+            await limiter.close()
+        finally:
+            store.terminate()
+            store.wait()
+
+    # Redis real (opcional)
+    if args.redis_url:
+        limiter = RateLimiter(max_requests=100, window_seconds=60, backend=RedisRateLimitBackend(args.redis_url))
+        print_result("redis", await run_benchmark(limiter, args.requests, args.ips))
+        await limiter.close()
+
+    print("=" * 50)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -23,8 +23,8 @@ def create_test_events():
     events_data = [
         {
             "title": "Inauguración del Semestre",
-            "start": (august_base + timedelta(days=5, hours=9)).isoformat(),
-            "end": (august_base + timedelta(days=5, hours=12)).isoformat(),
+            "start": august_base + timedelta(days=5, hours=9),
+            "end": august_base + timedelta(days=5, hours=12),
             "location": "Auditorio Principal",
             "description": "Ceremonia de bienvenida para todos los estudiantes del nuevo semestre académico",
             "created_at": datetime.now().isoformat(),
@@ -32,8 +32,8 @@ def create_test_events():
         },
         {
             "title": "Workshop de Programación Python",
-            "start": (august_base + timedelta(days=8, hours=14)).isoformat(),
-            "end": (august_base + timedelta(days=8, hours=18)).isoformat(),
+            "start": august_base + timedelta(days=8, hours=14),
+            "end": august_base + timedelta(days=8, hours=18),
             "location": "Laboratorio de Computación A",
             "description": "Taller práctico de programación en Python para principiantes",
             "created_at": datetime.now().isoformat(),
@@ -41,8 +41,8 @@ def create_test_events():
         },
         {
             "title": "Feria de Ciencias",
-            "start": (august_base + timedelta(days=15, hours=9)).isoformat(),
-            "end": (august_base + timedelta(days=15, hours=17)).isoformat(),
+            "start": august_base + timedelta(days=15, hours=9),
+            "end": august_base + timedelta(days=15, hours=17),
             "location": "Gimnasio Universitario",
             "description": "Exposición de proyectos científicos de estudiantes de todas las facultades",
             "created_at": datetime.now().isoformat(),
@@ -50,8 +50,8 @@ def create_test_events():
         },
         {
             "title": "Conferencia: Inteligencia Artificial",
-            "start": (august_base + timedelta(days=22, hours=16)).isoformat(),
-            "end": (august_base + timedelta(days=22, hours=18)).isoformat(),
+            "start": august_base + timedelta(days=22, hours=16),
+            "end": august_base + timedelta(days=22, hours=18),
             "location": "Sala de Conferencias",
             "description": "Charla sobre el futuro de la IA y su impacto en la sociedad",
             "created_at": datetime.now().isoformat(),
@@ -59,8 +59,8 @@ def create_test_events():
         },
         {
             "title": "Torneo de Fútbol Interfacultades",
-            "start": (august_base + timedelta(days=28, hours=10)).isoformat(),
-            "end": (august_base + timedelta(days=28, hours=16)).isoformat(),
+            "start": august_base + timedelta(days=28, hours=10),
+            "end": august_base + timedelta(days=28, hours=16),
             "location": "Cancha de Fútbol",
             "description": "Torneo deportivo entre las diferentes facultades de la universidad",
             "created_at": datetime.now().isoformat(),
@@ -68,8 +68,8 @@ def create_test_events():
         },
         {
             "title": "Exposición de Arte Estudiantil",
-            "start": (september_base + timedelta(days=3, hours=10)).isoformat(),
-            "end": (september_base + timedelta(days=6, hours=18)).isoformat(),
+            "start": september_base + timedelta(days=3, hours=10),
+            "end": september_base + timedelta(days=6, hours=18),
             "location": "Galería de Arte",
             "description": "Exposición de obras de arte creadas por estudiantes de la facultad de artes",
             "created_at": datetime.now().isoformat(),
@@ -77,8 +77,8 @@ def create_test_events():
         },
         {
             "title": "Seminario de Emprendimiento",
-            "start": (september_base + timedelta(days=10, hours=14)).isoformat(),
-            "end": (september_base + timedelta(days=10, hours=19)).isoformat(),
+            "start": september_base + timedelta(days=10, hours=14),
+            "end": september_base + timedelta(days=10, hours=19),
             "location": "Centro de Emprendimiento",
             "description": "Seminario sobre cómo crear y desarrollar tu propia empresa",
             "created_at": datetime.now().isoformat(),
@@ -86,8 +86,8 @@ def create_test_events():
         },
         {
             "title": "Noche de Talentos",
-            "start": (september_base + timedelta(days=15, hours=19)).isoformat(),
-            "end": (september_base + timedelta(days=15, hours=23)).isoformat(),
+            "start": september_base + timedelta(days=15, hours=19),
+            "end": september_base + timedelta(days=15, hours=23),
             "location": "Auditorio Principal",
             "description": "Evento cultural donde los estudiantes muestran sus talentos artísticos",
             "created_at": datetime.now().isoformat(),
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Script para migrar las fechas start/end de los eventos de strings ISO a BSON Date
+Necesario para que las consultas por rango del calendario usen el índice sobre start/end
+"""
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.dependencies import mongo_service
+
+DATE_FIELDS = ["start", "end"]
+
+def parse_event_date(value: str) -> datetime:
+    """
+    Convierte un string ISO a datetime en UTC explícito
+    Los strings sin zona horaria se toman como UTC, igual que los guarda el cliente de MongoDB
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def migrate_event_dates() -> tuple:
+    """Convierte a datetime los campos de fecha que aún están guardados como string"""
+    collection = mongo_service.get_collection("events")
+    migrated_count = 0
+    error_count = 0
+
+    query = {"$or": [{field: {"$type": "string"}} for field in DATE_FIELDS]}
+    for event in collection.find(query, {field: 1 for field in DATE_FIELDS}):
+        update_fields = {}
+        try:
+            for field in DATE_FIELDS:
+                value = event.get(field)
+                if isinstance(value, str):
+                    update_fields[field] = parse_event_date(value) if value else None
+        except ValueError as e:
+            print(f"❌ Evento {event['_id']}: fecha inválida ({e})")
+            error_count += 1
+            continue
+
+        collection.update_one({"_id": event["_id"]}, {"$set": update_fields})
+        print(f"✅ Evento migrado: {event['_id']}")
+        migrated_count += 1
+
+    return migrated_count, error_count
+
+def main():
+    """Función principal"""
+    print("🚀 Iniciando migración de fechas de eventos...")
+    print("=" * 50)
+
+    # Conectar a MongoDB
+    if not mongo_service.connect():
+        print("❌ Error al conectar a MongoDB")
+        return
+
+    print("✅ Conexión a MongoDB establecida")
+
+    migrated_count, error_count = migrate_event_dates()
+
+    # Resumen
+    print("\n" + "=" * 50)
+    print("📊 RESUMEN DE MIGRACIÓN:")
+    print(f"   • Eventos migrados: {migrated_count}")
+    print(f"   • Eventos con errores: {error_count}")
+    print("=" * 50)
+
+    # Cerrar conexión
+    mongo_service.disconnect()
+    print("✅ Script completado exitosamente")
+
+if __name__ == "__main__":
+    main()
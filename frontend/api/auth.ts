@@ -3,6 +3,7 @@ import { api } from "./axios";
 
 interface LoginResponse {
   token: string;
+  refresh_token: string;
 }
 
 export async function login(correo: string, contraseña: string): Promise<User> {
@@ -22,6 +23,7 @@ export async function login(correo: string, contraseña: string): Promise<User>
 
   // Guardar token y usuario
   localStorage.setItem("token", data.token);
+  localStorage.setItem("refreshToken", data.refresh_token);
   localStorage.setItem("user", JSON.stringify(user));
   
   return user;
@@ -29,6 +31,7 @@ export async function login(correo: string, contraseña: string): Promise<User>
 
 export function logout(): void {
   localStorage.removeItem("token");
+  localStorage.removeItem("refreshToken");
   localStorage.removeItem("user");
 }
 
@@ -5,7 +5,33 @@ export const api = axios.create({
 });
 
 // Rutas públicas que no requieren autenticación
-const PUBLIC_ROUTES = ['/lost', '/events', '/health', '/auth/login'];
+const PUBLIC_ROUTES = ['/lost', '/events', '/health', '/auth/login', '/auth/refresh'];
+
+interface RefreshResponse {
+  token: string;
+  refresh_token: string;
+}
+
+// Renovación en curso (las peticiones que fallen a la vez comparten la misma)
+let refreshPromise: Promise<string> | null = null;
+
+// Renueva el token de acceso con el refresh token, sin volver a pedir la contraseña
+function refreshAccessToken(): Promise<string> {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem("refreshToken");
+    refreshPromise = (refreshToken
+      ? api.post<RefreshResponse>("/auth/refresh", { refresh_token: refreshToken }).then(({ data }) => {
+          localStorage.setItem("token", data.token);
+          localStorage.setItem("refreshToken", data.refresh_token);
+          return data.token;
+        })
+      : Promise.reject(new Error("Sin refresh token"))
+    ).finally(() => {
+      refreshPromise = null;
+    });
+  }
+  return refreshPromise;
+}
 
 api.interceptors.request.use((config) => {
   const token = localStorage.getItem("token");
@@ -23,14 +49,28 @@ api.interceptors.request.use((config) => {
 // Interceptor para manejar errores de autenticación
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
     const status = error.response?.status;
     const isPublicRoute = PUBLIC_ROUTES.some(route => error.config?.url?.startsWith(route));
     
+    // Token expirado: renovarlo una vez y reintentar la petición (no al cerrar sesión)
+    const isLogout = error.config?.url?.startsWith('/auth/logout');
+    if (status === 401 && !isPublicRoute && !isLogout && !error.config._retried) {
+      try {
+        const token = await refreshAccessToken();
+        error.config._retried = true;
+        error.config.headers.Authorization = `Bearer ${token}`;
+        return api.request(error.config);
+      } catch {
+        // Sin sesión renovable: continuar con el flujo de login
+      }
+    }
+    
     // Solo redirigir al login si es 401 en rutas protegidas
     if (status === 401 && !isPublicRoute) {
       // Token expirado o inválido, limpiar localStorage
       localStorage.removeItem("token");
+      localStorage.removeItem("refreshToken");
       localStorage.removeItem("user");
       // Redirigir al login si estamos en una página protegida
       if (window.location.pathname !== "/login" && 
@@ -7,6 +7,20 @@ export async function getEvents() {
   return { events: (data.events ?? []) as UniEvent[] };
 }
 
+// Eventos que se solapan con el rango visible, siguiendo el cursor X-Next-Cursor hasta la última página
+export async function getEventsInRange(range: { start: string; end: string }) {
+  const events: any[] = [];
+  let cursor: string | null = null;
+  do {
+    const params = new URLSearchParams({ ...range, limit: "500" });
+    if (cursor) params.set("cursor", cursor);
+    const response = await api.get<any[]>(`/events?${params.toString()}`);
+    events.push(...response.data);
+    cursor = response.headers["x-next-cursor"] ?? null;
+  } while (cursor);
+  return events;
+}
+
 export async function createEvent(eventData: {
   title: string;
   start: string;
@@ -4,6 +4,7 @@ import type { User } from '../types';
 
 interface LoginResponse {
   token: string;
+  refresh_token: string;
 }
 
 interface AuthState {
@@ -38,6 +39,7 @@ export function useAuth() {
       } catch (error) {
         // Token o usuario inválido, limpiar localStorage
         localStorage.removeItem('token');
+        localStorage.removeItem('refreshToken');
         localStorage.removeItem('user');
         setAuthState({
           user: null,
@@ -63,7 +65,7 @@ export function useAuth() {
         contraseña,
       });
 
-      const { token } = response.data;
+      const { token, refresh_token } = response.data;
       
       // Decodificar el token para obtener información del usuario
       const tokenPayload = JSON.parse(atob(token.split('.')[1]));
@@ -76,6 +78,7 @@ export function useAuth() {
 
       // Guardar en localStorage
       localStorage.setItem('token', token);
+      localStorage.setItem('refreshToken', refresh_token);
       localStorage.setItem('user', JSON.stringify(user));
 
       // Actualizar estado
@@ -93,8 +96,18 @@ export function useAuth() {
   }, []);
 
   const logout = useCallback(() => {
+    // Revocar el token en el servidor (si falla, el token expira por sí solo)
+    const token = localStorage.getItem('token');
+    const refreshToken = localStorage.getItem('refreshToken');
+    if (token) {
+      api.post('/auth/logout', { refresh_token: refreshToken }, {
+        headers: { Authorization: `Bearer ${token}` },
+      }).catch(() => undefined);
+    }
+
     // Limpiar localStorage
     localStorage.removeItem('token');
+    localStorage.removeItem('refreshToken');
     localStorage.removeItem('user');
 
     // Actualizar estado
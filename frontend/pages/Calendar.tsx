@@ -4,7 +4,7 @@ import interactionPlugin from "@fullcalendar/interaction";
 import { useEffect, useState } from "react";
 import type { EventInput, EventContentArg } from "@fullcalendar/core";
 import { useAuthContext } from "../contexts/AuthContext";
-import { createEvent, updateEvent, deleteEvent } from "../api/events";
+import { getEventsInRange, createEvent, updateEvent, deleteEvent } from "../api/events";
 
 type ExtProps = { location?: string };
 
@@ -17,6 +17,8 @@ export default function Calendar() {
   const [creating, setCreating] = useState(false);
   const [editing, setEditing] = useState(false);
   const [selectedEvent, setSelectedEvent] = useState<any | null>(null);
+  // Rango visible del calendario: solo se piden los eventos que se muestran
+  const [visibleRange, setVisibleRange] = useState<{ start: string; end: string } | null>(null);
   const { makeRequest, user, isAuthenticated } = useAuthContext();
   
   // Estado del formulario de creación
@@ -40,11 +42,12 @@ export default function Calendar() {
   const isAdmin = isAuthenticated && user?.role?.toLowerCase() === "admin";
 
   const loadEvents = () => {
+    if (!visibleRange) return;
     setLoading(true);
     setError(null);
     
-    // Usar makeRequest que funciona con o sin autenticación
-    makeRequest<any[]>('GET', '/events')
+    // Ruta pública: funciona con o sin autenticación
+    getEventsInRange(visibleRange)
       .then((events) => {
         // El backend devuelve un array directamente, mapear para FullCalendar
         const mappedEvents = events.map(e => ({ 
@@ -72,7 +75,7 @@ export default function Calendar() {
 
   useEffect(() => {
     loadEvents();
-  }, [makeRequest]);
+  }, [makeRequest, visibleRange]);
 
   const handleCreateEvent = async () => {
     // Validar y limpiar los campos
@@ -273,6 +276,13 @@ export default function Calendar() {
           initialView="dayGridMonth"
           height="auto"
           events={events}
+          datesSet={(arg) => {
+            const start = arg.start.toISOString();
+            const end = arg.end.toISOString();
+            if (visibleRange?.start !== start || visibleRange?.end !== end) {
+              setVisibleRange({ start, end });
+            }
+          }}
           eventContent={(arg: EventContentArg) => {
             const ext = arg.event.extendedProps as ExtProps;
             return (
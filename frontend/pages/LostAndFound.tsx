@@ -4,6 +4,8 @@ import { useAuthContext } from "../contexts/AuthContext";
 
 export default function LostAndFound() {
   const [items, setItems] = useState<LostItem[]>([]);
+  // URL de la miniatura de cada objeto (null = sin miniatura)
+  const [miniatures, setMiniatures] = useState<Record<string, string | null>>({});
   const [q, setQ] = useState("");
   const [loading, setLoading] = useState(true);
   const [selected, setSelected] = useState<LostItem | null>(null);
@@ -30,7 +32,15 @@ export default function LostAndFound() {
     
     // Usar makeRequest que funciona con o sin autenticación
     makeRequest<LostItem[]>('GET', '/lost')
-      .then((data) => {
+      .then(async (data) => {
+        // Pedir todas las miniaturas en una sola llamada en lugar de una redirección por objeto
+        const params = new URLSearchParams({ size: "300" });
+        data.filter((it) => it._id).forEach((it) => params.append("ids", it._id));
+        const batch = params.has("ids")
+          ? await makeRequest<{ urls: Record<string, string | null> }>('GET', `/lost/miniatures?${params.toString()}`)
+              .catch(() => ({ urls: {} as Record<string, string | null> }))
+          : { urls: {} };
+        setMiniatures(batch.urls);
         setItems(data);
       })
       .catch((error) => {
@@ -153,10 +163,18 @@ export default function LostAndFound() {
                 <div className="h-40 bg-gray-100">
                   {it._id ? (
                     <img
-                      src={`${apiUrl}/lost/${it._id}/image`}
+                      src={miniatures[it._id] ?? `${apiUrl}/lost/${it._id}/image`}
                       alt={it.title}
+                      loading="lazy"
                       className="w-full h-full object-cover"
                       onError={(e) => { 
+                        // Sin miniatura: intentar con la imagen original antes de mostrar el marcador
+                        const img = e.currentTarget as HTMLImageElement;
+                        if (!img.dataset.fallback) {
+                          img.dataset.fallback = "1";
+                          img.src = `${apiUrl}/lost/${it._id}/image`;
+                          return;
+                        }
                         (e.currentTarget as HTMLImageElement).style.display = 'none';
                         (e.currentTarget.parentElement as HTMLElement).innerHTML = `
                           <div class="w-full h-full flex items-center justify-center bg-gray-200 text-gray-500 text-sm">